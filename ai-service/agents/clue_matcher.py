@@ -0,0 +1,191 @@
+"""
+ClueMatcher - Finds clue keywords in persona responses.
+
+All keywords of a persona are compiled once into an Aho-Corasick
+automaton, so a response is scanned in a single pass no matter how many
+keywords there are. Matching is case-insensitive with Unicode case
+folding ("Straße" matches "strasse", "GÄSTEHAUS" matches "gästehaus").
+
+CLUE_MATCH_WORD_BOUNDARIES selects the boundary check:
+- "both" (default): whole words only - "hand" does not match "Handy",
+  "tat" does not match "Zitat".
+- "start": a keyword must begin a word, any ending is allowed.
+- "off": plain substring matching.
+The check only applies to keyword edges that are letters or digits, so
+"21:15" still matches in "um 21:15.".
+
+Inflected forms are allowed per keyword with a trailing "*":
+"gästehaus*" matches "Gästehaus" and "Gästehauses", "e-mail*" matches
+"E-Mails" (the reported keyword is "gästehaus" / "e-mail").
+
+Run `python -m agents.clue_matcher` for a microbenchmark against the
+previous per-keyword `in` loop.
+"""
+
+import os
+import unicodedata
+from collections import deque
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional
+
+WORD_BOUNDARY_MODES = ("start", "both", "off")
+CLUE_MATCH_WORD_BOUNDARIES = os.getenv("CLUE_MATCH_WORD_BOUNDARIES", "both").lower()
+if CLUE_MATCH_WORD_BOUNDARIES not in WORD_BOUNDARY_MODES:
+    CLUE_MATCH_WORD_BOUNDARIES = "both"
+
+# Keyword suffix that allows any word ending ("gutachten*" matches "Gutachtens")
+ANY_ENDING = "*"
+
+
+def fold(text: str) -> str:
+    """Normalize text for matching (NFC + Unicode case folding)."""
+    return unicodedata.normalize("NFC", text).casefold()
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+@dataclass(frozen=True)
+class ClueMatch:
+    """A keyword found in a text; `start`/`end` index the (NFC-normalized) text."""
+    keyword: str
+    start: int
+    end: int  # Exclusive
+
+
+class ClueMatcher:
+    """Aho-Corasick automaton over a fixed set of clue keywords."""
+
+    def __init__(self, keywords: Iterable[str], word_boundaries: str = CLUE_MATCH_WORD_BOUNDARIES):
+        if word_boundaries not in WORD_BOUNDARY_MODES:
+            raise ValueError(f"word_boundaries must be one of {WORD_BOUNDARY_MODES}, got {word_boundaries!r}")
+        self.word_boundaries = word_boundaries
+        self.keywords: list[str] = []  # As configured, without ANY_ENDING (first spelling of each folded keyword)
+        self._patterns: list[str] = []  # Folded
+        # Edge checks per pattern: (needs boundary before, needs boundary after)
+        self._edges: list[tuple[bool, bool]] = []
+
+        # Trie; state 0 is the root
+        self._delta: list[dict[str, int]] = [{}]
+        self._outputs: list[tuple[int, ...]] = [()]
+
+        seen: set[str] = set()
+        for keyword in keywords:
+            keyword = keyword.strip()
+            any_ending = keyword.endswith(ANY_ENDING)
+            keyword = keyword.rstrip(ANY_ENDING).rstrip()
+            pattern = fold(keyword)
+            if not pattern or pattern in seen:
+                continue
+            seen.add(pattern)
+            self._add(pattern, len(self._patterns))
+            self.keywords.append(keyword)
+            self._patterns.append(pattern)
+            self._edges.append((
+                word_boundaries != "off" and _is_word_char(pattern[0]),
+                word_boundaries == "both" and not any_ending and _is_word_char(pattern[-1]),
+            ))
+
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def _add(self, pattern: str, index: int) -> None:
+        state = 0
+        for char in pattern:
+            next_state = self._delta[state].get(char)
+            if next_state is None:
+                next_state = len(self._delta)
+                self._delta.append({})
+                self._outputs.append(())
+                self._delta[state][char] = next_state
+            state = next_state
+        self._outputs[state] += (index,)
+
+    def _build(self) -> None:
+        """Compute failure links and complete the transitions (no failure walks while scanning)."""
+        trie = [dict(edges) for edges in self._delta]
+        fail = [0] * len(self._delta)
+        queue = deque(trie[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in trie[state].items():
+                fail[child] = self._delta[fail[state]].get(char, 0)
+                self._outputs[child] += self._outputs[fail[child]]
+                queue.append(child)
+            if state:
+                # The failure state is shallower, so its transitions are complete already
+                for char, target in self._delta[fail[state]].items():
+                    self._delta[state].setdefault(char, target)
+
+    def _scan(self, text: str) -> Iterator[ClueMatch]:
+        """Yield matches in the order their end is reached."""
+        text = unicodedata.normalize("NFC", text)
+        folded = text.casefold()
+        # Case folding can expand characters ("ß" -> "ss"); map back to text offsets then
+        origin = None
+        if len(folded) != len(text):
+            origin = [index for index, char in enumerate(text) for _ in char.casefold()]
+
+        delta = self._delta
+        outputs = self._outputs
+        state = 0
+        for position, char in enumerate(folded):
+            state = delta[state].get(char, 0)
+            if not outputs[state]:
+                continue
+            end = position + 1
+            for index in outputs[state]:
+                start = end - len(self._patterns[index])
+                if not self._on_boundaries(folded, start, end, index):
+                    continue
+                if origin is not None:
+                    yield ClueMatch(self.keywords[index], origin[start], origin[end - 1] + 1)
+                else:
+                    yield ClueMatch(self.keywords[index], start, end)
+
+    def _on_boundaries(self, folded: str, start: int, end: int, index: int) -> bool:
+        check_before, check_after = self._edges[index]
+        if check_before and start > 0 and _is_word_char(folded[start - 1]):
+            return False
+        if check_after and end < len(folded) and _is_word_char(folded[end]):
+            return False
+        return True
+
+    def find_all(self, text: str) -> list[ClueMatch]:
+        """All keyword occurrences (overlapping ones included), ordered by position."""
+        return sorted(self._scan(text), key=lambda match: (match.start, -match.end))
+
+    def first(self, text: str) -> Optional[ClueMatch]:
+        """The keyword occurrence that ends first (stops scanning there)."""
+        return next(self._scan(text), None)
+
+
+if __name__ == "__main__":
+    import timeit
+
+    from scenarios.default_scenario import DEFAULT_SCENARIO
+
+    keywords = [keyword for persona in DEFAULT_SCENARIO["solution"]["clue_keywords"].values() for keyword in persona]
+    matcher = ClueMatcher(keywords)
+    keywords = matcher.keywords  # Without ANY_ENDING, for the plain loop
+
+    def keyword_loop(text: str) -> list[str]:
+        """The previous approach: one `in` scan per keyword."""
+        text_lower = text.lower()
+        return [keyword for keyword in keywords if keyword.lower() in text_lower]
+
+    sentence = "Ich war an dem Abend im Arbeitszimmer und habe niemanden gesehen, wirklich niemanden. "
+    texts = {
+        "no match, short": sentence,
+        "no match, long": sentence * 8,
+        "match at end, long": sentence * 8 + "Das Gutachten lag im Gästehaus.",
+    }
+    print(f"{len(matcher)} keywords")
+    for label, text in texts.items():
+        for name, func in (("keyword loop", keyword_loop), ("find_all", matcher.find_all), ("first", matcher.first)):
+            runs = 2000
+            seconds = min(timeit.repeat(lambda: func(text), number=runs, repeat=5)) / runs
+            print(f"{label:20} ({len(text):4} chars)  {name:13} {seconds * 1e6:7.1f} µs")
@@ -13,10 +13,20 @@ from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
 from langgraph.graph import StateGraph, END
 
+from .clue_matcher import ClueMatcher
+
 # Setup logging
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
+# Clue keywords per persona (legacy InnoTech scenario)
+LEGACY_CLUE_KEYWORDS = {
+    "tom": ["21:15", "zugangskarte", "sonntag", "abend", "trophäe", "hand", "schnitt"],
+    "lisa": ["e-mail*", "diebstahl", "geheimnisse", "streit am freitag"],
+    "klaus": ["gesehen", "21", "blut", "flur"],
+    "elena": ["investoren", "kontrolle", "streit mit marcus"]
+}
+
 
 class GameState(TypedDict):
     """State that is shared across the game session"""
@@ -50,6 +60,9 @@ class GameMaster:
         
         # Build persona lookup
         self.personas = {p["slug"]: p for p in scenario["personas"]}
+        
+        # Clue keyword matchers, compiled once
+        self.clue_matchers = {slug: ClueMatcher(keywords) for slug, keywords in LEGACY_CLUE_KEYWORDS.items()}
     
     def start_game(self, game_id: str) -> dict:
         """Initialize a new game session"""
@@ -136,21 +149,9 @@ BEHAVIOR HINTS BASED ON NUMBER OF INTERROGATIONS:
     
     def _detect_revealed_clue(self, response: str, persona_slug: str) -> Optional[str]:
         """Check if the response reveals an important clue"""
-        clue_keywords = {
-            "tom": ["21:15", "zugangskarte", "sonntag", "abend", "trophäe", "hand", "schnitt"],
-            "lisa": ["e-mail", "diebstahl", "geheimnisse", "streit am freitag"],
-            "klaus": ["gesehen", "21", "blut", "flur"],
-            "elena": ["investoren", "kontrolle", "streit mit marcus"]
-        }
-        
-        response_lower = response.lower()
-        revealed = []
-        
-        for keyword in clue_keywords.get(persona_slug, []):
-            if keyword in response_lower:
-                revealed.append(f"{persona_slug}: erwähnte '{keyword}'")
-        
-        return revealed[0] if revealed else None
+        matcher = self.clue_matchers.get(persona_slug)
+        match = matcher.first(response) if matcher else None
+        return f"{persona_slug}: erwähnte '{match.keyword}'" if match else None
     
     async def chat(
         self, 
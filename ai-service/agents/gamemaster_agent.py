@@ -10,14 +10,22 @@ The GameMaster:
 """
 
 import os
+import asyncio
 import logging
 from typing import Optional
 
-from langchain_openai import ChatOpenAI
-
-from .state import GameState, create_initial_game_state, Message
-from .persona_agent import PersonaAgent
-from services.voice_service import VoiceService
+from .state import GameState, create_initial_game_state, Message, append_auto_notes
+from .persona_agent import PersonaAgent, HISTORY_WINDOW
+from services.voice_service import VoiceService, get_voice_service
+from services.client_registry import get_client_registry
+from services.llm_scheduler import LLMPriority, get_llm_scheduler
+from services.token_usage import get_token_usage
+from services.game_state_store import (
+    GameStateStore,
+    GameStateConflictError,
+    TranscriptOutOfSyncError,
+    get_game_state_store,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -33,17 +41,22 @@ class GameMasterAgent:
     - (Future) Provide hints and detect contradictions
     """
     
-    def __init__(self, scenario: dict, model_name: str = "gpt-4o-mini", voice_service: Optional[VoiceService] = None):
+    def __init__(
+        self,
+        scenario: dict,
+        model_name: str = "gpt-4o-mini",
+        voice_service: Optional[VoiceService] = None,
+        state_store: Optional[GameStateStore] = None
+    ):
         self.scenario = scenario
         self.model_name = model_name
-        self.voice_service = voice_service or VoiceService()
+        self.voice_service = voice_service or get_voice_service()
         
-        # Initialize LLM
-        self.llm = ChatOpenAI(
-            model=model_name,
-            temperature=0.8,  # Creative responses
-            api_key=os.getenv("OPENAI_API_KEY")
-        )
+        # Game states live in a (possibly shared) store so any worker can serve a game
+        self.state_store = state_store or get_game_state_store()
+        
+        # Shared LLM client (pooled connections across all games)
+        self.llm = get_client_registry().chat_model(model_name, temperature=0.8)  # Creative responses
         
         # Assign voices to personas
         # For default scenario, use fixed mapping
@@ -63,13 +76,10 @@ class GameMasterAgent:
             voice_id = self.voice_assignments.get(persona_data["slug"])
             # Get persona-specific clue keywords from scenario
             persona_clue_keywords = solution_clue_keywords.get(persona_data["slug"], None)
-            agent = PersonaAgent(persona_data, self.llm, voice_id, self.voice_service, persona_clue_keywords)
+            agent = PersonaAgent(persona_data, self.llm, voice_id, self.voice_service, persona_clue_keywords, scenario=scenario)
             self.persona_agents[persona_data["slug"]] = agent
             logger.info(f"Initialized agent: {agent} with {len(agent.clue_keywords)} clue keywords, voice: {voice_id[:20] if voice_id else 'None'}...")
         
-        # Game states storage (in-memory for now, could be Redis/DB)
-        self.game_states: dict[str, GameState] = {}
-        
         logger.info(f"GameMaster initialized with {len(self.persona_agents)} persona agents")
     
     def _get_fixed_voice_mapping_if_default(self) -> Optional[dict[str, str]]:
@@ -93,30 +103,40 @@ class GameMasterAgent:
         
         return None
     
-    def initialize_game(self, game_id: str) -> GameState:
+    async def initialize_game(self, game_id: str) -> GameState:
         """
         Start a new game session.
         
         Creates initial state with all shared knowledge and voice assignments.
         """
         state = create_initial_game_state(game_id, self.scenario, self.voice_assignments)
-        self.game_states[game_id] = state
+        # Store calls may block (SQLite lock / busy timeout) - keep them off the event loop
+        await asyncio.to_thread(self.state_store.save, game_id, state)
         
         logger.info(f"Game {game_id} initialized with voice assignments")
         return state
     
-    def get_game_state(self, game_id: str) -> Optional[GameState]:
-        """Get the current state of a game"""
-        return self.game_states.get(game_id)
+    async def get_game_state(self, game_id: str) -> Optional[GameState]:
+        """Get the current state of a game (a private copy, safe to mutate)"""
+        return await asyncio.to_thread(self.state_store.load, game_id)
     
-    def update_game_state(self, game_id: str, state: GameState) -> None:
-        """Update the stored game state"""
-        self.game_states[game_id] = state
+    async def update_game_state(self, game_id: str, state: GameState) -> None:
+        """
+        Update the stored game state.
+        
+        Uses compare-and-swap against the version the state was loaded with,
+        so a concurrent turn in another worker is never silently overwritten.
+        """
+        expected_version = state.get("state_version", 0)
+        if not await asyncio.to_thread(self.state_store.compare_and_swap, game_id, state, expected_version):
+            raise GameStateConflictError(
+                f"Game {game_id} was modified concurrently (expected version {expected_version})"
+            )
     
-    def get_game_info(self, game_id: str) -> dict:
+    async def get_game_info(self, game_id: str) -> dict:
         """Get public game info for the frontend"""
-        if game_id not in self.game_states:
-            self.initialize_game(game_id)
+        if await self.get_game_state(game_id) is None:
+            await self.initialize_game(game_id)
         
         # Extract location and time from setting or timeline
         location = self._extract_location_from_setting()
@@ -220,25 +240,31 @@ class GameMasterAgent:
         logger.info(f"Routing to: {selected}")
         return selected
     
-    def prepare_state_for_agent(
+    async def prepare_state_for_agent(
         self, 
         game_id: str, 
         persona_slug: str, 
         user_message: str,
-        chat_history: list[dict]
+        chat_history: list[dict],
+        turn_seq: Optional[int] = None
     ) -> GameState:
         """
         Prepare the game state for an agent invocation.
         
         - Gets or creates game state
         - Sets current request info
-        - Adds user message to history
+        - Loads the recent history window and adds the user message
+        
+        The transcript is kept server-side. With `turn_seq` the client only
+        sends the new message; if its seq does not match the transcript, a
+        non-empty `chat_history` resyncs the transcript, otherwise
+        TranscriptOutOfSyncError is raised. Without `turn_seq` (legacy
+        clients) the window is taken from `chat_history`.
         """
         # Get or create game state
-        if game_id not in self.game_states:
-            state = self.initialize_game(game_id)
-        else:
-            state = self.game_states[game_id].copy()
+        state = await self.get_game_state(game_id)
+        if state is None:
+            state = await self.initialize_game(game_id)
         
         # Set current request
         state["user_message"] = user_message
@@ -251,18 +277,90 @@ class GameMasterAgent:
             content=user_message
         )
         
-        # Include previous history
-        existing_messages = []
-        for msg in chat_history:
-            existing_messages.append(Message(
+        if turn_seq is None:
+            # Legacy: only the tail of the client history is needed
+            window = self._messages_from_history(chat_history[-HISTORY_WINDOW:])
+        else:
+            server_seq = await asyncio.to_thread(self.state_store.message_count, game_id)
+            if turn_seq != server_seq:
+                if not chat_history:
+                    raise TranscriptOutOfSyncError(game_id, turn_seq, server_seq)
+                logger.warning(f"Resyncing transcript of game {game_id}: client seq {turn_seq}, server seq {server_seq}")
+                await asyncio.to_thread(
+                    self.state_store.replace_messages, game_id, self._messages_from_history(chat_history)
+                )
+            window = await asyncio.to_thread(self.state_store.tail_messages, game_id, HISTORY_WINDOW)
+        
+        state["messages"] = window + [user_msg]
+        
+        return state
+    
+    def _messages_from_history(self, chat_history: list[dict]) -> list[Message]:
+        """Convert client chat history entries to Messages"""
+        return [
+            Message(
                 role=msg.get("role", "user"),
                 persona_slug=msg.get("persona_slug"),
                 content=msg.get("content", "")
-            ))
+            )
+            for msg in chat_history
+        ]
+    
+    async def commit_turn(self, game_id: str, state: GameState, turn_start: int) -> int:
+        """
+        Persist the state after a chat turn.
         
-        state["messages"] = existing_messages + [user_msg]
+        Only the changes of this turn (the persona's agent state, revealed
+        clues, inline auto-notes) are applied to the latest stored state, so
+        notes merged by the background workers or a concurrent turn in
+        another worker are kept instead of causing a conflict. `state` is
+        updated with the merged notes, clues and version afterwards.
         
-        return state
+        Messages from `turn_start` on (the user message and the reply) are
+        appended to the transcript; the stored state itself carries no
+        messages, so its size stays constant as the game gets long.
+        
+        Returns the new turn sequence number.
+        """
+        new_messages = [
+            Message(
+                role=msg["role"],
+                persona_slug=msg.get("persona_slug"),
+                content=msg["content"],
+                audio_id=msg.get("audio_id"),
+                voice_id=msg.get("voice_id")
+            )
+            for msg in state.get("messages", [])[turn_start:]
+        ]
+        
+        slug = state.get("responding_agent") or state["selected_persona"]
+        merged_notes: list = []
+        
+        def apply_turn(latest: GameState) -> None:
+            if slug in state.get("agent_states", {}):
+                latest["agent_states"][slug] = state["agent_states"][slug]
+            for clue in state.get("revealed_clues", []):
+                if clue not in latest.get("revealed_clues", []):
+                    latest["revealed_clues"] = latest.get("revealed_clues", []) + [clue]
+            # May run several times - always start from fresh copies
+            merged_notes[:] = append_auto_notes(
+                latest, slug, [dict(note) for note in state.get("new_auto_notes", [])]
+            )
+        
+        committed = await asyncio.to_thread(self.state_store.update, game_id, apply_turn)
+        
+        state["messages"] = []
+        state["state_version"] = committed["state_version"]
+        state["revealed_clues"] = committed["revealed_clues"]
+        state["auto_notes"] = committed["auto_notes"]
+        state["notes_seq"] = committed.get("notes_seq", 0)
+        state["new_auto_notes"] = merged_notes
+        
+        return await asyncio.to_thread(self.state_store.append_messages, game_id, new_messages)
+    
+    async def get_recent_messages(self, game_id: str, limit: int = 20) -> list[Message]:
+        """Get the last messages of the server-side transcript"""
+        return await asyncio.to_thread(self.state_store.tail_messages, game_id, limit)
     
     def get_persona_agent(self, slug: str) -> Optional[PersonaAgent]:
         """Get a specific persona agent"""
@@ -284,9 +382,9 @@ class GameMasterAgent:
             for agent in self.persona_agents.values()
         ]
     
-    def get_agent_state_debug(self, game_id: str) -> dict:
+    async def get_agent_state_debug(self, game_id: str) -> dict:
         """Get debug info about agent states for a game"""
-        state = self.game_states.get(game_id)
+        state = await self.get_game_state(game_id)
         if not state:
             return {"error": "Game not found"}
         
@@ -295,7 +393,7 @@ class GameMasterAgent:
             "game_status": state.get("game_status", "unknown"),
             "revealed_clues": state.get("revealed_clues", []),
             "agent_states": state.get("agent_states", {}),
-            "message_count": len(state.get("messages", []))
+            "message_count": await asyncio.to_thread(self.state_store.message_count, game_id)
         }
     
     async def generate_hint(self, game_id: str) -> dict:
@@ -309,10 +407,9 @@ class GameMasterAgent:
         """
         from langchain_core.messages import SystemMessage, HumanMessage
         
-        state = self.game_states.get(game_id)
+        state = await self.get_game_state(game_id)
         if not state:
-            self.initialize_game(game_id)
-            state = self.game_states[game_id]
+            state = await self.initialize_game(game_id)
         
         revealed_clues = state.get("revealed_clues", [])
         critical_clues = self.scenario.get("solution", {}).get("critical_clues", [])
@@ -331,8 +428,10 @@ class GameMasterAgent:
         
         interrogation_summary = "\n".join(interrogation_info) if interrogation_info else "No suspects interrogated yet"
         
-        # Build hint generation prompt
-        hint_prompt = f"""You are the GameMaster of a murder mystery game. The player is stuck and needs a hint.
+        # Build hint generation prompt - the case and the task only depend on
+        # the scenario and come first; the player's progress goes last
+        hint_instructions = f"""You are a helpful GameMaster providing hints in a murder mystery game. Be mysterious but helpful.
+The player is stuck and needs a hint.
 
 CASE INFORMATION:
 - Scenario: {self.scenario.get('name', 'Unknown')}
@@ -343,12 +442,6 @@ CASE INFORMATION:
 CRITICAL CLUES TO SOLVE THE CASE:
 {chr(10).join(f"- {clue}" for clue in critical_clues)}
 
-CLUES ALREADY DISCOVERED BY PLAYER:
-{chr(10).join(f"- {clue}" for clue in revealed_clues) if revealed_clues else "None yet"}
-
-INTERROGATION PROGRESS:
-{interrogation_summary}
-
 SUSPECTS:
 {chr(10).join(f"- {p['name']} ({p['role']})" for p in self.scenario.get('personas', []))}
 
@@ -360,17 +453,25 @@ Generate ONE helpful hint that:
 4. Is cryptic enough to feel like detective work, but clear enough to be useful
 
 The hint should be 1-2 sentences, written as if from a mysterious informant or the detective's intuition.
-Do NOT reveal who the murderer is directly!
+Do NOT reveal who the murderer is directly!"""
+
+        hint_prompt = f"""CLUES ALREADY DISCOVERED BY PLAYER:
+{chr(10).join(f"- {clue}" for clue in revealed_clues) if revealed_clues else "None yet"}
+
+INTERROGATION PROGRESS:
+{interrogation_summary}
 
 HINT:"""
 
         try:
             messages = [
-                SystemMessage(content="You are a helpful GameMaster providing hints in a murder mystery game. Be mysterious but helpful."),
+                SystemMessage(content=hint_instructions),
                 HumanMessage(content=hint_prompt)
             ]
             
-            response = await self.llm.ainvoke(messages)
+            async with get_llm_scheduler().slot(LLMPriority.HINT, messages):
+                response = await self.llm.ainvoke(messages)
+            get_token_usage().record("hint", response.usage_metadata)
             hint_text = response.content.strip()
             
             # Clean up the hint
@@ -13,20 +13,51 @@ Future extensions:
 - Contradiction detection node
 """
 
+import os
 import logging
-from typing import Literal
+from collections import OrderedDict
+from typing import Any, Optional
 
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, END
 
 from .state import GameState
 from .gamemaster_agent import GameMasterAgent
+from .persona_agent import PersonaAgent
+from services.session_registry import get_session_registry
 
 logger = logging.getLogger(__name__)
 
+# Compiled graphs are shared by all games with the same ordered persona slugs
+GRAPH_CACHE_MAX = int(os.getenv("GRAPH_CACHE_MAX", "128"))
+_compiled_graphs: "OrderedDict[tuple[str, ...], Any]" = OrderedDict()
 
-def create_murder_mystery_graph(gamemaster: GameMasterAgent):
+
+def resolve_persona_agent(game_id: str, slug: str, gamemaster: Optional[GameMasterAgent] = None) -> PersonaAgent:
+    """
+    Find the PersonaAgent of a game at runtime.
+    
+    Graph nodes are shared between games, so they get the game's
+    GameMaster pinned through config["configurable"]["gamemaster"]
+    instead of closing over it. Without one, the agent is looked up in
+    the session registry.
+    """
+    if gamemaster is None:
+        session = get_session_registry().peek(game_id)
+        if session is None:
+            raise LookupError(f"No active session for game {game_id}")
+        gamemaster = session.gamemaster
+    
+    agent = gamemaster.get_persona_agent(slug)
+    if agent is None:
+        raise LookupError(f"Game {game_id} has no persona '{slug}'")
+    
+    return agent
+
+
+def _build_graph(persona_slugs: tuple[str, ...]):
     """
-    Create the LangGraph for the murder mystery game.
+    Build and compile the LangGraph for a set of persona slugs.
     
     Graph structure:
     
@@ -53,23 +84,31 @@ def create_murder_mystery_graph(gamemaster: GameMasterAgent):
     # === Add Nodes ===
     
     # Router node - decides which persona handles the message
-    def router_node(state: GameState) -> GameState:
+    def router_node(state: GameState) -> dict:
         """Route to the selected persona"""
         logger.info(f"Router: directing to {state['selected_persona']}")
-        return state
+        # Only echo the routing key - returning the full state would re-add
+        # `messages` through the accumulating reducer and duplicate the history
+        return {"selected_persona": state["selected_persona"]}
     
     graph.add_node("router", router_node)
     
-    # Add a node for each persona agent
-    for slug, agent in gamemaster.persona_agents.items():
-        # Create async wrapper for the agent
-        async def make_agent_node(state: GameState, agent=agent):
-            """Wrapper to invoke the persona agent"""
+    # Add a node for each persona slug
+    for slug in persona_slugs:
+        # Create async wrapper that resolves the game's agent at runtime
+        async def make_agent_node(state: GameState, config: RunnableConfig, slug=slug):
+            """Wrapper to invoke the persona agent of the current game"""
+            # Streaming callers pass callbacks via config["configurable"]
+            configurable = config.get("configurable", {})
+            agent = resolve_persona_agent(state["game_id"], slug, configurable.get("gamemaster"))
             logger.info(f"Invoking agent: {agent.name}")
-            return await agent.invoke(state)
+            return await agent.invoke(
+                state,
+                on_token=configurable.get("on_token"),
+                on_audio_segment=configurable.get("on_audio_segment")
+            )
         
         graph.add_node(slug, make_agent_node)
-        logger.info(f"Added node for agent: {slug}")
     
     # === Add Edges ===
     
@@ -79,18 +118,17 @@ def create_murder_mystery_graph(gamemaster: GameMasterAgent):
     # Router conditionally routes to the selected persona
     def route_to_persona(state: GameState) -> str:
         """Determine which persona node to go to"""
-        selected = state.get("selected_persona", "elena")
+        selected = state.get("selected_persona", persona_slugs[0])
         
         # Validate the selection
-        valid_personas = list(gamemaster.persona_agents.keys())
-        if selected not in valid_personas:
-            logger.warning(f"Invalid persona {selected}, defaulting to elena")
-            return "elena"
+        if selected not in persona_slugs:
+            logger.warning(f"Invalid persona {selected}, defaulting to {persona_slugs[0]}")
+            return persona_slugs[0]
         
         return selected
     
     # Add conditional edges from router to each persona
-    persona_routes = {slug: slug for slug in gamemaster.persona_agents.keys()}
+    persona_routes = {slug: slug for slug in persona_slugs}
     
     graph.add_conditional_edges(
         "router",
@@ -99,18 +137,51 @@ def create_murder_mystery_graph(gamemaster: GameMasterAgent):
     )
     
     # Each persona leads to END
-    for slug in gamemaster.persona_agents.keys():
+    for slug in persona_slugs:
         graph.add_edge(slug, END)
     
     # Compile the graph
     compiled_graph = graph.compile()
     
     logger.info("Murder Mystery Graph compiled successfully")
-    logger.info(f"Nodes: router, {', '.join(gamemaster.persona_agents.keys())}")
+    logger.info(f"Nodes: router, {', '.join(persona_slugs)}")
+    
+    return compiled_graph
+
+
+def create_murder_mystery_graph(gamemaster: GameMasterAgent):
+    """
+    Get the LangGraph for a game.
+    
+    Graphs are compiled once per ordered set of persona slugs and shared
+    by every game with the same personas (e.g. all quick-start games).
+    """
+    persona_slugs = tuple(gamemaster.persona_agents.keys())
+    
+    compiled_graph = _compiled_graphs.get(persona_slugs)
+    if compiled_graph is not None:
+        _compiled_graphs.move_to_end(persona_slugs)
+        return compiled_graph
+    
+    compiled_graph = _build_graph(persona_slugs)
+    _compiled_graphs[persona_slugs] = compiled_graph
+    
+    # Generated scenarios bring new slug sets, so keep the cache bounded
+    while len(_compiled_graphs) > GRAPH_CACHE_MAX:
+        _compiled_graphs.popitem(last=False)
     
     return compiled_graph
 
 
+def get_graph_cache_info() -> dict:
+    """Info about the compiled graph cache (for debugging)"""
+    return {
+        "cached_graphs": len(_compiled_graphs),
+        "max_graphs": GRAPH_CACHE_MAX,
+        "persona_sets": [list(slugs) for slugs in _compiled_graphs.keys()],
+    }
+
+
 def get_graph_visualization() -> dict:
     """
     Get a representation of the graph for visualization.
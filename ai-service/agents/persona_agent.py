@@ -9,20 +9,46 @@ Each persona (Elena, Tom, Lisa, Klaus) is a separate agent with:
 Prompts are loaded from the Laravel database via PromptService.
 """
 
+import os
 import json
+import time
+import asyncio
 import logging
 from datetime import datetime
-from typing import Optional
+from typing import Any, Awaitable, Callable, Optional
 
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
 
-from .state import GameState, Message, AutoNote
+from .state import GameState, Message, AutoNote, append_auto_notes
+from .clue_matcher import ClueMatcher
 from services.prompt_service import get_prompt_service
 from services.voice_service import VoiceService
+from services.note_extraction import background_notes_enabled
+from services.latency_metrics import get_latency_metrics
+from services.token_usage import get_token_usage
+from services.llm_scheduler import LLMPriority, get_llm_scheduler
+from services.speech_pipeline import SpeechPipeline, SegmentCallback
+from services.blob_store import get_audio_store
 
 logger = logging.getLogger(__name__)
 
+# Number of recent transcript messages a persona sees as context
+HISTORY_WINDOW = 10
+
+# Receives response tokens while the persona is streaming
+TokenCallback = Callable[[str], Awaitable[None]]
+
+# Timeouts of the post-processing branches that run after the LLM reply
+PERSONA_TTS_TIMEOUT_SEC = float(os.getenv("PERSONA_TTS_TIMEOUT_SEC", "30"))
+PERSONA_NOTES_TIMEOUT_SEC = float(os.getenv("PERSONA_NOTES_TIMEOUT_SEC", "20"))
+PERSONA_CLUE_TIMEOUT_SEC = float(os.getenv("PERSONA_CLUE_TIMEOUT_SEC", "2"))
+
+# Stress bands the state prompt distinguishes: (stress level 0-2, tired)
+STRESS_NERVOUS_THRESHOLD = 0.3
+STRESS_HIGH_THRESHOLD = 0.6
+TIRED_AFTER_QUESTIONS = 5
+
 
 class PersonaAgent:
     """
@@ -35,7 +61,7 @@ class PersonaAgent:
     - llm: the language model to use
     """
     
-    def __init__(self, persona_data: dict, llm: ChatOpenAI, voice_id: Optional[str] = None, voice_service: Optional[VoiceService] = None, clue_keywords: Optional[list[str]] = None):
+    def __init__(self, persona_data: dict, llm: ChatOpenAI, voice_id: Optional[str] = None, voice_service: Optional[VoiceService] = None, clue_keywords: Optional[list[str]] = None, scenario: Optional[dict] = None):
         self.slug = persona_data["slug"]
         self.name = persona_data["name"]
         self.role = persona_data["role"]
@@ -51,6 +77,14 @@ class PersonaAgent:
         
         # Clue detection keywords - from scenario or fallback to defaults
         self.clue_keywords = clue_keywords if clue_keywords else self._setup_default_clue_keywords()
+        self.clue_matcher = ClueMatcher(self.clue_keywords)
+        
+        # System prompt compiled once; the stress modifier is sent separately
+        # (after the history) so the long system prompt stays byte-identical
+        self._compiled_for: Optional[tuple[int, str, str, str]] = None  # (prompt version, scenario name, facts, timeline)
+        self._static_prompt = ""
+        if scenario:
+            self._compile_system_prompt(scenario["name"], scenario["shared_knowledge"], scenario["timeline"])
         
         logger.info(f"PersonaAgent {self.name} initialized with {len(self.clue_keywords)} clue keywords, voice: {voice_id[:20] if voice_id else 'None'}...")
     
@@ -59,66 +93,86 @@ class PersonaAgent:
         # Legacy keywords for old InnoTech scenario
         keywords_map = {
             "tom": ["21:15", "zugangskarte", "sonntag abend", "trophäe", "hand", "schnitt", "geschnitten"],
-            "lisa": ["e-mail", "diebstahl", "geheimnisse", "streit am freitag", "samstag"],
+            "lisa": ["e-mail*", "diebstahl", "geheimnisse", "streit am freitag", "samstag"],
             "klaus": ["gesehen", "21 uhr", "blut", "flur", "tom gesehen"],
             "elena": ["investoren", "kontrolle", "streit mit marcus", "finanzen"]
         }
         return keywords_map.get(self.slug, [])
     
-    def _build_system_prompt(self, state: GameState) -> str:
-        """
-        Build the system prompt for this persona.
-        
-        Uses the prompt template from the database (via PromptService).
-        Combines:
-        - Shared knowledge (from state)
-        - Private knowledge (from persona_data)
-        - Dynamic state (stress level, interrogation count)
-        """
-        agent_state = state["agent_states"].get(self.slug, {})
-        stress = agent_state.get("stress_level", 0.0)
-        interrogation_count = agent_state.get("interrogation_count", 0)
+    def _compile_system_prompt(self, scenario_name: str, shared_facts: str, timeline: str) -> None:
+        """Format the static part of the system prompt (everything but the stress modifier)."""
+        # Extract company name from scenario_name or use default
+        company_name = "InnoTech GmbH" if "InnoTech" in scenario_name else "der Firma"
         
-        # Build stress modifier based on current state
+        prompt_service = get_prompt_service()
+        self._compiled_for = (prompt_service.version, scenario_name, shared_facts, timeline)
+        self._static_prompt = prompt_service.compile_persona_prompt(
+            persona_name=self.name,
+            persona_role=self.role,
+            company_name=company_name,
+            personality=self.personality,
+            private_knowledge=self.private_knowledge,
+            shared_facts=shared_facts,
+            timeline=timeline,
+            knows_about_others=self.knows_about_others
+        )
+    
+    @staticmethod
+    def _stress_band(stress: float, interrogation_count: int) -> tuple[int, bool]:
+        """The discrete state the stress modifier depends on: (stress level 0-2, tired)."""
+        level = 2 if stress > STRESS_HIGH_THRESHOLD else 1 if stress > STRESS_NERVOUS_THRESHOLD else 0
+        return level, interrogation_count > TIRED_AFTER_QUESTIONS
+    
+    @staticmethod
+    def _build_stress_modifier(level: int, tired: bool) -> str:
+        """Build stress modifier for a stress band"""
         stress_modifier = ""
-        if stress > 0.3:
+        if level >= 1:
             stress_modifier += f"""
 === CURRENT STATE ===
-Stress Level: {stress:.0%}
+Stress Level: {"high" if level >= 2 else "elevated"}
 You are becoming noticeably more nervous. Your answers are getting shorter, you hesitate more.
 """
         
-        if stress > 0.6:
+        if level >= 2:
             stress_modifier += """You are very stressed. You are making small mistakes in your statements.
 When confronted directly, you might slip up.
 """
         
-        if interrogation_count > 5:
+        if tired:
             stress_modifier += f"""
-You have already been questioned {interrogation_count} times. You are getting tired and more careless.
+You have already been questioned more than {TIRED_AFTER_QUESTIONS} times. You are getting tired and more careless.
 """
+        return stress_modifier.strip()
+    
+    def _build_system_prompt(self, state: GameState) -> str:
+        """
+        Build the system prompt for this persona.
         
-        # Get formatted prompt from PromptService
-        prompt_service = get_prompt_service()
+        Uses the prompt template from the database (via PromptService).
+        Combines:
+        - Shared knowledge (from state)
+        - Private knowledge (from persona_data)
         
-        # Extract company name from scenario_name or use default
-        company_name = state.get("scenario_name", "InnoTech GmbH")
-        if "InnoTech" not in company_name:
-            company_name = "der Firma"
-        else:
-            company_name = "InnoTech GmbH"
+        The prompt only changes with the scenario or a prompt reload, so it
+        is compiled once and forms a stable prefix for provider-side prompt
+        caching. The dynamic state goes into `_build_state_prompt`.
+        """
+        static_key = (state.get("scenario_name", "InnoTech GmbH"), state["shared_facts"], state["timeline"])
+        if self._compiled_for != (get_prompt_service().version, *static_key):
+            self._compile_system_prompt(*static_key)
+        return self._static_prompt
+    
+    def _build_state_prompt(self, state: GameState) -> str:
+        """
+        Build the dynamic part of the prompt (stress level, interrogation count).
         
-        return prompt_service.format_persona_prompt(
-            persona_name=self.name,
-            persona_role=self.role,
-            company_name=company_name,
-            personality=self.personality,
-            private_knowledge=self.private_knowledge,
-            shared_facts=state["shared_facts"],
-            timeline=state["timeline"],
-            knows_about_others=self.knows_about_others,
-            stress_modifier=stress_modifier
-        )
+        Sent as the last system message before the question; empty while
+        the persona is calm.
+        """
+        agent_state = state["agent_states"].get(self.slug, {})
+        band = self._stress_band(agent_state.get("stress_level", 0.0), agent_state.get("interrogation_count", 0))
+        return STRESS_MODIFIERS[band]
     
     def _get_persona_history(self, state: GameState) -> list:
         """
@@ -127,7 +181,7 @@ You have already been questioned {interrogation_count} times. You are getting ti
         Important: We don't share history between personas!
         """
         messages = []
-        for msg in state.get("messages", [])[-10:]:  # Last 10 messages
+        for msg in state.get("messages", [])[-HISTORY_WINDOW:]:  # Last 10 messages
             # Only include messages TO this persona or FROM this persona
             if msg.get("persona_slug") is None:
                 # User message - include if it was to this persona
@@ -139,17 +193,14 @@ You have already been questioned {interrogation_count} times. You are getting ti
     
     def _detect_revealed_clue(self, response: str) -> Optional[str]:
         """Check if the response accidentally reveals important information"""
-        response_lower = response.lower()
-        
-        for keyword in self.clue_keywords:
-            keyword_lower = keyword.lower()
-            if keyword_lower in response_lower:
-                # Create a more descriptive clue message
-                return f"🔍 {self.name} mentioned '{keyword}'"
+        match = self.clue_matcher.first(response)
+        if match:
+            # Create a more descriptive clue message
+            return f"🔍 {self.name} mentioned '{match.keyword}'"
         
         return None
     
-    async def _extract_auto_notes(self, user_question: str, response: str, state: GameState) -> list[AutoNote]:
+    async def extract_auto_notes(self, user_question: str, response: str, state: GameState) -> list[AutoNote]:
         """
         Use LLM to extract relevant investigative notes from the conversation.
         
@@ -160,13 +211,11 @@ You have already been questioned {interrogation_count} times. You are getting ti
         - observation: What they saw, heard, or noticed
         - contradiction: Statements that contradict earlier info
         """
-        extraction_prompt = f"""You are an investigator assistant. Analyze the following statement from {self.name} ({self.role}) and extract relevant investigation notes.
+        # Instructions and case facts first (identical for every call of
+        # this persona), the question and answer last
+        extraction_instructions = f"""You are a precise investigator assistant. Reply ONLY with valid JSON.
 
-INVESTIGATOR'S QUESTION:
-{user_question}
-
-RESPONSE FROM {self.name.upper()}:
-{response}
+You analyze statements from {self.name} ({self.role}) and extract relevant investigation notes.
 
 KNOWN FACTS ABOUT THE CASE:
 - Victim: {state.get('victim', 'Unknown')}
@@ -190,17 +239,25 @@ Categories:
 - observation: What the person saw/heard
 - contradiction: Contradictions to known facts
 
-IMPORTANT: Extract only NEW, relevant information. Maximum 2-3 notes per response.
+IMPORTANT: Extract only NEW, relevant information. Maximum 2-3 notes per response."""
+
+        extraction_prompt = f"""INVESTIGATOR'S QUESTION:
+{user_question}
+
+RESPONSE FROM {self.name.upper()}:
+{response}
 
 JSON Array:"""
 
         try:
             messages = [
-                SystemMessage(content="You are a precise investigator assistant. Reply ONLY with valid JSON."),
+                SystemMessage(content=extraction_instructions),
                 HumanMessage(content=extraction_prompt)
             ]
             
-            extraction_response = await self.llm.ainvoke(messages)
+            async with get_llm_scheduler().slot(LLMPriority.NOTES, messages):
+                extraction_response = await self.llm.ainvoke(messages)
+            get_token_usage().record("auto_notes", extraction_response.usage_metadata)
             content = extraction_response.content.strip()
             
             # Clean up the response to ensure valid JSON
@@ -244,59 +301,172 @@ JSON Array:"""
             logger.error(f"Error extracting auto-notes: {e}")
             return []
     
-    async def invoke(self, state: GameState) -> GameState:
+    async def _stream_response(
+        self,
+        messages: list,
+        on_token: Optional[TokenCallback],
+        speech: Optional[SpeechPipeline]
+    ) -> str:
+        """
+        Stream the LLM response. Returns the full text.
+        
+        Each token is passed to `on_token` and to the speech pipeline, which
+        starts synthesising every sentence as soon as it is complete.
+        """
+        parts = []
+        usage_metadata = None
+        try:
+            async with get_llm_scheduler().slot(LLMPriority.CHAT, messages):
+                async for chunk in self.llm.astream(messages):
+                    if chunk.usage_metadata:
+                        # Sent with the last chunk (stream_usage)
+                        usage_metadata = chunk.usage_metadata
+                    if chunk.content:
+                        parts.append(chunk.content)
+                        if speech:
+                            speech.feed(chunk.content)
+                        if on_token:
+                            await on_token(chunk.content)
+        except BaseException:
+            if speech:
+                speech.cancel()
+            raise
+        get_token_usage().record("persona_chat", usage_metadata)
+        return "".join(parts)
+    
+    def _voice_enabled(self) -> bool:
+        return bool(self.voice_service and self.voice_service.enabled and self.voice_id)
+    
+    async def _synthesize_audio(self, response_text: str, speech: Optional[SpeechPipeline]) -> Optional[str]:
+        """
+        Generate audio using ElevenLabs if voice_service is available.
+        
+        The audio is written to the audio blob store; returns its id.
+        """
+        if speech:
+            audio_bytes = await speech.finish()
+        elif self._voice_enabled():
+            audio_bytes = await self.voice_service.text_to_speech(response_text, self.voice_id)
+        else:
+            return None
+        
+        if not audio_bytes:
+            return None
+        
+        logger.info(f"Generated audio for {self.name}: {len(audio_bytes)} bytes")
+        return await get_audio_store().put(audio_bytes)
+    
+    async def _run_branch(
+        self,
+        name: str,
+        coro: Awaitable,
+        timeout_sec: float,
+        default: Any,
+        timings: dict[str, float]
+    ) -> Any:
+        """
+        Run one post-processing branch with a timeout.
+        
+        A failing or timed-out branch returns `default` so it cannot hold up
+        or break the others. The branch duration is stored in `timings` and
+        recorded as the `persona_<name>` latency metric.
+        """
+        start = time.perf_counter()
+        try:
+            return await asyncio.wait_for(coro, timeout=timeout_sec)
+        except asyncio.TimeoutError:
+            logger.warning(f"{name} for {self.name} timed out after {timeout_sec:.1f}s")
+            return default
+        except Exception as e:
+            logger.error(f"{name} for {self.name} failed: {e}")
+            return default
+        finally:
+            elapsed = time.perf_counter() - start
+            timings[name] = elapsed
+            get_latency_metrics().record(f"persona_{name}", elapsed)
+    
+    async def invoke(
+        self,
+        state: GameState,
+        on_token: Optional[TokenCallback] = None,
+        on_audio_segment: Optional[SegmentCallback] = None
+    ) -> GameState:
         """
         Main agent invocation - called by LangGraph.
         
         1. Reads shared knowledge from state
         2. Uses own private knowledge
-        3. Generates response
-        4. Updates state with response and dynamic changes
-        5. Extracts auto-notes from the response
+        3. Generates response (streamed to `on_token` if given); with a
+           voice, every finished sentence is synthesised while the rest is
+           still being generated (segments go to `on_audio_segment`)
+        4. Generates audio, detects clues and (inline mode only) extracts
+           auto-notes concurrently
+        5. Updates state with response and dynamic changes
         """
         logger.info(f"=== {self.name} AGENT INVOKED ===")
         logger.info(f"User message: {state['user_message']}")
         
-        # Build system prompt
+        # Build system prompt (static) and state prompt (changes between turns)
         system_prompt = self._build_system_prompt(state)
+        state_prompt = self._build_state_prompt(state)
         
         # Get chat history for this persona only
         history = self._get_persona_history(state)
         
-        # Build messages for LLM
+        # Build messages for LLM - stable prefix first, dynamic state last
         messages = [
             SystemMessage(content=system_prompt),
             *history,
+            *([SystemMessage(content=state_prompt)] if state_prompt else []),
             HumanMessage(content=state["user_message"])
         ]
         
         logger.info(f"System prompt length: {len(system_prompt)} chars")
         
+        # Sentence-pipelined TTS needs the streamed reply
+        speech = None
+        if self._voice_enabled():
+            speech = SpeechPipeline(self.voice_service, self.voice_id, on_segment=on_audio_segment)
+        
         # Call LLM
-        response = await self.llm.ainvoke(messages)
-        response_text = response.content
+        if on_token or speech:
+            response_text = await self._stream_response(messages, on_token, speech)
+        else:
+            async with get_llm_scheduler().slot(LLMPriority.CHAT, messages):
+                response = await self.llm.ainvoke(messages)
+            get_token_usage().record("persona_chat", response.usage_metadata)
+            response_text = response.content
         
         logger.info(f"Response: {response_text[:100]}...")
         
-        # Generate audio using ElevenLabs if voice_service is available
-        audio_base64 = None
-        if self.voice_service and self.voice_id:
-            try:
-                audio_bytes = await self.voice_service.text_to_speech(response_text, self.voice_id)
-                if audio_bytes:
-                    audio_base64 = self.voice_service.audio_to_base64(audio_bytes)
-                    logger.info(f"Generated audio for {self.name}: {len(audio_bytes)} bytes")
-            except Exception as e:
-                logger.error(f"Failed to generate audio for {self.name}: {e}")
-        
-        # Detect if we revealed a clue (keyword-based, legacy)
-        detected_clue = self._detect_revealed_clue(response_text)
-        
-        # Extract auto-notes from the response (LLM-based)
-        new_auto_notes = await self._extract_auto_notes(
-            user_question=state["user_message"],
-            response=response_text,
-            state=state
+        # Post-processing fan-out: audio, clue detection and (inline mode)
+        # auto-notes only depend on the response text, so they run
+        # concurrently, each bounded by its own timeout
+        branch_timings: dict[str, float] = {}
+        
+        async def detect_clue() -> Optional[str]:
+            # Keyword-based, legacy
+            return self._detect_revealed_clue(response_text)
+        
+        async def extract_notes() -> list[AutoNote]:
+            # In background mode the note extraction workers do this after the turn
+            if background_notes_enabled():
+                return []
+            return await self.extract_auto_notes(
+                user_question=state["user_message"],
+                response=response_text,
+                state=state
+            )
+        
+        audio_id, detected_clue, new_auto_notes = await asyncio.gather(
+            self._run_branch("tts", self._synthesize_audio(response_text, speech), PERSONA_TTS_TIMEOUT_SEC, None, branch_timings),
+            self._run_branch("clue", detect_clue(), PERSONA_CLUE_TIMEOUT_SEC, None, branch_timings),
+            self._run_branch("notes", extract_notes(), PERSONA_NOTES_TIMEOUT_SEC, [], branch_timings),
+        )
+        
+        logger.info(
+            f"Post-processing for {self.name}: "
+            + ", ".join(f"{name}={elapsed:.2f}s" for name, elapsed in branch_timings.items())
         )
         
         # Update agent's dynamic state
@@ -311,15 +481,14 @@ JSON Array:"""
         
         # Update auto_notes for this persona
         if new_auto_notes:
-            current_notes = state.get("auto_notes", {}).get(self.slug, [])
-            state["auto_notes"][self.slug] = current_notes + new_auto_notes
+            append_auto_notes(state, self.slug, new_auto_notes)
         
         # Set response in state
         state["final_response"] = response_text
         state["responding_agent"] = self.slug
         state["detected_clue"] = detected_clue
         state["new_auto_notes"] = new_auto_notes  # Notes from this specific response
-        state["audio_base64"] = audio_base64  # Added for voice integration
+        state["audio_id"] = audio_id  # Audio blob (served by /audio/{id})
         state["voice_id"] = self.voice_id  # Added for voice integration
         
         # Add to message history
@@ -327,7 +496,7 @@ JSON Array:"""
             role="assistant",
             persona_slug=self.slug,
             content=response_text,
-            audio_base64=audio_base64,  # Added for voice integration
+            audio_id=audio_id,  # Audio blob (served by /audio/{id})
             voice_id=self.voice_id  # Added for voice integration
         )
         state["messages"] = [new_message]  # Will be accumulated via Annotated[..., add]
@@ -338,3 +507,11 @@ JSON Array:"""
     
     def __repr__(self) -> str:
         return f"PersonaAgent(slug={self.slug}, name={self.name})"
+
+
+# All stress-band variants of the state prompt, rendered once
+STRESS_MODIFIERS: dict[tuple[int, bool], str] = {
+    (level, tired): PersonaAgent._build_stress_modifier(level, tired)
+    for level in range(3)
+    for tired in (False, True)
+}
@@ -25,6 +25,7 @@ class AutoNote(TypedDict):
     category: str  # "alibi", "motive", "relationship", "observation", "contradiction"
     timestamp: str  # When this was noted (ISO format)
     source_message: str  # Brief excerpt of the message that triggered this note
+    seq: int  # Position in the game's notes log (assigned by append_auto_notes)
 
 
 class Message(TypedDict):
@@ -32,7 +33,7 @@ class Message(TypedDict):
     role: str  # "user" or "assistant"
     persona_slug: Optional[str]  # Which persona sent this (None for user)
     content: str
-    audio_base64: Optional[str]  # Base64 encoded audio from ElevenLabs
+    audio_id: Optional[str]  # Audio blob id (served by /audio/{id})
     voice_id: Optional[str]  # Voice ID used for this message
 
 
@@ -58,11 +59,12 @@ class GameState(TypedDict):
     
     VOICE (ElevenLabs):
     - voice_assignments: mapping of persona slugs to voice IDs
-    - audio_base64: generated audio for current response
+    - audio_id: blob id of the generated audio for current response
     """
     
     # === Game Identification ===
     game_id: str
+    state_version: int  # Incremented by the GameStateStore on every write
     
     # === Shared Knowledge (all agents see this) ===
     scenario_name: str
@@ -93,13 +95,14 @@ class GameState(TypedDict):
     
     # === Auto-Generated Notes (grouped by persona) ===
     auto_notes: dict[str, list[AutoNote]]  # persona_slug -> list of notes
+    notes_seq: int  # Seq of the latest note (cursor for delta responses)
     
     # === Response (filled by responding agent) ===
     final_response: str
     responding_agent: str
     detected_clue: Optional[str]  # If this response reveals a clue
     new_auto_notes: list[AutoNote]  # Notes generated from current response
-    audio_base64: Optional[str]  # Generated audio for the response
+    audio_id: Optional[str]  # Blob id of the generated audio for the response
     voice_id: Optional[str]  # Voice ID used for audio generation
 
 
@@ -149,6 +152,7 @@ def create_initial_game_state(
     
     return GameState(
         game_id=game_id,
+        state_version=0,
         scenario_name=scenario["name"],
         setting=scenario["setting"],
         victim=f"{scenario['victim']['name']} ({scenario['victim']['role']})",
@@ -163,10 +167,45 @@ def create_initial_game_state(
         revealed_clues=[],
         game_status="active",
         auto_notes=auto_notes,
+        notes_seq=0,
         final_response="",
         responding_agent="",
         detected_clue=None,
         new_auto_notes=[],
-        audio_base64=None,
+        audio_id=None,
         voice_id=None
     )
+
+
+def append_auto_notes(state: GameState, persona_slug: str, notes: list[AutoNote]) -> list[AutoNote]:
+    """
+    Append notes to a persona's notes log, assigning increasing seq numbers.
+    
+    Returns the appended notes (with seq set).
+    """
+    seq = state.get("notes_seq", 0)
+    for note in notes:
+        seq += 1
+        note["seq"] = seq
+    
+    state.setdefault("auto_notes", {})
+    state["auto_notes"][persona_slug] = state["auto_notes"].get(persona_slug, []) + notes
+    state["notes_seq"] = seq
+    return notes
+
+
+def get_auto_notes_since(state: GameState, since: int) -> dict[str, list[AutoNote]]:
+    """
+    Get all notes with seq > since, grouped by persona.
+    
+    Notes are appended in seq order, so each persona's list is scanned
+    from the end and only the new tail is copied.
+    """
+    delta = {}
+    for persona_slug, notes in state.get("auto_notes", {}).items():
+        start = len(notes)
+        while start > 0 and notes[start - 1].get("seq", 0) > since:
+            start -= 1
+        if start < len(notes):
+            delta[persona_slug] = notes[start:]
+    return delta
@@ -8,25 +8,47 @@ Prompts and scenarios are loaded from the Laravel database via PromptService.
 """
 
 import os
+import json
+import time
+import base64
 import asyncio
 import logging
-from typing import Optional
+from datetime import datetime, timezone
+from typing import Literal, Optional
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
 from agents.gamemaster_agent import GameMasterAgent
-from agents.graph import create_murder_mystery_graph, get_graph_visualization
-from agents.state import Message
+from agents.graph import create_murder_mystery_graph, get_graph_visualization, get_graph_cache_info
+from agents.state import GameState, Message, get_auto_notes_since
 from scenarios.office_murder import OFFICE_MURDER_SCENARIO
 from scenarios.default_scenario import DEFAULT_SCENARIO
-from services.scenario_generator import ScenarioGenerator
+from services.scenario_generator import SCENARIO_SPECULATIVE_PHASE2, GenerationMetrics, ScenarioGenerator
+from services.scenario_pool import PooledScenario, ScenarioPool
 from services.prompt_service import get_prompt_service
 from services.image_generator import get_image_generator
+from services.session_registry import (
+    EvictionReason,
+    GameSession,
+    get_session_registry,
+    GAME_SESSION_IDLE_TTL_SEC,
+    GAME_SESSION_SWEEP_INTERVAL_SEC,
+)
+from services.game_state_store import get_game_state_store, GameStateConflictError, TranscriptOutOfSyncError
+from services.client_registry import get_client_registry
+from services.latency_metrics import get_latency_metrics
+from services.llm_scheduler import get_llm_scheduler
+from services.token_usage import get_token_usage
+from services.tts_cache import get_tts_cache
+from services.blob_store import blob_response, get_audio_store, get_image_store
+from services.note_extraction import NoteExtractionJob, background_notes_enabled, get_note_extraction_service
 from services import progress_service
+from services.laravel_logger import get_log_shipper
 
 # Setup logging
 logging.basicConfig(
@@ -42,10 +64,139 @@ load_dotenv()
 if not os.getenv("OPENAI_API_KEY"):
     raise ValueError("OPENAI_API_KEY environment variable is required")
 
-# Global instances - now per game_id
-gamemasters: dict[str, GameMasterAgent] = {}
-murder_graphs: dict[str, any] = {}
+# Global instances - GameMasters and graphs live in the bounded session registry,
+# game states and scenarios in the (possibly shared) game state store
+game_sessions = get_session_registry()
+game_state_store = get_game_state_store()
 scenario_generator: Optional[ScenarioGenerator] = None
+scenario_pool: Optional[ScenarioPool] = None
+background_tasks: list[asyncio.Task] = []
+# Chat turns of /chat/stream (kept referenced until they finish)
+stream_tasks: set[asyncio.Task] = set()
+latency_metrics = get_latency_metrics()
+note_extraction = get_note_extraction_service()
+audio_store = get_audio_store()
+image_store = get_image_store()
+
+# How chat audio is delivered when the request doesn't say (base64 | url)
+AUDIO_DELIVERY_DEFAULT = os.getenv("AUDIO_DELIVERY_DEFAULT", "url")
+# How crime scene images are delivered when the request doesn't say (base64 | url)
+IMAGE_DELIVERY_DEFAULT = os.getenv("IMAGE_DELIVERY_DEFAULT", "url")
+# Generate the default scenario's images at startup (unless already cached)
+IMAGE_WARMUP_ENABLED = os.getenv("IMAGE_WARMUP_ENABLED", "true").lower() == "true"
+
+
+def stop_note_extraction(session: GameSession, reason: str) -> None:
+    """Stop the note extraction worker of a game that left the registry."""
+    if reason != EvictionReason.REPLACED:
+        note_extraction.cancel(session.game_id)
+
+
+game_sessions.add_eviction_hook(stop_note_extraction)
+
+
+def release_game_state(session: GameSession, reason: str) -> None:
+    """
+    Delete the stored state of a game that left the registry for good.
+    
+    An expired game is over in every worker. With the in-process store the
+    state and transcript live in this worker's memory, so they go with the
+    session on any eviction - otherwise the memory budget would not bound
+    memory. With a shared store, idle games are left to
+    purge_stale_game_states (another worker may still be serving them).
+    """
+    if reason != EvictionReason.EXPIRED and not (
+        game_state_store.in_process
+        and reason in (EvictionReason.IDLE, EvictionReason.CAPACITY, EvictionReason.MEMORY)
+    ):
+        return
+    try:
+        task = asyncio.get_running_loop().create_task(
+            asyncio.to_thread(game_state_store.delete, session.game_id)
+        )
+    except RuntimeError:
+        # No running loop
+        game_state_store.delete(session.game_id)
+        return
+    release_tasks.add(task)
+    task.add_done_callback(release_tasks.discard)
+
+
+# Store deletions in progress (referenced until done)
+release_tasks: set[asyncio.Task] = set()
+game_sessions.add_eviction_hook(release_game_state)
+
+
+async def register_game(
+    game_id: str,
+    gamemaster: GameMasterAgent,
+    graph,
+    expires_at: Optional[datetime] = None
+) -> GameSession:
+    """Store a new game in this worker and persist its scenario (and expiry) for other workers."""
+    await asyncio.to_thread(
+        game_state_store.save_scenario,
+        game_id,
+        gamemaster.scenario,
+        expires_at.timestamp() if expires_at else None
+    )
+    return game_sessions.put(game_id, gamemaster, graph, expires_at=expires_at)
+
+
+async def get_session(game_id: str) -> Optional[GameSession]:
+    """
+    Look up the session of a game (marks it as recently used).
+    
+    If this worker has never seen the game (or evicted it), the GameMaster
+    is rebuilt from the scenario in the game state store - unless the game
+    has expired, then its stored state is dropped.
+    """
+    session = game_sessions.get(game_id)
+    if session:
+        return session
+    
+    stored = await asyncio.to_thread(game_state_store.load_scenario, game_id)
+    if not stored:
+        return None
+    
+    if stored.expires_at is not None and time.time() >= stored.expires_at:
+        logger.info(f"Game {game_id} has expired - dropping its stored state")
+        await asyncio.to_thread(game_state_store.delete, game_id)
+        return None
+    
+    logger.info(f"Rehydrating game {game_id} from game state store")
+    gamemaster = GameMasterAgent(
+        scenario=stored.scenario,
+        model_name=os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    )
+    expires_at = datetime.fromtimestamp(stored.expires_at, tz=timezone.utc) if stored.expires_at else None
+    return game_sessions.put(game_id, gamemaster, create_murder_mystery_graph(gamemaster), expires_at=expires_at)
+
+
+async def get_gamemaster(game_id: str) -> Optional[GameMasterAgent]:
+    """Look up the GameMaster of a game."""
+    session = await get_session(game_id)
+    return session.gamemaster if session else None
+
+
+async def purge_stale_game_states() -> None:
+    """Periodically drop stored games that outlived the session TTL."""
+    while True:
+        await asyncio.sleep(GAME_SESSION_SWEEP_INTERVAL_SEC)
+        try:
+            purged = await asyncio.to_thread(game_state_store.purge_older_than, GAME_SESSION_IDLE_TTL_SEC)
+            if purged:
+                logger.info(f"Purged {purged} stale games from game state store")
+        except Exception as e:
+            logger.error(f"Game state purge failed: {e}", exc_info=True)
+
+
+async def pinned_image_ids() -> set[str]:
+    """Images the image purger must keep: the cached default set and pooled scenarios."""
+    pinned = set(get_image_generator().cached_image_ids)
+    if scenario_pool:
+        pinned |= scenario_pool.image_ids()
+    return pinned
 
 
 def get_default_scenario() -> dict:
@@ -68,28 +219,57 @@ def get_default_scenario() -> dict:
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Initialize resources on startup"""
-    global gamemasters, murder_graphs, scenario_generator
+    global scenario_generator, scenario_pool
     
     logger.info("Initializing Murder Mystery Multi-Agent System...")
     
     # Pre-load prompts from database
     prompt_service = get_prompt_service()
-    prompt_service.reload()
+    await prompt_service.reload()
     
     # Initialize Scenario Generator
     scenario_generator = ScenarioGenerator(
         model_name=os.getenv("OPENAI_MODEL", "gpt-4o")  # Changed to gpt-4o for faster generation
     )
     
+    # Pre-generate random scenarios (no-op unless SCENARIO_POOL_SIZE > 0)
+    scenario_pool = ScenarioPool(scenario_generator, get_image_generator())
+    scenario_pool.refill()
+    
+    # Evict idle/expired games in the background
+    background_tasks.append(asyncio.create_task(game_sessions.run_sweeper()))
+    background_tasks.append(asyncio.create_task(purge_stale_game_states()))
+    background_tasks.append(asyncio.create_task(audio_store.run_purger()))
+    background_tasks.append(asyncio.create_task(image_store.run_purger(keep=pinned_image_ids)))
+    # Revalidate prompts in the background (readers never wait for Laravel)
+    background_tasks.append(asyncio.create_task(prompt_service.run_refresher()))
+    
+    # Warm the image set cache so quick-start never waits for Imagen
+    image_generator = get_image_generator()
+    if IMAGE_WARMUP_ENABLED and image_generator.enabled:
+        background_tasks.append(asyncio.create_task(
+            image_generator.generate_crime_scene_images(DEFAULT_SCENARIO, cache_set=True)
+        ))
+    
     logger.info("Multi-Agent System ready!")
     logger.info("GameMasters will be created dynamically per game")
     
     yield
     
     # Cleanup
-    gamemasters.clear()
-    murder_graphs.clear()
+    for task in background_tasks:
+        task.cancel()
+    # Let them unwind before the clients they use are closed
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    background_tasks.clear()
+    scenario_pool.close()
+    note_extraction.close()
+    game_sessions.clear()
+    await progress_service.get_progress_dispatcher().flush()
+    await get_log_shipper().close()
+    await get_client_registry().aclose()
     scenario_generator = None
+    scenario_pool = None
     logger.info("Shutdown complete")
 
 
@@ -118,6 +298,15 @@ class ChatRequest(BaseModel):
     persona_slug: str
     message: str
     chat_history: list[dict] = []
+    # Seq of the last transcript message the client has seen. When set, the
+    # server-side transcript is used and chat_history is only needed to resync.
+    turn_seq: Optional[int] = None
+    # Notes cursor from the last response. When set, all_auto_notes only
+    # contains notes after it; when omitted, the full snapshot is returned.
+    notes_since: Optional[int] = None
+    # "url": only audio_id / audio_url, bytes are fetched from GET /audio/{id} (default)
+    # "base64": audio inline as audio_base64 (legacy)
+    audio_delivery: Literal["base64", "url"] = AUDIO_DELIVERY_DEFAULT
 
 
 class AutoNoteResponse(BaseModel):
@@ -126,6 +315,25 @@ class AutoNoteResponse(BaseModel):
     category: str  # alibi, motive, relationship, observation, contradiction
     timestamp: str
     source_message: str
+    seq: int = 0  # Position in the game's notes log
+
+
+def to_note_response(note: dict) -> AutoNoteResponse:
+    """Convert a stored AutoNote to its response model"""
+    return AutoNoteResponse(
+        text=note.get("text", ""),
+        category=note.get("category", "observation"),
+        timestamp=note.get("timestamp", ""),
+        source_message=note.get("source_message", ""),
+        seq=note.get("seq", 0)
+    )
+
+
+class NotesResponse(BaseModel):
+    """Response for the notes log endpoint"""
+    game_id: str
+    notes: dict[str, list[AutoNoteResponse]]  # Notes after `since`, grouped by persona
+    notes_cursor: int  # Pass as `since` / `notes_since` next time
 
 
 class ChatResponse(BaseModel):
@@ -137,14 +345,19 @@ class ChatResponse(BaseModel):
     agent_stress: float = 0.0
     interrogation_count: int = 0
     new_auto_notes: list[AutoNoteResponse] = []  # Notes from this specific response
-    all_auto_notes: dict[str, list[AutoNoteResponse]] = {}  # All notes grouped by persona
-    audio_base64: Optional[str] = None  # Base64 encoded audio from ElevenLabs
+    all_auto_notes: dict[str, list[AutoNoteResponse]] = {}  # All notes (or notes after notes_since) grouped by persona
+    notes_cursor: int = 0  # Seq of the latest note (send back as notes_since)
+    audio_base64: Optional[str] = None  # Base64 encoded audio from ElevenLabs (audio_delivery=base64)
+    audio_id: Optional[str] = None  # Audio blob id
+    audio_url: Optional[str] = None  # Where to fetch the audio (GET /audio/{id})
     voice_id: Optional[str] = None  # Voice ID used for audio generation
+    turn_seq: int = 0  # Transcript seq after this turn (send back as turn_seq)
 
 
 class GameStartRequest(BaseModel):
     """Request for starting a new game"""
     game_id: str
+    expires_at: Optional[datetime] = None  # Laravel games.expires_at
 
 
 class VictimInfo(BaseModel):
@@ -165,7 +378,7 @@ class GameStartResponse(BaseModel):
     timeline: str = ""
     personas: list[dict]
     intro_message: str
-    crime_scene_images: list[str] = []  # Base64 encoded crime scene photos
+    crime_scene_images: list[str] = []  # Data URIs or /images/{id} URLs
 
 
 class ScenarioGenerateRequest(BaseModel):
@@ -173,6 +386,10 @@ class ScenarioGenerateRequest(BaseModel):
     game_id: str
     user_input: str = ""
     difficulty: str = "mittel"
+    expires_at: Optional[datetime] = None  # Laravel games.expires_at
+    # "url": crime_scene_images contains /images/{id} URLs (default)
+    # "base64": images inline as data URIs (legacy)
+    image_delivery: Literal["base64", "url"] = IMAGE_DELIVERY_DEFAULT
 
 
 class GenerationMetricsResponse(BaseModel):
@@ -180,7 +397,8 @@ class GenerationMetricsResponse(BaseModel):
     total_sec: float
     phase1_sec: float
     phase2_sec: float
-    retries: int = 0
+    retries: int = 0  # Phase 1 retries
+    phase2_retries: int = 0  # Persona retries
     persona_times: dict[str, float] = {}
 
 
@@ -190,12 +408,15 @@ class ScenarioGenerateResponse(BaseModel):
     game_id: str
     scenario_name: str
     metrics: Optional[GenerationMetricsResponse] = None
-    crime_scene_images: list[str] = []  # Base64 encoded crime scene photos
+    crime_scene_images: list[str] = []  # Data URIs or /images/{id} URLs (image_delivery)
+    crime_scene_image_ids: list[str] = []  # Image blob ids
 
 
 class QuickStartRequest(BaseModel):
     """Request for quick start with default scenario"""
     game_id: str
+    expires_at: Optional[datetime] = None  # Laravel games.expires_at
+    image_delivery: Literal["base64", "url"] = IMAGE_DELIVERY_DEFAULT  # See ScenarioGenerateRequest
 
 
 # === API Endpoints ===
@@ -208,10 +429,44 @@ async def health_check():
         "service": "murder-mystery-ai",
         "version": "2.0.0",
         "multi_agent": True,
-        "active_games": len(gamemasters)
+        "active_games": len(game_sessions),
+        "sessions": game_sessions.stats()
+    }
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """Performance metrics (sessions, upstream connections, request latencies)"""
+    return {
+        "sessions": game_sessions.stats(),
+        "upstream": get_client_registry().stats(),
+        "llm_scheduler": get_llm_scheduler().stats(),
+        "token_usage": get_token_usage().stats(),
+        "progress": progress_service.get_progress_dispatcher().stats(),
+        "prompts": get_prompt_service().stats(),
+        "laravel_logs": get_log_shipper().stats(),
+        "auto_notes": note_extraction.stats(),
+        "tts_cache": tts_cache.stats() if (tts_cache := get_tts_cache()) else None,
+        "audio_store": audio_store.stats(),
+        "image_store": image_store.stats(),
+        "scenario_pool": scenario_pool.stats() if scenario_pool else None,
+        "latency": latency_metrics.stats()
     }
 
 
+async def crime_scene_image_refs(image_ids: list[str], delivery: str = "url") -> list[str]:
+    """Image references for a response: /images/{id} URLs or (legacy) data URIs."""
+    if delivery == "url":
+        return [f"/images/{image_id}" for image_id in image_ids]
+    
+    data_uris = []
+    for image_id in image_ids:
+        image_bytes = await image_store.read(image_id)
+        if image_bytes:
+            data_uris.append(f"data:image/png;base64,{base64.b64encode(image_bytes).decode('utf-8')}")
+    return data_uris
+
+
 @app.post("/scenario/quick-start")
 async def quick_start_scenario(request: QuickStartRequest):
     """
@@ -226,19 +481,22 @@ async def quick_start_scenario(request: QuickStartRequest):
             scenario=DEFAULT_SCENARIO,
             model_name=os.getenv("OPENAI_MODEL", "gpt-4o")
         )
-        gamemasters[request.game_id] = new_gamemaster
-        
         # Create a new graph for this gamemaster
-        murder_graphs[request.game_id] = create_murder_mystery_graph(new_gamemaster)
+        await register_game(
+            request.game_id,
+            new_gamemaster,
+            create_murder_mystery_graph(new_gamemaster),
+            expires_at=request.expires_at
+        )
         
         logger.info(f"Default scenario loaded instantly for game_id: {request.game_id}")
         
         # Generate crime scene images for default scenario
         image_generator = get_image_generator()
-        crime_scene_images = await image_generator.generate_crime_scene_images(DEFAULT_SCENARIO)
+        image_ids = await image_generator.generate_crime_scene_images(DEFAULT_SCENARIO, cache_set=True)
         
         # Get game info for the response
-        game_info = new_gamemaster.get_game_info(request.game_id)
+        game_info = await new_gamemaster.get_game_info(request.game_id)
         
         return {
             "success": True,
@@ -251,7 +509,8 @@ async def quick_start_scenario(request: QuickStartRequest):
             "timeline": game_info.get('timeline', ''),
             "personas": game_info['personas'],
             "intro_message": game_info['intro_message'],
-            "crime_scene_images": crime_scene_images,
+            "crime_scene_images": await crime_scene_image_refs(image_ids, request.image_delivery),
+            "crime_scene_image_ids": image_ids,
         }
     except Exception as e:
         logger.error(f"Error loading default scenario: {e}", exc_info=True)
@@ -279,52 +538,67 @@ async def generate_scenario(request: ScenarioGenerateRequest):
     logger.info(f"   Input:      {request.user_input[:50] + '...' if len(request.user_input) > 50 else request.user_input or '(random)'}")
     logger.info("=" * 70)
     
+    # Random scenarios come from the pre-generated pool when available
+    if not request.user_input.strip() and scenario_pool:
+        pooled = scenario_pool.take(request.difficulty)
+        if pooled:
+            return await start_pooled_scenario(request, pooled, request_start)
+    
     try:
-        # === PHASE 1: Generate base scenario ===
-        phase1_start = time.time()
-        base_scenario = await scenario_generator.generate_base_only(
-            user_input=request.user_input,
-            difficulty=request.difficulty,
-            game_id=request.game_id
-        )
-        phase1_time = time.time() - phase1_start
-        
-        logger.info(f"   Phase 1 complete: {base_scenario.name} ({phase1_time:.2f}s)")
-        
-        # === PHASE 2 + IMAGES IN PARALLEL ===
-        # Images only need the base scenario, so start them alongside persona generation!
-        parallel_start = time.time()
-        
-        # Broadcast: Starting parallel work (personas + images)
-        await progress_service.generating_images(request.game_id)
-        
-        async def generate_personas():
-            """Phase 2: Generate detailed personas"""
-            return await scenario_generator.generate_personas_from_base(
-                base_scenario=base_scenario,
+        if SCENARIO_SPECULATIVE_PHASE2:
+            # === PHASE 1 STREAMED, PHASE 2 + IMAGES START WHILE IT RUNS ===
+            scenario, image_ids = await generate_scenario_speculative(request)
+            phase1_time = scenario["_metrics"]["phase1_sec"]
+            parallel_time = time.time() - request_start - phase1_time
+        else:
+            # === PHASE 1: Generate base scenario ===
+            phase1_start = time.time()
+            generation_metrics = GenerationMetrics()
+            base_scenario = await scenario_generator.generate_base_only(
+                user_input=request.user_input,
                 difficulty=request.difficulty,
-                game_id=request.game_id
+                game_id=request.game_id,
+                metrics=generation_metrics
             )
-        
-        async def generate_images():
-            """Generate crime scene images (uses base scenario only)"""
-            image_gen = get_image_generator()
-            # Convert BaseScenarioModel to dict for image generator
-            scenario_for_images = {
-                "name": base_scenario.name,
-                "setting": base_scenario.setting,
-                "victim": base_scenario.victim.model_dump(),
-                "solution": base_scenario.solution.model_dump(),
-            }
-            return await image_gen.generate_crime_scene_images(scenario_for_images)
-        
-        # Run BOTH in parallel - this is the key optimization!
-        scenario, crime_scene_images = await asyncio.gather(
-            generate_personas(),
-            generate_images()
-        )
-        
-        parallel_time = time.time() - parallel_start
+            phase1_time = time.time() - phase1_start
+            
+            logger.info(f"   Phase 1 complete: {base_scenario.name} ({phase1_time:.2f}s)")
+            
+            # === PHASE 2 + IMAGES IN PARALLEL ===
+            # Images only need the base scenario, so start them alongside persona generation!
+            parallel_start = time.time()
+            
+            # Broadcast: Starting parallel work (personas + images)
+            await progress_service.generating_images(request.game_id)
+            
+            async def generate_personas():
+                """Phase 2: Generate detailed personas"""
+                return await scenario_generator.generate_personas_from_base(
+                    base_scenario=base_scenario,
+                    difficulty=request.difficulty,
+                    game_id=request.game_id,
+                    metrics=generation_metrics
+                )
+            
+            async def generate_images():
+                """Generate crime scene images (uses base scenario only)"""
+                image_gen = get_image_generator()
+                # Convert BaseScenarioModel to dict for image generator
+                scenario_for_images = {
+                    "name": base_scenario.name,
+                    "setting": base_scenario.setting,
+                    "victim": base_scenario.victim.model_dump(),
+                    "solution": base_scenario.solution.model_dump(),
+                }
+                return await image_gen.generate_crime_scene_images(scenario_for_images)
+            
+            # Run BOTH in parallel - this is the key optimization!
+            scenario, image_ids = await asyncio.gather(
+                generate_personas(),
+                generate_images()
+            )
+            
+            parallel_time = time.time() - parallel_start
         
         # === FINALIZE: GameMaster + Graph (fast, sync) ===
         await progress_service.initializing_game(request.game_id)
@@ -338,8 +612,7 @@ async def generate_scenario(request: ScenarioGenerateRequest):
         gm_time = time.time() - gm_start
         
         # Store them
-        gamemasters[request.game_id] = gamemaster
-        murder_graphs[request.game_id] = graph
+        await register_game(request.game_id, gamemaster, graph, expires_at=request.expires_at)
         
         # Broadcast: Complete
         await progress_service.complete(request.game_id)
@@ -352,7 +625,7 @@ async def generate_scenario(request: ScenarioGenerateRequest):
         logger.info(f"   Scenario:       {scenario['name']}")
         logger.info(f"   Personas:       {len(scenario['personas'])}")
         logger.info(f"   Murderer:       {scenario['solution']['murderer']}")
-        logger.info(f"   Images:         {len(crime_scene_images)}")
+        logger.info(f"   Images:         {len(image_ids)}")
         logger.info("-" * 70)
         logger.info(f"   ⏱️  Phase 1:      {phase1_time:.2f}s (base scenario)")
         logger.info(f"   ⏱️  Parallel:     {parallel_time:.2f}s (Phase2 + Images)")
@@ -369,6 +642,7 @@ async def generate_scenario(request: ScenarioGenerateRequest):
                 phase1_sec=metrics_data.get("phase1_sec", 0),
                 phase2_sec=metrics_data.get("phase2_sec", 0),
                 retries=metrics_data.get("retries", 0),
+                phase2_retries=metrics_data.get("phase2_retries", 0),
                 persona_times=metrics_data.get("persona_times", {})
             )
         
@@ -377,7 +651,8 @@ async def generate_scenario(request: ScenarioGenerateRequest):
             game_id=request.game_id,
             scenario_name=scenario["name"],
             metrics=metrics_response,
-            crime_scene_images=crime_scene_images
+            crime_scene_images=await crime_scene_image_refs(image_ids, request.image_delivery),
+            crime_scene_image_ids=image_ids
         )
         
     except Exception as e:
@@ -393,10 +668,83 @@ async def generate_scenario(request: ScenarioGenerateRequest):
         raise HTTPException(status_code=500, detail=f"Scenario generation failed: {str(e)}")
 
 
+async def generate_scenario_speculative(request: ScenarioGenerateRequest) -> tuple[dict, list[str]]:
+    """
+    Generate a scenario with Phase 2 overlapping the streamed Phase 1.
+    
+    Images are started as soon as the scene (setting, victim, solution)
+    is complete. Returns the scenario and the image ids.
+    """
+    image_task: Optional[asyncio.Task] = None
+    
+    async def generate_images(scenario_for_images: dict) -> list[str]:
+        await progress_service.generating_images(request.game_id)
+        return await get_image_generator().generate_crime_scene_images(scenario_for_images)
+    
+    def start_images(scenario_for_images: dict) -> None:
+        nonlocal image_task
+        if image_task is not None:
+            # Phase 1 was retried - the earlier scene is gone
+            image_task.cancel()
+        image_task = asyncio.create_task(generate_images(scenario_for_images))
+    
+    try:
+        scenario = await scenario_generator.generate_speculative(
+            user_input=request.user_input,
+            difficulty=request.difficulty,
+            game_id=request.game_id,
+            on_scene_ready=start_images
+        )
+    except BaseException:
+        if image_task is not None:
+            image_task.cancel()
+        raise
+    
+    return scenario, await image_task
+
+
+async def start_pooled_scenario(
+    request: ScenarioGenerateRequest,
+    pooled: PooledScenario,
+    request_start: float
+) -> ScenarioGenerateResponse:
+    """Start a game with a scenario from the pool (no generation)."""
+    await progress_service.started(request.game_id)
+    await progress_service.initializing_game(request.game_id)
+    
+    scenario = pooled.scenario
+    gamemaster = GameMasterAgent(
+        scenario=scenario,
+        model_name=os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    )
+    await register_game(
+        request.game_id,
+        gamemaster,
+        create_murder_mystery_graph(gamemaster),
+        expires_at=request.expires_at
+    )
+    
+    # The images may have waited in the pool for a while - their TTL starts with the game
+    await image_store.touch(pooled.image_ids)
+    await progress_service.complete(request.game_id)
+    
+    total_time = time.time() - request_start
+    logger.info(f"✅ POST /scenario/generate COMPLETE from pool: {scenario['name']} in {total_time:.2f}s")
+    
+    return ScenarioGenerateResponse(
+        success=True,
+        game_id=request.game_id,
+        scenario_name=scenario["name"],
+        metrics=GenerationMetricsResponse(total_sec=round(total_time, 2), phase1_sec=0, phase2_sec=0),
+        crime_scene_images=await crime_scene_image_refs(pooled.image_ids, request.image_delivery),
+        crime_scene_image_ids=pooled.image_ids
+    )
+
+
 @app.post("/game/start", response_model=GameStartResponse)
 async def start_game(request: GameStartRequest):
     """Initialize a new game session"""
-    gamemaster = gamemasters.get(request.game_id)
+    gamemaster = await get_gamemaster(request.game_id)
     
     if not gamemaster:
         raise HTTPException(
@@ -405,120 +753,370 @@ async def start_game(request: GameStartRequest):
         )
     
     # Initialize game state
-    gamemaster.initialize_game(request.game_id)
+    await gamemaster.initialize_game(request.game_id)
     
     # Get game info
-    game_info = gamemaster.get_game_info(request.game_id)
+    game_info = await gamemaster.get_game_info(request.game_id)
     
     return GameStartResponse(**game_info)
 
 
-@app.post("/chat", response_model=ChatResponse)
-async def chat_with_persona(request: ChatRequest):
-    """
-    Send a message to a specific persona using the LangGraph.
-    
-    This is the main endpoint that invokes the multi-agent system.
-    """
-    import time
-    request_start = time.time()
-    
-    gamemaster = gamemasters.get(request.game_id)
-    murder_graph = murder_graphs.get(request.game_id)
+async def get_chat_session(request: ChatRequest) -> GameSession:
+    """Look up the session of a chat request and validate the persona."""
+    session = await get_session(request.game_id)
     
-    if not gamemaster or not murder_graph:
+    if not session:
         raise HTTPException(
             status_code=404,
             detail=f"Game {request.game_id} not found. Start a game first."
         )
     
     # Validate persona
-    valid_personas = list(gamemaster.persona_agents.keys())
+    valid_personas = list(session.gamemaster.persona_agents.keys())
     if request.persona_slug not in valid_personas:
         raise HTTPException(
             status_code=400,
             detail=f"Invalid persona. Choose from: {valid_personas}"
         )
     
+    return session
+
+
+async def prepare_chat_state(request: ChatRequest, gamemaster: GameMasterAgent) -> GameState:
+    """Prepare the graph input state, mapping transcript conflicts to 409."""
     try:
-        # Prepare state for the graph
-        state = gamemaster.prepare_state_for_agent(
+        return await gamemaster.prepare_state_for_agent(
             game_id=request.game_id,
             persona_slug=request.persona_slug,
             user_message=request.message,
-            chat_history=request.chat_history
+            chat_history=request.chat_history,
+            turn_seq=request.turn_seq
         )
-        
-        logger.info(f"💬 POST /chat - {request.persona_slug}")
-        logger.info(f"   Game: {request.game_id[:8]}...")
-        logger.info(f"   Message: \"{request.message[:60]}{'...' if len(request.message) > 60 else ''}\"")
-        
+    except TranscriptOutOfSyncError as e:
+        logger.warning(f"   ⚠️ {e}")
+        raise HTTPException(
+            status_code=409,
+            detail={"error": "transcript_out_of_sync", "server_seq": e.server_seq}
+        )
+
+
+def audio_url(audio_id: str) -> str:
+    return f"/audio/{audio_id}"
+
+
+async def build_chat_response(
+    request: ChatRequest,
+    gamemaster: GameMasterAgent,
+    final_state: GameState,
+    turn_seq: int
+) -> ChatResponse:
+    """Build the chat response from the graph's final state."""
+    agent = gamemaster.get_persona_agent(request.persona_slug)
+    agent_state = final_state.get("agent_states", {}).get(request.persona_slug, {})
+    
+    # Convert auto notes to response format
+    new_notes = [to_note_response(note) for note in final_state.get("new_auto_notes", [])]
+    
+    # Full snapshot for legacy clients, otherwise only notes after the cursor
+    if request.notes_since is None:
+        notes_by_persona = final_state.get("auto_notes", {})
+    else:
+        notes_by_persona = get_auto_notes_since(final_state, request.notes_since)
+    all_notes = {
+        persona_slug: [to_note_response(note) for note in notes]
+        for persona_slug, notes in notes_by_persona.items()
+    }
+    
+    # Audio is stored as a blob; only legacy clients get the bytes inline
+    audio_id = final_state.get("audio_id")
+    audio_base64 = None
+    if audio_id and request.audio_delivery == "base64":
+        audio_bytes = await audio_store.read(audio_id)
+        if audio_bytes:
+            audio_base64 = gamemaster.voice_service.audio_to_base64(audio_bytes)
+    
+    return ChatResponse(
+        persona_slug=final_state.get("responding_agent", request.persona_slug),
+        response=final_state.get("final_response", ""),
+        persona_name=agent.name if agent else request.persona_slug,
+        revealed_clue=final_state.get("detected_clue"),
+        agent_stress=agent_state.get("stress_level", 0.0),
+        interrogation_count=agent_state.get("interrogation_count", 0),
+        new_auto_notes=new_notes,
+        all_auto_notes=all_notes,
+        notes_cursor=final_state.get("notes_seq", 0),
+        audio_base64=audio_base64,  # Added for voice integration
+        audio_id=audio_id,
+        audio_url=audio_url(audio_id) if audio_id else None,
+        voice_id=final_state.get("voice_id"),  # Added for voice integration
+        turn_seq=turn_seq
+    )
+
+
+async def run_chat_turn(
+    request: ChatRequest,
+    session: GameSession,
+    state: GameState,
+    config: Optional[dict] = None
+) -> ChatResponse:
+    """Invoke the graph for one chat turn and persist the result."""
+    gamemaster = session.gamemaster
+    turn_start = len(state["messages"]) - 1
+    
+    # Pin the GameMaster for the whole turn - the session may be evicted
+    # while the persona is waiting for the LLM
+    config = dict(config or {})
+    config["configurable"] = {**config.get("configurable", {}), "gamemaster": gamemaster}
+    
+    final_state = await session.graph.ainvoke(state, config=config)
+    
+    # Update stored game state and append this turn to the transcript
+    turn_seq = await gamemaster.commit_turn(request.game_id, final_state, turn_start)
+    # The in-process store keeps the transcript in this worker's memory
+    transcript_chars = 0
+    if game_state_store.in_process:
+        transcript_chars = await asyncio.to_thread(game_state_store.transcript_chars, request.game_id)
+    game_sessions.refresh_size(request.game_id, final_state, transcript_chars)
+    
+    # Auto-notes of this turn are extracted after the reply (background mode)
+    if background_notes_enabled():
+        await note_extraction.submit(NoteExtractionJob(
+            game_id=request.game_id,
+            agent=gamemaster.get_persona_agent(final_state.get("responding_agent", request.persona_slug)),
+            user_question=request.message,
+            response=final_state.get("final_response", ""),
+            context={"victim": final_state.get("victim"), "timeline": final_state.get("timeline")}
+        ))
+    
+    return await build_chat_response(request, gamemaster, final_state, turn_seq)
+
+
+def log_chat_request(endpoint: str, request: ChatRequest) -> None:
+    logger.info(f"💬 POST {endpoint} - {request.persona_slug}")
+    logger.info(f"   Game: {request.game_id[:8]}...")
+    logger.info(f"   Message: \"{request.message[:60]}{'...' if len(request.message) > 60 else ''}\"")
+
+
+def log_chat_response(response: ChatResponse, graph_time: float, total_time: float) -> None:
+    logger.info(f"   ✅ Response in {graph_time:.2f}s (total: {total_time:.2f}s)")
+    logger.info(f"   Response: \"{response.response[:60]}{'...' if len(response.response) > 60 else ''}\"")
+    logger.info(f"   Stress: {response.agent_stress:.2f}, Interrogations: {response.interrogation_count}")
+
+
+@app.post("/chat", response_model=ChatResponse)
+async def chat_with_persona(request: ChatRequest):
+    """
+    Send a message to a specific persona using the LangGraph.
+    
+    This is the main endpoint that invokes the multi-agent system.
+    """
+    request_start = time.time()
+    
+    session = await get_chat_session(request)
+    state = await prepare_chat_state(request, session.gamemaster)
+    log_chat_request("/chat", request)
+    
+    try:
         # Invoke the LangGraph
         graph_start = time.time()
-        final_state = await murder_graph.ainvoke(state)
+        response = await run_chat_turn(request, session, state)
         graph_time = time.time() - graph_start
         
-        # Update stored game state
-        gamemaster.update_game_state(request.game_id, final_state)
-        
-        # Get agent info for response
-        agent = gamemaster.get_persona_agent(request.persona_slug)
-        agent_state = final_state.get("agent_states", {}).get(request.persona_slug, {})
-        
-        response_text = final_state.get("final_response", "")
         total_time = time.time() - request_start
+        latency_metrics.record("chat_total", total_time)
+        log_chat_response(response, graph_time, total_time)
         
-        logger.info(f"   ✅ Response in {graph_time:.2f}s (total: {total_time:.2f}s)")
-        logger.info(f"   Response: \"{response_text[:60]}{'...' if len(response_text) > 60 else ''}\"")
-        logger.info(f"   Stress: {agent_state.get('stress_level', 0):.2f}, Interrogations: {agent_state.get('interrogation_count', 0)}")
-        
-        # Convert auto notes to response format
-        new_notes = [
-            AutoNoteResponse(
-                text=note.get("text", ""),
-                category=note.get("category", "observation"),
-                timestamp=note.get("timestamp", ""),
-                source_message=note.get("source_message", "")
-            )
-            for note in final_state.get("new_auto_notes", [])
-        ]
-        
-        # Get all auto notes grouped by persona
-        all_notes = {}
-        for persona_slug, notes in final_state.get("auto_notes", {}).items():
-            all_notes[persona_slug] = [
-                AutoNoteResponse(
-                    text=note.get("text", ""),
-                    category=note.get("category", "observation"),
-                    timestamp=note.get("timestamp", ""),
-                    source_message=note.get("source_message", "")
-                )
-                for note in notes
-            ]
-        
-        return ChatResponse(
-            persona_slug=final_state.get("responding_agent", request.persona_slug),
-            response=final_state.get("final_response", ""),
-            persona_name=agent.name if agent else request.persona_slug,
-            revealed_clue=final_state.get("detected_clue"),
-            agent_stress=agent_state.get("stress_level", 0.0),
-            interrogation_count=agent_state.get("interrogation_count", 0),
-            new_auto_notes=new_notes,
-            all_auto_notes=all_notes,
-            audio_base64=final_state.get("audio_base64"),  # Added for voice integration
-            voice_id=final_state.get("voice_id")  # Added for voice integration
-        )
+        return response
         
+    except GameStateConflictError as e:
+        logger.warning(f"   ⚠️ Chat turn conflicted with a concurrent update: {e}")
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         total_time = time.time() - request_start
         logger.error(f"   ❌ Chat failed after {total_time:.2f}s: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def sse_event(event: str, data: dict) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.post("/chat/stream")
+async def chat_with_persona_stream(request: ChatRequest):
+    """
+    Streaming variant of /chat (Server-Sent Events).
+    
+    Sends `token` events while the persona's answer is generated and, if
+    the persona has a voice, `audio_segment` events (index, text and
+    audio_base64 or audio_url, depending on audio_delivery) in sentence
+    order as soon as each sentence is synthesised. Trailing events once
+    the turn is complete:
+    - clue: revealed clue (only if one was detected)
+    - state: persona stress, interrogation count and turn_seq
+    - notes: new notes, all notes (or the delta after notes_since) and cursor
+    - audio: voice_id, segment count and audio_id/audio_url of the full
+      audio; audio_base64 only if no segments were streamed
+    - done: the full response text
+    An `error` event is sent instead if the turn fails.
+    """
+    request_start = time.time()
+    
+    session = await get_chat_session(request)
+    state = await prepare_chat_state(request, session.gamemaster)
+    log_chat_request("/chat/stream", request)
+    
+    # (event, data) pairs produced while the graph runs, None when done
+    events: asyncio.Queue[Optional[tuple[str, dict]]] = asyncio.Queue()
+    
+    async def on_token(text: str) -> None:
+        await events.put(("token", {"text": text}))
+    
+    async def on_audio_segment(index: int, audio: bytes, text: str) -> None:
+        segment = {"index": index, "text": text}
+        if request.audio_delivery == "url":
+            segment["audio_url"] = audio_url(await audio_store.put(audio))
+        else:
+            segment["audio_base64"] = session.gamemaster.voice_service.audio_to_base64(audio)
+        await events.put(("audio_segment", segment))
+    
+    async def run_turn() -> ChatResponse:
+        try:
+            return await run_chat_turn(request, session, state, config={
+                "configurable": {"on_token": on_token, "on_audio_segment": on_audio_segment}
+            })
+        finally:
+            await events.put(None)
+    
+    # The turn runs as its own task so it still completes (and is persisted)
+    # if the client disconnects mid-stream
+    turn_task = asyncio.create_task(run_turn())
+    stream_tasks.add(turn_task)
+    turn_task.add_done_callback(stream_tasks.discard)
+    
+    async def event_stream():
+        first_token_at = None
+        audio_segments = 0
+        while (item := await events.get()) is not None:
+            event, data = item
+            if event == "token" and first_token_at is None:
+                first_token_at = time.time()
+                latency_metrics.record("chat_stream_ttft", first_token_at - request_start)
+            elif event == "audio_segment":
+                if audio_segments == 0:
+                    latency_metrics.record("chat_stream_first_audio", time.time() - request_start)
+                audio_segments += 1
+            yield sse_event(event, data)
+        
+        try:
+            response = await turn_task
+        except GameStateConflictError as e:
+            logger.warning(f"   ⚠️ Chat turn conflicted with a concurrent update: {e}")
+            yield sse_event("error", {"status": 409, "detail": str(e)})
+            return
+        except Exception as e:
+            total_time = time.time() - request_start
+            logger.error(f"   ❌ Chat stream failed after {total_time:.2f}s: {e}", exc_info=True)
+            yield sse_event("error", {"status": 500, "detail": str(e)})
+            return
+        
+        total_time = time.time() - request_start
+        latency_metrics.record("chat_stream_total", total_time)
+        ttft = (first_token_at - request_start) if first_token_at else total_time
+        logger.info(f"   ⚡ First token after {ttft:.2f}s")
+        log_chat_response(response, total_time, total_time)
+        
+        if response.revealed_clue:
+            yield sse_event("clue", {"revealed_clue": response.revealed_clue})
+        yield sse_event("state", {
+            "persona_slug": response.persona_slug,
+            "persona_name": response.persona_name,
+            "agent_stress": response.agent_stress,
+            "interrogation_count": response.interrogation_count,
+            "turn_seq": response.turn_seq,
+        })
+        yield sse_event("notes", {
+            "new_auto_notes": [note.model_dump() for note in response.new_auto_notes],
+            "all_auto_notes": {
+                slug: [note.model_dump() for note in notes]
+                for slug, notes in response.all_auto_notes.items()
+            },
+            "notes_cursor": response.notes_cursor,
+        })
+        if response.audio_id:
+            audio = {
+                "voice_id": response.voice_id,
+                "segments": audio_segments,
+                "audio_id": response.audio_id,
+                "audio_url": response.audio_url,
+            }
+            if not audio_segments and response.audio_base64:
+                audio["audio_base64"] = response.audio_base64
+            yield sse_event("audio", audio)
+        yield sse_event("done", {"response": response.response})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.get("/game/{game_id}/notes", response_model=NotesResponse)
+async def get_notes(game_id: str, since: int = 0):
+    """Get the auto-notes of a game after the `since` cursor (0 = all notes)"""
+    gamemaster = await get_gamemaster(game_id)
+    
+    if not gamemaster:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Game {game_id} not found"
+        )
+    
+    state = await gamemaster.get_game_state(game_id)
+    if not state:
+        raise HTTPException(status_code=404, detail="Game state not initialized")
+    
+    return NotesResponse(
+        game_id=game_id,
+        notes={
+            persona_slug: [to_note_response(note) for note in notes]
+            for persona_slug, notes in get_auto_notes_since(state, since).items()
+        },
+        notes_cursor=state.get("notes_seq", 0)
+    )
+
+
+@app.get("/audio/{audio_id}")
+async def get_audio(audio_id: str, request: Request):
+    """Serve synthesised audio (MP3) from the audio blob store, with Range support."""
+    path = audio_store.path(audio_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Audio not found or expired")
+    
+    return blob_response(
+        path,
+        media_type="audio/mpeg",
+        range_header=request.headers.get("range"),
+        cache_control=f"private, max-age={int(audio_store.ttl_sec)}, immutable"
+    )
+
+
+@app.get("/images/{image_id}")
+async def get_image(image_id: str):
+    """Serve a generated crime scene image from the image blob store."""
+    path = image_store.path(image_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Image not found")
+    
+    # Content-addressed, so the URL never changes its content
+    return blob_response(path, media_type="image/png", cache_control="public, max-age=31536000, immutable")
+
+
 @app.get("/personas")
 async def get_personas(game_id: str):
     """Get list of available personas for a game"""
-    gamemaster = gamemasters.get(game_id)
+    gamemaster = await get_gamemaster(game_id)
     
     if not gamemaster:
         raise HTTPException(
@@ -547,7 +1145,7 @@ async def get_personas(game_id: str):
 @app.get("/debug/personas")
 async def get_personas_debug(game_id: str):
     """Get all personas with their full knowledge for debugging"""
-    gamemaster = gamemasters.get(game_id)
+    gamemaster = await get_gamemaster(game_id)
     
     if not gamemaster:
         raise HTTPException(
@@ -563,7 +1161,7 @@ async def get_personas_debug(game_id: str):
 @app.get("/game/{game_id}/solution")
 async def get_game_solution(game_id: str):
     """Get the solution for a game (murderer, motive, weapon, clues)"""
-    gamemaster = gamemasters.get(game_id)
+    gamemaster = await get_gamemaster(game_id)
     
     if not gamemaster:
         raise HTTPException(
@@ -593,7 +1191,7 @@ async def get_game_solution(game_id: str):
 @app.post("/game/{game_id}/hint")
 async def get_hint(game_id: str):
     """Get a hint from the GameMaster to help the player progress"""
-    gamemaster = gamemasters.get(game_id)
+    gamemaster = await get_gamemaster(game_id)
     
     if not gamemaster:
         raise HTTPException(
@@ -615,13 +1213,16 @@ async def get_hint(game_id: str):
 @app.get("/debug/graph")
 async def get_graph_debug():
     """Get the graph structure for visualization"""
-    return get_graph_visualization()
+    return {
+        **get_graph_visualization(),
+        "graph_cache": get_graph_cache_info()
+    }
 
 
 @app.get("/debug/game/{game_id}/state")
 async def get_game_state_debug(game_id: str):
     """Get the full game state for debugging"""
-    gamemaster = gamemasters.get(game_id)
+    gamemaster = await get_gamemaster(game_id)
     
     if not gamemaster:
         raise HTTPException(
@@ -629,7 +1230,7 @@ async def get_game_state_debug(game_id: str):
             detail=f"Game {game_id} not found"
         )
     
-    state = gamemaster.get_game_state(game_id)
+    state = await gamemaster.get_game_state(game_id)
     if not state:
         raise HTTPException(status_code=404, detail="Game state not initialized")
     
@@ -639,15 +1240,15 @@ async def get_game_state_debug(game_id: str):
         "scenario_name": state.get("scenario_name"),
         "revealed_clues": state.get("revealed_clues", []),
         "agent_states": state.get("agent_states", {}),
-        "message_count": len(state.get("messages", [])),
-        "messages": state.get("messages", [])[-20:]  # Last 20 messages
+        "message_count": await asyncio.to_thread(game_state_store.message_count, game_id),
+        "messages": await gamemaster.get_recent_messages(game_id, 20)  # Last 20 messages
     }
 
 
 @app.get("/debug/agents")
 async def get_agents_info(game_id: str):
     """Get info about all loaded agents for a game"""
-    gamemaster = gamemasters.get(game_id)
+    gamemaster = await get_gamemaster(game_id)
     
     if not gamemaster:
         raise HTTPException(
@@ -681,7 +1282,8 @@ async def reload_prompts():
     without restarting the AI service.
     """
     prompt_service = get_prompt_service()
-    prompt_service.reload()
+    if not await prompt_service.reload():
+        raise HTTPException(status_code=502, detail="Could not reload prompts from database")
     
     return {
         "status": "success",
@@ -713,8 +1315,7 @@ async def use_default_scenario(request: GameStartRequest):
         graph = create_murder_mystery_graph(gamemaster)
         
         # Store them
-        gamemasters[request.game_id] = gamemaster
-        murder_graphs[request.game_id] = graph
+        await register_game(request.game_id, gamemaster, graph, expires_at=request.expires_at)
         
         logger.info(f"✅ Game {request.game_id} initialized with default scenario: {scenario['name']}")
         
@@ -731,4 +1332,10 @@ async def use_default_scenario(request: GameStartRequest):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    
+    # Multiple workers need a shared game state store (GAME_STATE_STORE=sqlite)
+    workers = int(os.getenv("AI_SERVICE_WORKERS", "1"))
+    if workers > 1 and os.getenv("GAME_STATE_STORE", "memory") == "memory":
+        logger.warning("AI_SERVICE_WORKERS > 1 with the memory game state store - games will not be shared")
+    
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, workers=workers)
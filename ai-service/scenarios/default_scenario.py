@@ -33,13 +33,13 @@ between 9:30 PM and 11:00 PM. The estate has a modern security system with acces
             "robert": [
                 "10:15", "22:15", "ten fifteen",  # Time discrepancy
                 "fingerprint", "fingerabdruck", "fingerabdrücke",  # Fingerprints on weapon
-                "forgery", "forgeries", "fälschung", "fälschungen",  # Art forgeries
-                "expert report", "gutachten", "expertise",  # Expert report
+                "forgery", "forgeries", "fälschung*",  # Art forgeries
+                "expert report", "gutachten*", "expertise",  # Expert report
                 "9:00", "21:00", "nine o'clock",  # His false alibi time
                 "replaced", "ersetzt", "ausgetauscht",  # Replaced artworks
             ],
             "sophie": [
-                "guesthouse", "gästehaus",  # Secret meeting place
+                "guesthouse", "gästehaus*",  # Secret meeting place
                 "10:45", "22:45",  # Time of secret meeting
                 "affair", "affäre", "relationship", "beziehung",  # Secret affair
                 "thomas", "together",  # With Thomas
@@ -47,7 +47,7 @@ between 9:30 PM and 11:00 PM. The estate has a modern security system with acces
             "thomas": [
                 "gambling", "spielschulden", "debts", "schulden",  # Gambling debts
                 "400,000", "400000", "vierhunderttausend",  # Debt amount
-                "guesthouse", "gästehaus",  # Secret meeting place
+                "guesthouse", "gästehaus*",  # Secret meeting place
                 "10:45", "22:45",  # Time of secret meeting
                 "sophie", "affair", "affäre",  # Secret affair
             ],
@@ -0,0 +1,242 @@
+"""
+Blob Store - Content-addressed files for binary media (audio, images).
+
+Binary media used to travel as base64 inside JSON responses (+33% size,
+several copies through Python, Laravel and the browser). Instead the
+bytes are written once to a local directory, named by their SHA-256, and
+served by the media endpoints; responses only carry the id / URL.
+
+Stores with a TTL delete files whose last write is older than the TTL,
+except for ids the purger is told to keep.
+"""
+
+import os
+import re
+import time
+import asyncio
+import hashlib
+import logging
+import tempfile
+from pathlib import Path
+from typing import Awaitable, Callable, Iterable, Iterator, Optional
+
+from fastapi import HTTPException
+from fastapi.responses import FileResponse, Response, StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+BLOB_ID_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+# Chunk size for streaming files from disk
+STREAM_CHUNK_BYTES = 64 * 1024
+
+# Audio of chat replies is only needed while the game runs
+AUDIO_STORE_DIR = os.getenv("AUDIO_STORE_DIR", "data/audio")
+AUDIO_STORE_TTL_SEC = float(os.getenv("AUDIO_STORE_TTL_SEC", "3600"))
+BLOB_PURGE_INTERVAL_SEC = float(os.getenv("BLOB_PURGE_INTERVAL_SEC", "300"))
+
+# Crime scene images are only needed while their game runs; the default
+# scenario's cached set and pooled scenarios are kept (see main.pinned_image_ids)
+IMAGE_STORE_DIR = os.getenv("IMAGE_STORE_DIR", "data/images")
+IMAGE_STORE_TTL_SEC = float(os.getenv("IMAGE_STORE_TTL_SEC", "86400"))
+
+
+class BlobStore:
+    """Content-addressed file store (id = SHA-256 hex of the content)."""
+
+    def __init__(self, directory: str, suffix: str, ttl_sec: float = 0):
+        self.directory = Path(directory)
+        self.suffix = suffix
+        self.ttl_sec = ttl_sec  # 0 = keep forever
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        # Counters
+        self.writes = 0
+        self.deduplicated = 0
+        self.purged = 0
+
+        logger.info(f"BlobStore initialized: {self.directory} (ttl={ttl_sec:.0f}s)")
+
+    async def put(self, data: bytes) -> str:
+        """Store bytes and return their id."""
+        blob_id = hashlib.sha256(data).hexdigest()
+        written = await asyncio.to_thread(self._write, self._path(blob_id), data)
+        if written:
+            self.writes += 1
+        else:
+            self.deduplicated += 1
+        return blob_id
+
+    def path(self, blob_id: str) -> Optional[Path]:
+        """Path of a stored blob, or None if the id is invalid or unknown."""
+        if not BLOB_ID_PATTERN.match(blob_id):
+            return None
+        path = self._path(blob_id)
+        return path if path.is_file() else None
+
+    async def read(self, blob_id: str) -> Optional[bytes]:
+        """Read a stored blob."""
+        path = self.path(blob_id)
+        if path is None:
+            return None
+        try:
+            return await asyncio.to_thread(path.read_bytes)
+        except FileNotFoundError:
+            return None
+
+    async def touch(self, blob_ids: Iterable[str]) -> None:
+        """Restart the TTL of stored blobs (when they are handed out again)."""
+        paths = [path for blob_id in blob_ids if (path := self.path(blob_id))]
+        await asyncio.to_thread(self._touch, paths)
+
+    def purge_expired(self, keep: Iterable[str] = ()) -> int:
+        """Delete blobs older than the TTL (except `keep`). Returns the number deleted."""
+        if self.ttl_sec <= 0:
+            return 0
+        keep = set(keep)
+        cutoff = time.time() - self.ttl_sec
+        purged = 0
+        for path in self.directory.glob(f"*{self.suffix}"):
+            if path.name[:-len(self.suffix)] in keep:
+                continue
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    purged += 1
+            except FileNotFoundError:
+                continue
+        self.purged += purged
+        return purged
+
+    async def run_purger(
+        self,
+        interval_sec: float = BLOB_PURGE_INTERVAL_SEC,
+        keep: Optional[Callable[[], Awaitable[set[str]]]] = None
+    ) -> None:
+        """Periodically delete expired blobs (run as a background task); `keep` returns ids to spare."""
+        while True:
+            await asyncio.sleep(interval_sec)
+            try:
+                kept = await keep() if keep else set()
+                purged = await asyncio.to_thread(self.purge_expired, kept)
+                if purged:
+                    logger.info(f"Purged {purged} expired blobs from {self.directory}")
+            except Exception as e:
+                logger.error(f"Blob purge failed for {self.directory}: {e}", exc_info=True)
+
+    def stats(self) -> dict:
+        """Counters for /metrics."""
+        return {
+            "writes": self.writes,
+            "deduplicated": self.deduplicated,
+            "purged": self.purged,
+        }
+
+    def _path(self, blob_id: str) -> Path:
+        return self.directory / f"{blob_id}{self.suffix}"
+
+    @staticmethod
+    def _touch(paths: list[Path]) -> None:
+        for path in paths:
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                continue
+
+    @staticmethod
+    def _write(path: Path, data: bytes) -> bool:
+        try:
+            os.utime(path)  # Refresh the TTL
+            return False
+        except FileNotFoundError:
+            pass  # New blob, or purged meanwhile
+        # Unique tmp file per writer: concurrent puts of the same content
+        # each rename their own complete copy into place
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        return True
+
+
+def _iter_file_range(path: Path, start: int, length: int) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = f.read(min(STREAM_CHUNK_BYTES, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def blob_response(
+    path: Path,
+    media_type: str,
+    range_header: Optional[str] = None,
+    cache_control: str = "no-cache"
+) -> Response:
+    """
+    Stream a file from disk, honouring a single `Range: bytes=...` request.
+
+    Browsers' <audio> elements need 206 responses for seeking.
+    """
+    size = path.stat().st_size
+    headers = {"Accept-Ranges": "bytes", "Cache-Control": cache_control}
+
+    if not range_header:
+        return FileResponse(path, media_type=media_type, headers=headers)
+
+    match = re.fullmatch(r"bytes=(\d*)-(\d*)", range_header.strip())
+    if not match or match.groups() == ("", ""):
+        raise HTTPException(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        # Suffix range: the last N bytes
+        start = max(0, size - int(last))
+        end = size - 1
+
+    if start >= size or start > end:
+        raise HTTPException(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+
+    length = end - start + 1
+    headers.update({
+        "Content-Range": f"bytes {start}-{end}/{size}",
+        "Content-Length": str(length),
+    })
+    return StreamingResponse(
+        _iter_file_range(path, start, length),
+        status_code=206,
+        media_type=media_type,
+        headers=headers
+    )
+
+
+# Global singleton instances
+_audio_store: Optional[BlobStore] = None
+_image_store: Optional[BlobStore] = None
+
+
+def get_audio_store() -> BlobStore:
+    """Get the global BlobStore for synthesised audio."""
+    global _audio_store
+    if _audio_store is None:
+        _audio_store = BlobStore(AUDIO_STORE_DIR, suffix=".mp3", ttl_sec=AUDIO_STORE_TTL_SEC)
+    return _audio_store
+
+
+def get_image_store() -> BlobStore:
+    """Get the global BlobStore for generated images."""
+    global _image_store
+    if _image_store is None:
+        _image_store = BlobStore(IMAGE_STORE_DIR, suffix=".png", ttl_sec=IMAGE_STORE_TTL_SEC)
+    return _image_store
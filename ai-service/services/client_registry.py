@@ -0,0 +1,269 @@
+"""
+Client Registry - Process-wide pooled clients for upstream APIs.
+
+Every GameMasterAgent used to build its own ChatOpenAI and VoiceService
+(and every VoiceService its own ElevenLabs client), so connection pools
+and TLS sessions were never reused across games.
+
+The registry hands out shared clients:
+- ChatOpenAI per (provider, model, temperature), all on one pooled
+  keep-alive httpx client per provider
+- one async ElevenLabs client on a pooled httpx client
+- one Gemini client whose requests go over a pooled httpx client
+
+Connection reuse and time spent on TCP connect + TLS handshakes are
+measured through httpcore trace events.
+"""
+
+import os
+import json
+import time
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+from langchain_openai import ChatOpenAI
+
+logger = logging.getLogger(__name__)
+
+# Pool limits (configurable via environment)
+UPSTREAM_MAX_CONNECTIONS = int(os.getenv("UPSTREAM_MAX_CONNECTIONS", "100"))
+UPSTREAM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("UPSTREAM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+UPSTREAM_KEEPALIVE_EXPIRY_SEC = float(os.getenv("UPSTREAM_KEEPALIVE_EXPIRY_SEC", "60"))
+UPSTREAM_TIMEOUT_SEC = float(os.getenv("UPSTREAM_TIMEOUT_SEC", "120"))
+
+# Placeholder from .env.example that means "not configured"
+ELEVENLABS_PLACEHOLDER_KEY = "sk_your_elevenlabs_api_key_here"
+
+
+@dataclass
+class ConnectionStats:
+    """Connection metrics for one upstream provider."""
+    requests: int = 0
+    new_connections: int = 0
+    connect_time_sec: float = 0.0  # TCP connect + TLS handshake
+
+    @property
+    def reused_connections(self) -> int:
+        return max(0, self.requests - self.new_connections)
+
+    def to_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused_connections": self.reused_connections,
+            "reuse_ratio": round(self.reused_connections / self.requests, 3) if self.requests else 0.0,
+            "connect_time_sec": round(self.connect_time_sec, 3),
+        }
+
+
+class ClientRegistry:
+    """
+    Shared upstream clients with pooled, keep-alive connections.
+
+    Clients are created lazily and live for the whole process.
+    """
+
+    def __init__(self):
+        self._stats: dict[str, ConnectionStats] = {}
+        self._http_clients: dict[str, httpx.Client] = {}
+        self._async_http_clients: dict[str, httpx.AsyncClient] = {}
+        self._chat_models: dict[tuple[str, str, float], ChatOpenAI] = {}
+        self._elevenlabs = None
+        self._genai = None
+
+        logger.info(
+            f"ClientRegistry initialized: max_connections={UPSTREAM_MAX_CONNECTIONS}, "
+            f"keepalive={UPSTREAM_MAX_KEEPALIVE_CONNECTIONS} ({UPSTREAM_KEEPALIVE_EXPIRY_SEC:.0f}s)"
+        )
+
+    # === Connection tracing ===
+
+    def _make_trace(self, provider: str, is_async: bool):
+        """Create an httpcore trace callback that records connection setup."""
+        stats = self._stats.setdefault(provider, ConnectionStats())
+        started: dict[str, float] = {}
+
+        def trace(event_name: str, info: dict) -> None:
+            if event_name in ("connection.connect_tcp.started", "connection.start_tls.started"):
+                started[event_name.rsplit(".", 1)[0]] = time.perf_counter()
+            elif event_name in ("connection.connect_tcp.complete", "connection.start_tls.complete"):
+                step = event_name.rsplit(".", 1)[0]
+                if step in started:
+                    stats.connect_time_sec += time.perf_counter() - started.pop(step)
+                if step == "connection.connect_tcp":
+                    stats.new_connections += 1
+
+        # httpcore requires an async callback for async connections
+        async def atrace(event_name: str, info: dict) -> None:
+            trace(event_name, info)
+
+        return atrace if is_async else trace
+
+    def _on_request(self, provider: str, request: httpx.Request, is_async: bool) -> None:
+        self._stats.setdefault(provider, ConnectionStats()).requests += 1
+        request.extensions["trace"] = self._make_trace(provider, is_async)
+
+    # === Raw HTTP clients ===
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=UPSTREAM_MAX_CONNECTIONS,
+            max_keepalive_connections=UPSTREAM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=UPSTREAM_KEEPALIVE_EXPIRY_SEC,
+        )
+
+    def http_client(self, provider: str) -> httpx.Client:
+        """Get the pooled sync httpx client of a provider."""
+        client = self._http_clients.get(provider)
+        if client is None:
+            client = httpx.Client(
+                limits=self._limits(),
+                timeout=UPSTREAM_TIMEOUT_SEC,
+                event_hooks={"request": [lambda request: self._on_request(provider, request, is_async=False)]},
+            )
+            self._http_clients[provider] = client
+        return client
+
+    def async_http_client(self, provider: str) -> httpx.AsyncClient:
+        """Get the pooled async httpx client of a provider."""
+        client = self._async_http_clients.get(provider)
+        if client is None:
+            async def on_request(request: httpx.Request) -> None:
+                self._on_request(provider, request, is_async=True)
+
+            client = httpx.AsyncClient(
+                limits=self._limits(),
+                timeout=UPSTREAM_TIMEOUT_SEC,
+                event_hooks={"request": [on_request]},
+            )
+            self._async_http_clients[provider] = client
+        return client
+
+    # === Provider clients ===
+
+    def chat_model(self, model: str, temperature: float) -> ChatOpenAI:
+        """Get the shared ChatOpenAI for (openai, model, temperature)."""
+        key = ("openai", model, temperature)
+        llm = self._chat_models.get(key)
+        if llm is None:
+            llm = ChatOpenAI(
+                model=model,
+                temperature=temperature,
+                api_key=os.getenv("OPENAI_API_KEY"),
+                stream_usage=True,  # Token usage (incl. cached prompt tokens) on streamed replies
+                http_client=self.http_client("openai"),
+                http_async_client=self.async_http_client("openai"),
+            )
+            self._chat_models[key] = llm
+            logger.info(f"Created shared ChatOpenAI: model={model}, temperature={temperature}")
+        return llm
+
+    def elevenlabs(self):
+        """Get the shared async ElevenLabs client, or None if not configured."""
+        if self._elevenlabs is None:
+            api_key = self._elevenlabs_api_key()
+            if api_key:
+                from elevenlabs import AsyncElevenLabs
+                self._elevenlabs = AsyncElevenLabs(
+                    api_key=api_key,
+                    httpx_client=self.async_http_client("elevenlabs"),
+                )
+        return self._elevenlabs
+
+    def genai(self):
+        """Get the shared Gemini client, or None if not configured."""
+        if self._genai is None:
+            api_key = os.getenv("GOOGLE_GEMINI_API_KEY")
+            if api_key:
+                from google import genai
+                self._genai = genai.Client(api_key=api_key)
+                self._pool_genai_requests(self._genai)
+        return self._genai
+
+    def _pool_genai_requests(self, client) -> None:
+        """
+        Send the Gemini client's requests over the pooled "gemini" httpx client.
+        
+        google-genai 1.0 opens a new requests.Session per call and takes no
+        custom HTTP client or transport (HttpOptions only has base_url,
+        api_version, headers and timeout). Its API-key requests all go
+        through `_request_unauthorized`, so that one method is replaced;
+        the SDK still builds the requests and parses the responses.
+        """
+        api_client = getattr(client, "_api_client", None)
+        sdk_request = getattr(api_client, "_request_unauthorized", None)
+        if sdk_request is None:
+            logger.warning("google-genai has no _request_unauthorized - Gemini requests are not pooled")
+            return
+
+        import requests
+        from google.genai import errors
+        from google.genai._api_client import HttpResponse
+
+        http_client = self.http_client("gemini")
+
+        def pooled_request(http_request, stream: bool = False):
+            if stream:
+                return sdk_request(http_request, stream)
+            data = http_request.data
+            if data and not isinstance(data, bytes):
+                data = json.dumps(data)
+            response = http_client.request(
+                http_request.method.upper(),
+                http_request.url,
+                headers=http_request.headers,
+                content=data or None,
+                timeout=http_request.timeout or httpx.USE_CLIENT_DEFAULT,
+            )
+            if response.status_code != 200:
+                # The SDK's errors are built from a requests.Response
+                error_response = requests.Response()
+                error_response.status_code = response.status_code
+                error_response.reason = response.reason_phrase
+                error_response.headers.update(response.headers)
+                error_response._content = response.content
+                errors.APIError.raise_for_response(error_response)
+            return HttpResponse(dict(response.headers), [response.text])
+
+        api_client._request_unauthorized = pooled_request
+
+    def _elevenlabs_api_key(self) -> Optional[str]:
+        api_key = os.getenv("ELEVENLABS_API_KEY")
+        if not api_key or api_key == ELEVENLABS_PLACEHOLDER_KEY:
+            return None
+        return api_key
+
+    # === Lifecycle / Metrics ===
+
+    def stats(self) -> dict:
+        """Connection metrics per provider (for /metrics)."""
+        return {
+            "chat_models": len(self._chat_models),
+            "providers": {provider: stats.to_dict() for provider, stats in self._stats.items()},
+        }
+
+    async def aclose(self) -> None:
+        """Close all pooled connections (on shutdown)."""
+        for client in self._async_http_clients.values():
+            await client.aclose()
+        for client in self._http_clients.values():
+            client.close()
+        self._async_http_clients.clear()
+        self._http_clients.clear()
+        self._chat_models.clear()
+        self._elevenlabs = None
+        self._genai = None
+
+
+# Global singleton instance
+_client_registry: Optional[ClientRegistry] = None
+
+
+def get_client_registry() -> ClientRegistry:
+    """Get the global ClientRegistry instance."""
+    global _client_registry
+    if _client_registry is None:
+        _client_registry = ClientRegistry()
+    return _client_registry
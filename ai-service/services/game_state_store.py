@@ -0,0 +1,492 @@
+"""
+Game State Store - Out-of-process storage for GameState.
+
+Lets any uvicorn worker load, update and compare-and-swap the state of a
+game by game_id, so games are no longer pinned to one process.
+
+Backends:
+- memory: in-process dict (default, single worker only)
+- sqlite: local SQLite file in WAL mode, shared by all workers on a host
+
+Every stored state carries a `state_version` that is incremented on each
+write. `compare_and_swap()` only writes if the caller's version is still
+current, which keeps concurrent workers from overwriting each other.
+
+The chat transcript is kept as a separate append-only log per game, so
+the state stays small and a turn only writes the messages it added.
+"""
+
+import os
+import copy
+import json
+import time
+import sqlite3
+import logging
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from agents.state import GameState, Message
+
+logger = logging.getLogger(__name__)
+
+# Backend selection (configurable via environment)
+GAME_STATE_STORE = os.getenv("GAME_STATE_STORE", "memory")
+GAME_STATE_SQLITE_PATH = os.getenv("GAME_STATE_SQLITE_PATH", "data/game_states.db")
+
+# Max attempts for optimistic update loops
+UPDATE_MAX_ATTEMPTS = 5
+
+
+class GameStateConflictError(Exception):
+    """Raised when a compare-and-swap lost against a concurrent writer."""
+    pass
+
+
+class TranscriptOutOfSyncError(Exception):
+    """Raised when a client's turn sequence number does not match the server transcript."""
+
+    def __init__(self, game_id: str, client_seq: int, server_seq: int):
+        super().__init__(
+            f"Transcript of game {game_id} is at seq {server_seq}, client sent {client_seq}"
+        )
+        self.client_seq = client_seq
+        self.server_seq = server_seq
+
+
+@dataclass
+class StoredScenario:
+    """The scenario a game was created with, and when the game expires."""
+    scenario: dict
+    expires_at: Optional[float] = None  # Absolute unix timestamp (Laravel games.expires_at)
+
+
+class GameStateStore(ABC):
+    """
+    Storage interface for game states and the scenarios they belong to.
+
+    The scenario is stored alongside the state so a worker that has never
+    seen a game can rebuild its GameMasterAgent on demand.
+    """
+
+    # True if states and transcripts live in this process's memory
+    in_process = False
+
+    @abstractmethod
+    def load(self, game_id: str) -> Optional["GameState"]:
+        """Load the current state (including `state_version`), or None."""
+
+    @abstractmethod
+    def save(self, game_id: str, state: "GameState") -> int:
+        """Unconditionally write a state. Returns the new version."""
+
+    @abstractmethod
+    def compare_and_swap(self, game_id: str, state: "GameState", expected_version: int) -> bool:
+        """
+        Write a state only if the stored version equals `expected_version`.
+
+        Use expected_version=0 to create a state that must not exist yet.
+        On success `state["state_version"]` is set to the new version.
+        """
+
+    @abstractmethod
+    def delete(self, game_id: str) -> None:
+        """Remove the state and scenario of a game."""
+
+    @abstractmethod
+    def save_scenario(self, game_id: str, scenario: dict, expires_at: Optional[float] = None) -> None:
+        """Store the scenario a game was created with (and its absolute expiry)."""
+
+    @abstractmethod
+    def load_scenario(self, game_id: str) -> Optional[StoredScenario]:
+        """Load the scenario of a game, or None."""
+
+    @abstractmethod
+    def purge_older_than(self, max_age_sec: float) -> int:
+        """Delete games that were not written for `max_age_sec`. Returns count."""
+
+    @abstractmethod
+    def append_messages(self, game_id: str, messages: list["Message"]) -> int:
+        """Append messages to the transcript. Returns the new transcript length (seq)."""
+
+    @abstractmethod
+    def replace_messages(self, game_id: str, messages: list["Message"]) -> int:
+        """Replace the whole transcript (resync). Returns the new transcript length."""
+
+    @abstractmethod
+    def tail_messages(self, game_id: str, limit: int) -> list["Message"]:
+        """Get the last `limit` messages of the transcript, oldest first."""
+
+    @abstractmethod
+    def message_count(self, game_id: str) -> int:
+        """Current transcript length (the turn sequence number)."""
+
+    @abstractmethod
+    def transcript_chars(self, game_id: str) -> int:
+        """Size of the transcript in characters (for memory accounting)."""
+
+    def update(
+        self,
+        game_id: str,
+        mutate: Callable[["GameState"], None],
+        max_attempts: int = UPDATE_MAX_ATTEMPTS
+    ) -> "GameState":
+        """
+        Apply `mutate` to the latest state with an optimistic retry loop.
+
+        `mutate` may be called several times and must only depend on the
+        state it is given.
+        """
+        for _ in range(max_attempts):
+            state = self.load(game_id)
+            if state is None:
+                raise KeyError(f"No state stored for game {game_id}")
+
+            expected_version = state.get("state_version", 0)
+            mutate(state)
+            if self.compare_and_swap(game_id, state, expected_version):
+                return state
+
+        raise GameStateConflictError(
+            f"Could not update game {game_id} after {max_attempts} attempts"
+        )
+
+
+class InMemoryGameStateStore(GameStateStore):
+    """
+    In-process backend. States are copied on the way in and out.
+
+    Store calls run in worker threads (asyncio.to_thread), so every method
+    holds a lock - compare_and_swap in particular must check and write in
+    one step.
+    """
+
+    in_process = True
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._states: dict[str, "GameState"] = {}
+        self._scenarios: dict[str, StoredScenario] = {}
+        self._messages: dict[str, list["Message"]] = {}
+        self._updated_at: dict[str, float] = {}
+
+    def load(self, game_id: str) -> Optional["GameState"]:
+        with self._lock:
+            state = self._states.get(game_id)
+            return copy.deepcopy(state) if state is not None else None
+
+    def save(self, game_id: str, state: "GameState") -> int:
+        with self._lock:
+            current = self._states.get(game_id)
+            version = (current.get("state_version", 0) if current else 0) + 1
+            state["state_version"] = version
+            self._states[game_id] = copy.deepcopy(state)
+            self._updated_at[game_id] = time.time()
+        return version
+
+    def compare_and_swap(self, game_id: str, state: "GameState", expected_version: int) -> bool:
+        with self._lock:
+            current = self._states.get(game_id)
+            current_version = current.get("state_version", 0) if current else 0
+            if current_version != expected_version:
+                return False
+
+            state["state_version"] = expected_version + 1
+            self._states[game_id] = copy.deepcopy(state)
+            self._updated_at[game_id] = time.time()
+        return True
+
+    def delete(self, game_id: str) -> None:
+        with self._lock:
+            self._delete(game_id)
+
+    def _delete(self, game_id: str) -> None:
+        self._states.pop(game_id, None)
+        self._scenarios.pop(game_id, None)
+        self._messages.pop(game_id, None)
+        self._updated_at.pop(game_id, None)
+
+    def save_scenario(self, game_id: str, scenario: dict, expires_at: Optional[float] = None) -> None:
+        with self._lock:
+            self._scenarios[game_id] = StoredScenario(scenario, expires_at)
+            self._updated_at[game_id] = time.time()
+
+    def load_scenario(self, game_id: str) -> Optional[StoredScenario]:
+        with self._lock:
+            return self._scenarios.get(game_id)
+
+    def purge_older_than(self, max_age_sec: float) -> int:
+        cutoff = time.time() - max_age_sec
+        with self._lock:
+            stale = [game_id for game_id, ts in self._updated_at.items() if ts < cutoff]
+            for game_id in stale:
+                self._delete(game_id)
+        return len(stale)
+
+    def append_messages(self, game_id: str, messages: list["Message"]) -> int:
+        messages = copy.deepcopy(messages)
+        with self._lock:
+            transcript = self._messages.setdefault(game_id, [])
+            transcript.extend(messages)
+            self._updated_at[game_id] = time.time()
+            return len(transcript)
+
+    def replace_messages(self, game_id: str, messages: list["Message"]) -> int:
+        messages = copy.deepcopy(messages)
+        with self._lock:
+            self._messages[game_id] = messages
+            self._updated_at[game_id] = time.time()
+        return len(messages)
+
+    def tail_messages(self, game_id: str, limit: int) -> list["Message"]:
+        with self._lock:
+            transcript = self._messages.get(game_id, [])
+            return copy.deepcopy(transcript[-limit:]) if limit > 0 else []
+
+    def message_count(self, game_id: str) -> int:
+        with self._lock:
+            return len(self._messages.get(game_id, []))
+
+    def transcript_chars(self, game_id: str) -> int:
+        with self._lock:
+            return sum(len(message.get("content", "")) for message in self._messages.get(game_id, []))
+
+
+class SQLiteGameStateStore(GameStateStore):
+    """
+    SQLite backend in WAL mode.
+
+    WAL lets readers in other workers proceed while one worker writes.
+    States are stored as JSON; the version column makes CAS a single
+    conditional UPDATE.
+    """
+
+    def __init__(self, path: str = GAME_STATE_SQLITE_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS game_states (
+                game_id TEXT PRIMARY KEY,
+                version INTEGER NOT NULL,
+                state TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS game_scenarios (
+                game_id TEXT PRIMARY KEY,
+                scenario TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                expires_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS game_messages (
+                game_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                message TEXT NOT NULL,
+                PRIMARY KEY (game_id, seq)
+            );
+        """)
+        # Databases created before expires_at was stored
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(game_scenarios)")}
+        if "expires_at" not in columns:
+            self._conn.execute("ALTER TABLE game_scenarios ADD COLUMN expires_at REAL")
+        logger.info(f"SQLiteGameStateStore initialized at {path} (WAL)")
+
+    def load(self, game_id: str) -> Optional["GameState"]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version, state FROM game_states WHERE game_id = ?",
+                (game_id,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        version, payload = row
+        state = json.loads(payload)
+        state["state_version"] = version
+        return state
+
+    def save(self, game_id: str, state: "GameState") -> int:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT version FROM game_states WHERE game_id = ?",
+                    (game_id,)
+                ).fetchone()
+                version = (row[0] if row else 0) + 1
+                state["state_version"] = version
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO game_states (game_id, version, state, updated_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (game_id, version, json.dumps(state), time.time())
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return version
+
+    def compare_and_swap(self, game_id: str, state: "GameState", expected_version: int) -> bool:
+        new_version = expected_version + 1
+        state["state_version"] = new_version
+        payload = json.dumps(state)
+
+        with self._lock:
+            if expected_version == 0:
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO game_states (game_id, version, state, updated_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (game_id, new_version, payload, time.time())
+                )
+            else:
+                cursor = self._conn.execute(
+                    "UPDATE game_states SET version = ?, state = ?, updated_at = ? "
+                    "WHERE game_id = ? AND version = ?",
+                    (new_version, payload, time.time(), game_id, expected_version)
+                )
+
+        if cursor.rowcount != 1:
+            state["state_version"] = expected_version
+            return False
+        return True
+
+    def delete(self, game_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM game_states WHERE game_id = ?", (game_id,))
+            self._conn.execute("DELETE FROM game_scenarios WHERE game_id = ?", (game_id,))
+            self._conn.execute("DELETE FROM game_messages WHERE game_id = ?", (game_id,))
+
+    def save_scenario(self, game_id: str, scenario: dict, expires_at: Optional[float] = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO game_scenarios (game_id, scenario, updated_at, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                (game_id, json.dumps(scenario), time.time(), expires_at)
+            )
+
+    def load_scenario(self, game_id: str) -> Optional[StoredScenario]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT scenario, expires_at FROM game_scenarios WHERE game_id = ?",
+                (game_id,)
+            ).fetchone()
+        return StoredScenario(json.loads(row[0]), row[1]) if row else None
+
+    def purge_older_than(self, max_age_sec: float) -> int:
+        cutoff = time.time() - max_age_sec
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # States whose game was not touched since the cutoff
+                self._conn.execute(
+                    "DELETE FROM game_states WHERE updated_at < ? AND game_id NOT IN "
+                    "(SELECT game_id FROM game_scenarios WHERE updated_at >= ?)",
+                    (cutoff, cutoff)
+                )
+                # Scenarios that no longer have a (fresh) state
+                cursor = self._conn.execute(
+                    "DELETE FROM game_scenarios WHERE updated_at < ? AND game_id NOT IN "
+                    "(SELECT game_id FROM game_states)",
+                    (cutoff,)
+                )
+                purged = cursor.rowcount
+                # Transcripts of purged games
+                self._conn.execute(
+                    "DELETE FROM game_messages WHERE game_id NOT IN (SELECT game_id FROM game_scenarios) "
+                    "AND game_id NOT IN (SELECT game_id FROM game_states)"
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return purged
+
+    def append_messages(self, game_id: str, messages: list["Message"]) -> int:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                seq = self._max_seq(game_id)
+                self._conn.executemany(
+                    "INSERT INTO game_messages (game_id, seq, message) VALUES (?, ?, ?)",
+                    [(game_id, seq + i + 1, json.dumps(msg)) for i, msg in enumerate(messages)]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return seq + len(messages)
+
+    def replace_messages(self, game_id: str, messages: list["Message"]) -> int:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM game_messages WHERE game_id = ?", (game_id,))
+                self._conn.executemany(
+                    "INSERT INTO game_messages (game_id, seq, message) VALUES (?, ?, ?)",
+                    [(game_id, i + 1, json.dumps(msg)) for i, msg in enumerate(messages)]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(messages)
+
+    def tail_messages(self, game_id: str, limit: int) -> list["Message"]:
+        if limit <= 0:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT message FROM game_messages WHERE game_id = ? ORDER BY seq DESC LIMIT ?",
+                (game_id, limit)
+            ).fetchall()
+        return [json.loads(row[0]) for row in reversed(rows)]
+
+    def message_count(self, game_id: str) -> int:
+        with self._lock:
+            return self._max_seq(game_id)
+
+    def transcript_chars(self, game_id: str) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COALESCE(SUM(LENGTH(message)), 0) FROM game_messages WHERE game_id = ?",
+                (game_id,)
+            ).fetchone()
+        return row[0]
+
+    def _max_seq(self, game_id: str) -> int:
+        row = self._conn.execute(
+            "SELECT COALESCE(MAX(seq), 0) FROM game_messages WHERE game_id = ?",
+            (game_id,)
+        ).fetchone()
+        return row[0]
+
+
+def create_game_state_store(backend: str = GAME_STATE_STORE) -> GameStateStore:
+    """Create a store for the configured backend."""
+    if backend == "sqlite":
+        return SQLiteGameStateStore()
+    if backend != "memory":
+        logger.warning(f"Unknown GAME_STATE_STORE '{backend}', using memory")
+    return InMemoryGameStateStore()
+
+
+# Global singleton instance
+_game_state_store: Optional[GameStateStore] = None
+
+
+def get_game_state_store() -> GameStateStore:
+    """Get the global GameStateStore instance."""
+    global _game_state_store
+    if _game_state_store is None:
+        _game_state_store = create_game_state_store()
+    return _game_state_store
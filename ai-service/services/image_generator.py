@@ -8,20 +8,34 @@ Each scenario gets 3 images:
 1. Crime scene overview
 2. Primary evidence (murder weapon or main clue)
 3. Secondary evidence
+
+Generated images are written to the image blob store; callers get their ids.
+The image set of the quick-start default scenario is remembered by a
+hash of its prompts (persisted next to the images), so it is only ever
+generated once. Generated scenarios are unique per game and are not
+cached; a cache entry for them would never be hit again.
 """
 
 import os
+import json
 import asyncio
+import hashlib
 import logging
-import base64
 import time
 from typing import Optional
 
 from google import genai
 from google.genai import types
 
+from .blob_store import get_image_store
+from .client_registry import get_client_registry
+
 logger = logging.getLogger(__name__)
 
+IMAGEN_MODEL_ID = "imagen-4.0-generate-001"
+
+IMAGE_SET_CACHE_ENABLED = os.getenv("IMAGE_SET_CACHE_ENABLED", "true").lower() == "true"
+
 
 # === Prompt Templates ===
 # NOTE: Prompts explicitly mention "mystery game" and "fictional" to help with safety filters
@@ -50,22 +64,33 @@ class ImageGenerator:
         self.api_key = os.getenv("GOOGLE_GEMINI_API_KEY")
         self.enabled = bool(self.api_key)
         self.client: Optional[genai.Client] = None
+        self.image_store = get_image_store()
+        self.sets_dir = self.image_store.directory / "sets"
+        # Generations in progress per image set key (shared by concurrent callers)
+        self._inflight: dict[str, asyncio.Task] = {}
+        # Images of cached sets handed out by this process (spared by the image purger)
+        self.cached_image_ids: set[str] = set()
+        
+        if IMAGE_SET_CACHE_ENABLED:
+            self.sets_dir.mkdir(parents=True, exist_ok=True)
         
         if self.enabled:
-            self.client = genai.Client(api_key=self.api_key)
+            # Shared client from the registry
+            self.client = get_client_registry().genai()
             logger.info("✅ ImageGenerator initialized with Gemini API")
         else:
             logger.warning("⚠️ ImageGenerator disabled - GOOGLE_GEMINI_API_KEY not set")
     
-    async def generate_crime_scene_images(self, scenario: dict) -> list[str]:
+    async def generate_crime_scene_images(self, scenario: dict, cache_set: bool = False) -> list[str]:
         """
         Generate 3 crime scene images for a scenario.
         
         Args:
             scenario: The full scenario dict with setting, victim, solution, etc.
+            cache_set: Reuse/remember the image set (for scenarios that repeat, like the default one)
             
         Returns:
-            List of 3 base64-encoded images, or empty list if generation fails.
+            List of 3 image ids (see get_image_store()), or empty list if generation fails.
         """
         if not self.enabled or not self.client:
             logger.warning("Image generation skipped - API not configured")
@@ -84,8 +109,11 @@ class ImageGenerator:
             for i, prompt in enumerate(prompts, 1):
                 logger.info(f"  {i}. {prompt[:80]}...")
             
-            # Generate images in parallel
-            images = await self._generate_images_parallel(prompts)
+            if cache_set and IMAGE_SET_CACHE_ENABLED:
+                images = await self._get_or_generate_set(prompts)
+            else:
+                # Generate images in parallel
+                images = await self._generate_images_parallel(prompts)
             
             duration = time.time() - start_time
             logger.info(f"✅ Image generation complete in {duration:.2f}s")
@@ -99,6 +127,54 @@ class ImageGenerator:
             logger.error(f"❌ Image generation failed after {duration:.2f}s: {e}")
             return []
     
+    async def _get_or_generate_set(self, prompts: list[str]) -> list[str]:
+        """Return the cached image set for these prompts, generating it once."""
+        key = self._image_set_key(prompts)
+        
+        images = await asyncio.to_thread(self._load_image_set, key)
+        if images:
+            logger.info(f"📦 Image set {key[:12]} loaded from cache")
+            self.cached_image_ids.update(images)
+            return images
+        
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._generate_and_save_set(key, prompts))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            logger.info(f"Image set {key[:12]} is already being generated - waiting")
+        return await asyncio.shield(task)
+    
+    async def _generate_and_save_set(self, key: str, prompts: list[str]) -> list[str]:
+        images = await self._generate_images_parallel(prompts)
+        # Only complete sets are cached - a partial one is retried next time
+        if len(images) == len(prompts):
+            await asyncio.to_thread(self._save_image_set, key, images)
+            self.cached_image_ids.update(images)
+        return images
+    
+    @staticmethod
+    def _image_set_key(prompts: list[str]) -> str:
+        payload = json.dumps({"model": IMAGEN_MODEL_ID, "prompts": prompts}, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def _load_image_set(self, key: str) -> Optional[list[str]]:
+        try:
+            images = json.loads((self.sets_dir / f"{key}.json").read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+        # The images themselves may have been deleted
+        if all(self.image_store.path(image_id) for image_id in images):
+            return images
+        return None
+    
+    def _save_image_set(self, key: str, images: list[str]) -> None:
+        path = self.sets_dir / f"{key}.json"
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(images))
+        os.replace(tmp_path, path)
+    
     def _build_prompts(self, scenario: dict) -> list[str]:
         """
         Build 3 image prompts from scenario data.
@@ -287,7 +363,7 @@ class ImageGenerator:
         return images
     
     async def _generate_single_image(self, prompt: str, index: int) -> Optional[str]:
-        """Generate a single image and return as base64."""
+        """Generate a single image, store it and return its id."""
         if not self.client:
             return None
             
@@ -298,7 +374,7 @@ class ImageGenerator:
             # Use Imagen 4 model for image generation
             response = await asyncio.to_thread(
                 self.client.models.generate_images,
-                model="imagen-4.0-generate-001",
+                model=IMAGEN_MODEL_ID,
                 prompt=prompt,
                 config=types.GenerateImagesConfig(
                     number_of_images=1,
@@ -311,10 +387,9 @@ class ImageGenerator:
             
             if response.generated_images:
                 image = response.generated_images[0]
-                # Image data is already base64 encoded
-                image_base64 = base64.b64encode(image.image.image_bytes).decode('utf-8')
-                logger.info(f"  ✓ Image {index + 1} generated in {duration:.2f}s")
-                return f"data:image/png;base64,{image_base64}"
+                image_id = await self.image_store.put(image.image.image_bytes)
+                logger.info(f"  ✓ Image {index + 1} generated in {duration:.2f}s ({image_id[:12]})")
+                return image_id
             else:
                 logger.warning(f"  ⚠️ Image {index + 1}: No image returned")
                 return None
@@ -1,60 +1,160 @@
 """
 Fire-and-forget logger that sends logs to Laravel's game log channel.
 Uses asyncio to send logs without blocking the main thread.
+
+Log calls only append to a bounded in-memory buffer (the oldest entries
+are dropped when it is full). A background flusher ships the buffer in
+batches to /api/internal/log/batch over the pooled "laravel" client -
+as soon as LARAVEL_LOG_BATCH_SIZE entries are waiting, otherwise every
+LARAVEL_LOG_FLUSH_INTERVAL_SEC. The rest is flushed on shutdown.
 """
 
 import asyncio
 import logging
 import os
-from typing import Any
+from collections import deque
+from typing import Any, Optional
 
-import httpx
+from .client_registry import get_client_registry
 
 logger = logging.getLogger(__name__)
 
-# Laravel endpoint for receiving logs
-LARAVEL_LOG_URL = os.getenv("LARAVEL_URL", "http://nginx:80") + "/api/internal/log"
-
-# Timeout for fire-and-forget requests (very short)
-LOG_TIMEOUT = 0.5
-
-
-async def _send_log_async(level: str, message: str, context: dict[str, Any] | None = None) -> None:
-    """Send a single log entry to Laravel (async, fire-and-forget)."""
-    try:
-        async with httpx.AsyncClient(timeout=LOG_TIMEOUT) as client:
-            await client.post(
-                LARAVEL_LOG_URL,
-                json={
-                    "level": level,
-                    "message": message,
-                    "context": context or {},
-                }
-            )
-    except Exception:
-        # Fire-and-forget: silently ignore errors
-        pass
+# Laravel endpoint for receiving log batches
+LARAVEL_LOG_BATCH_URL = os.getenv("LARAVEL_URL", "http://nginx:80") + "/api/internal/log/batch"
+
+# Timeout for fire-and-forget requests (short, a batch is small)
+LOG_TIMEOUT = 2.0
+
+# Limits of the Laravel batch endpoint (longer messages are truncated)
+LOG_MESSAGE_MAX_CHARS = 1000
+LOG_BATCH_MAX_ENTRIES = 500
+
+LARAVEL_LOG_BUFFER_MAX = int(os.getenv("LARAVEL_LOG_BUFFER_MAX", "1000"))
+LARAVEL_LOG_BATCH_SIZE = int(os.getenv("LARAVEL_LOG_BATCH_SIZE", "50"))
+LARAVEL_LOG_FLUSH_INTERVAL_SEC = float(os.getenv("LARAVEL_LOG_FLUSH_INTERVAL_SEC", "2.0"))
+
+
+class LogShipper:
+    """Bounded ring buffer of log entries, shipped to Laravel in batches."""
+
+    def __init__(
+        self,
+        buffer_max: int = LARAVEL_LOG_BUFFER_MAX,
+        batch_size: int = LARAVEL_LOG_BATCH_SIZE,
+        flush_interval_sec: float = LARAVEL_LOG_FLUSH_INTERVAL_SEC
+    ):
+        self.batch_size = min(max(1, batch_size), LOG_BATCH_MAX_ENTRIES)
+        self.flush_interval_sec = flush_interval_sec
+        self._buffer: deque[dict] = deque(maxlen=max(1, buffer_max))
+        self._flusher: Optional[asyncio.Task] = None
+        self._batch_ready: Optional[asyncio.Event] = None
+
+        # Counters
+        self.shipped = 0
+        self.dropped = 0  # Buffer overflow (oldest entries)
+        self.failed = 0  # Lost in failed requests
+        self._unreported_drops = 0
+
+    def add(self, level: str, message: str, context: Optional[dict[str, Any]] = None) -> None:
+        """Buffer a log entry; returns immediately."""
+        if len(self._buffer) == self._buffer.maxlen:
+            self.dropped += 1
+            self._unreported_drops += 1
+        if len(message) > LOG_MESSAGE_MAX_CHARS:
+            message = message[:LOG_MESSAGE_MAX_CHARS - 1] + "…"
+        self._buffer.append({"level": level, "message": message, "context": context or {}})
+        self._ensure_flusher()
+        if self._batch_ready and len(self._buffer) >= self.batch_size:
+            self._batch_ready.set()
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is not None and not self._flusher.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No running loop - shipped once one is running
+            return
+        self._batch_ready = asyncio.Event()
+        self._flusher = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._batch_ready.wait(), timeout=self.flush_interval_sec)
+            except asyncio.TimeoutError:
+                pass
+            self._batch_ready.clear()
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Ship everything buffered right now."""
+        while self._buffer:
+            batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+            dropped, self._unreported_drops = self._unreported_drops, 0
+            try:
+                client = get_client_registry().async_http_client("laravel")
+                response = await client.post(
+                    LARAVEL_LOG_BATCH_URL,
+                    json={"entries": batch, "dropped": dropped},
+                    timeout=LOG_TIMEOUT
+                )
+                response.raise_for_status()
+                self.shipped += len(batch)
+            except asyncio.CancelledError:
+                # Shutdown cancelled the request - put the batch back for close() to ship
+                self._buffer.extendleft(reversed(batch))
+                self._unreported_drops += dropped
+                raise
+            except Exception as e:
+                # Fire-and-forget: count the loss, don't retry
+                self.failed += len(batch)
+                logger.debug(f"Failed to ship {len(batch)} log entries to Laravel: {e}")
+
+    async def close(self) -> None:
+        """Stop the flusher and ship the remaining entries (on shutdown)."""
+        flusher, self._flusher = self._flusher, None
+        if flusher is not None:
+            flusher.cancel()
+            # Wait until a cancelled in-flight batch is back in the buffer, then ship everything
+            await asyncio.gather(flusher, return_exceptions=True)
+        await self.flush()
+
+    def stats(self) -> dict:
+        """Counters for /metrics."""
+        return {
+            "buffered": len(self._buffer),
+            "shipped": self.shipped,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+
+# Global singleton instance
+_log_shipper: Optional[LogShipper] = None
+
+
+def get_log_shipper() -> LogShipper:
+    """Get the global LogShipper instance."""
+    global _log_shipper
+    if _log_shipper is None:
+        _log_shipper = LogShipper()
+    return _log_shipper
 
 
 def log_to_laravel(level: str, message: str, context: dict[str, Any] | None = None) -> None:
     """
     Send a log entry to Laravel without waiting for response.
-    
-    This function returns immediately and sends the log in the background.
-    If the request fails, it fails silently.
-    
+
+    This function returns immediately; the entry is shipped with the
+    next batch. If the request fails, it fails silently.
+
     Args:
         level: Log level (debug, info, warning, error)
         message: Log message
         context: Optional context dict
     """
-    try:
-        loop = asyncio.get_running_loop()
-        # Schedule the coroutine without waiting
-        loop.create_task(_send_log_async(level, message, context))
-    except RuntimeError:
-        # No running loop - skip logging to Laravel
-        pass
+    get_log_shipper().add(level, message, context)
 
 
 # Convenience functions
@@ -0,0 +1,79 @@
+"""
+Latency Metrics - Lightweight in-process latency tracking.
+
+Keeps a bounded window of recent samples per metric name and reports
+count / avg / p50 / p95 / max for the /metrics endpoint. Good enough
+for spotting regressions without pulling in a metrics backend.
+"""
+
+import os
+import logging
+from collections import deque
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Number of recent samples kept per metric
+LATENCY_WINDOW = int(os.getenv("LATENCY_METRICS_WINDOW", "1000"))
+
+
+class LatencyStats:
+    """Rolling latency statistics for one metric."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._samples: deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total_sec = 0.0
+        self.max_sec = 0.0
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self.count += 1
+        self.total_sec += seconds
+        self.max_sec = max(self.max_sec, seconds)
+
+    def to_dict(self) -> dict:
+        samples = sorted(self._samples)
+
+        def percentile(p: float) -> float:
+            if not samples:
+                return 0.0
+            return samples[min(len(samples) - 1, int(p * len(samples)))]
+
+        return {
+            "count": self.count,
+            "avg_sec": round(self.total_sec / self.count, 3) if self.count else 0.0,
+            "p50_sec": round(percentile(0.50), 3),
+            "p95_sec": round(percentile(0.95), 3),
+            "max_sec": round(self.max_sec, 3),
+        }
+
+
+class LatencyMetrics:
+    """Named collection of LatencyStats."""
+
+    def __init__(self):
+        self._metrics: dict[str, LatencyStats] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        """Record one latency sample (in seconds) for a metric."""
+        stats = self._metrics.get(name)
+        if stats is None:
+            stats = self._metrics[name] = LatencyStats()
+        stats.record(seconds)
+
+    def stats(self) -> dict:
+        """Statistics of all metrics (for /metrics)."""
+        return {name: stats.to_dict() for name, stats in sorted(self._metrics.items())}
+
+
+# Global singleton instance
+_latency_metrics: Optional[LatencyMetrics] = None
+
+
+def get_latency_metrics() -> LatencyMetrics:
+    """Get the global LatencyMetrics instance."""
+    global _latency_metrics
+    if _latency_metrics is None:
+        _latency_metrics = LatencyMetrics()
+    return _latency_metrics
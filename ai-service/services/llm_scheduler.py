@@ -0,0 +1,237 @@
+"""
+LLM Scheduler - Central admission control for all OpenAI calls.
+
+Chat replies, hints, auto-note extraction and scenario generation share
+one OpenAI account. Without coordination a burst of scenario
+generations (dozens of calls each) makes interactive chat wait and
+pushes the account into provider rate limits. Every LLM call therefore
+acquires a slot here first:
+
+- at most LLM_MAX_CONCURRENCY calls run at the same time
+- calls started in the last 60s stay within LLM_RPM_LIMIT requests and
+  LLM_TPM_LIMIT (estimated) tokens (0 = no limit)
+- waiting calls are queued per priority class and admitted by stride
+  scheduling: every class gets a share proportional to its weight, so
+  chat is served first but background work is never starved
+
+The class of a call is given at the call site; code that runs on behalf
+of something less urgent (e.g. the scenario pool) can lower it for
+everything it calls via `llm_priority_scope()`.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import AsyncIterator, Iterator, Optional
+
+from .latency_metrics import get_latency_metrics
+
+logger = logging.getLogger(__name__)
+
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+LLM_RPM_LIMIT = int(os.getenv("LLM_RPM_LIMIT", "0"))
+LLM_TPM_LIMIT = int(os.getenv("LLM_TPM_LIMIT", "0"))
+
+# Output tokens assumed per call when estimating its token cost
+LLM_OUTPUT_TOKEN_ESTIMATE = int(os.getenv("LLM_OUTPUT_TOKEN_ESTIMATE", "500"))
+
+RATE_WINDOW_SEC = 60.0
+
+
+class LLMPriority(IntEnum):
+    """Priority classes, most urgent first."""
+    CHAT = 0
+    HINT = 1
+    NOTES = 2
+    GENERATION = 3
+    POOL = 4
+
+
+# Share of admissions per class while several classes are waiting
+PRIORITY_WEIGHTS = {
+    LLMPriority.CHAT: 16,
+    LLMPriority.HINT: 8,
+    LLMPriority.NOTES: 4,
+    LLMPriority.GENERATION: 2,
+    LLMPriority.POOL: 1,
+}
+
+# Class override for everything called in the current context
+_priority_override: ContextVar[Optional[LLMPriority]] = ContextVar("llm_priority_override", default=None)
+
+
+@contextmanager
+def llm_priority_scope(priority: LLMPriority) -> Iterator[None]:
+    """Run all LLM calls in this context (and tasks created in it) with `priority`."""
+    token = _priority_override.set(priority)
+    try:
+        yield
+    finally:
+        _priority_override.reset(token)
+
+
+def estimate_tokens(messages: list) -> int:
+    """Rough token estimate of a call (~4 characters per token plus the expected output)."""
+    chars = sum(len(str(getattr(message, "content", message))) for message in messages)
+    return chars // 4 + LLM_OUTPUT_TOKEN_ESTIMATE
+
+
+class _Waiter:
+    __slots__ = ("future", "tokens", "enqueued_at")
+
+    def __init__(self, future: asyncio.Future, tokens: int):
+        self.future = future
+        self.tokens = tokens
+        self.enqueued_at = time.monotonic()
+
+
+class LLMScheduler:
+    """Concurrency and rate budget shared by all LLM calls, with weighted fair queuing."""
+
+    def __init__(
+        self,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        rpm_limit: int = LLM_RPM_LIMIT,
+        tpm_limit: int = LLM_TPM_LIMIT
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.rpm_limit = rpm_limit
+        self.tpm_limit = tpm_limit
+
+        self._queues: dict[LLMPriority, deque[_Waiter]] = {p: deque() for p in LLMPriority}
+        # Stride scheduling: the waiting class with the lowest pass goes next
+        self._pass: dict[LLMPriority, float] = {p: 0.0 for p in LLMPriority}
+        self._virtual_time = 0.0
+        self._in_flight = 0
+        self._window: deque[tuple[float, int]] = deque()  # (start time, estimated tokens)
+        self._window_tokens = 0
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+
+        # Counters
+        self.granted = {p: 0 for p in LLMPriority}
+        self.rate_limited_waits = 0
+
+        logger.info(
+            f"LLMScheduler initialized: concurrency={self.max_concurrency}, "
+            f"rpm={rpm_limit or 'unlimited'}, tpm={tpm_limit or 'unlimited'}"
+        )
+
+    @asynccontextmanager
+    async def slot(self, priority: LLMPriority, messages: Optional[list] = None) -> AsyncIterator[None]:
+        """Hold an LLM slot for the duration of one call (or stream)."""
+        override = _priority_override.get()
+        if override is not None:
+            priority = override
+        tokens = estimate_tokens(messages) if messages else LLM_OUTPUT_TOKEN_ESTIMATE
+        await self._acquire(priority, tokens)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, priority: LLMPriority, tokens: int) -> None:
+        waiter = _Waiter(asyncio.get_running_loop().create_future(), tokens)
+        queue = self._queues[priority]
+        if not queue:
+            # A class that was idle doesn't get credit for the time it didn't use
+            self._pass[priority] = max(self._pass[priority], self._virtual_time)
+        queue.append(waiter)
+        self._dispatch()
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted just before the cancellation - give the slot back
+                self._release()
+            else:
+                try:
+                    queue.remove(waiter)
+                except ValueError:
+                    pass
+            raise
+
+        get_latency_metrics().record(f"llm_queue_{priority.name.lower()}", time.monotonic() - waiter.enqueued_at)
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Admit waiting calls while concurrency and rate budget allow."""
+        while self._in_flight < self.max_concurrency:
+            waiting = [p for p in LLMPriority if self._queues[p]]
+            if not waiting:
+                return
+            priority = min(waiting, key=lambda p: (self._pass[p], p))
+            waiter = self._queues[priority][0]
+
+            retry_in = self._budget_wait(waiter.tokens)
+            if retry_in > 0:
+                self.rate_limited_waits += 1
+                self._schedule_wakeup(retry_in)
+                return
+
+            self._queues[priority].popleft()
+            if waiter.future.done():
+                continue
+            waiter.future.set_result(None)
+
+            self._virtual_time = self._pass[priority]
+            self._pass[priority] += 1.0 / PRIORITY_WEIGHTS[priority]
+            self._in_flight += 1
+            self._window.append((time.monotonic(), waiter.tokens))
+            self._window_tokens += waiter.tokens
+            self.granted[priority] += 1
+
+    def _budget_wait(self, tokens: int) -> float:
+        """Seconds until a call with `tokens` fits the rate budget (0 = now)."""
+        now = time.monotonic()
+        while self._window and self._window[0][0] <= now - RATE_WINDOW_SEC:
+            self._window_tokens -= self._window.popleft()[1]
+        if not self._window:
+            return 0.0
+
+        over_rpm = self.rpm_limit and len(self._window) >= self.rpm_limit
+        over_tpm = self.tpm_limit and self._window_tokens + tokens > self.tpm_limit
+        if not (over_rpm or over_tpm):
+            return 0.0
+        # Re-check when the oldest call leaves the window
+        return max(0.01, self._window[0][0] + RATE_WINDOW_SEC - now)
+
+    def _schedule_wakeup(self, delay: float) -> None:
+        if self._wakeup is not None and not self._wakeup.cancelled():
+            self._wakeup.cancel()
+        self._wakeup = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+    def stats(self) -> dict:
+        """Counters for /metrics."""
+        self._budget_wait(0)  # Drop expired window entries
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self._in_flight,
+            "queued": {p.name.lower(): len(q) for p, q in self._queues.items()},
+            "granted": {p.name.lower(): n for p, n in self.granted.items()},
+            "requests_last_minute": len(self._window),
+            "tokens_last_minute": self._window_tokens,
+            "rpm_limit": self.rpm_limit,
+            "tpm_limit": self.tpm_limit,
+            "rate_limited_waits": self.rate_limited_waits,
+        }
+
+
+# Global singleton instance
+_llm_scheduler: Optional[LLMScheduler] = None
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """Get the global LLMScheduler instance."""
+    global _llm_scheduler
+    if _llm_scheduler is None:
+        _llm_scheduler = LLMScheduler()
+    return _llm_scheduler
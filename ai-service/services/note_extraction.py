@@ -0,0 +1,189 @@
+"""
+Note Extraction Service - Auto-note extraction off the chat critical path.
+
+Extracting auto-notes is a second LLM round-trip per chat turn. In
+background mode the persona reply is returned right away and extraction
+jobs are queued on a per-game worker instead:
+
+- one bounded FIFO queue + worker task per game, so notes of a persona
+  are always merged in the order of the turns that produced them
+- backpressure: when a game's queue is full, submitting waits up to
+  AUTO_NOTES_ENQUEUE_TIMEOUT_SEC and then drops the job
+- results are merged into the stored game state with an optimistic
+  retry loop and announced via the progress broadcast channel
+  (stage "notes_updated"); clients fetch them from /game/{id}/notes
+  or receive them with their next chat response
+
+Workers are cancelled when their game session is evicted.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Optional, TYPE_CHECKING
+
+from agents.state import append_auto_notes
+from services import progress_service
+from services.game_state_store import GameStateStore, get_game_state_store
+from services.latency_metrics import get_latency_metrics
+
+if TYPE_CHECKING:
+    from agents.persona_agent import PersonaAgent
+
+logger = logging.getLogger(__name__)
+
+# "background" (default) or "inline" (extract before the reply is returned)
+AUTO_NOTES_MODE = os.getenv("AUTO_NOTES_MODE", "background").lower()
+AUTO_NOTES_QUEUE_MAX = int(os.getenv("AUTO_NOTES_QUEUE_MAX", "8"))
+AUTO_NOTES_ENQUEUE_TIMEOUT_SEC = float(os.getenv("AUTO_NOTES_ENQUEUE_TIMEOUT_SEC", "0.5"))
+
+
+def background_notes_enabled() -> bool:
+    """Whether auto-notes are extracted by the background workers."""
+    return AUTO_NOTES_MODE == "background"
+
+
+@dataclass
+class NoteExtractionJob:
+    """One chat turn whose persona reply still needs note extraction."""
+    game_id: str
+    agent: "PersonaAgent"
+    user_question: str
+    response: str
+    context: dict  # Case facts the extraction prompt needs (victim, timeline)
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class NoteExtractionWorker:
+    """Bounded FIFO queue and consumer task for one game."""
+
+    def __init__(self, game_id: str, service: "NoteExtractionService", queue_max: int):
+        self.game_id = game_id
+        self.queue: asyncio.Queue[NoteExtractionJob] = asyncio.Queue(maxsize=queue_max)
+        self._service = service
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            job = await self.queue.get()
+            try:
+                await self._service._process(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._service.failed += 1
+                logger.error(f"Note extraction failed for game {self.game_id}: {e}", exc_info=True)
+            finally:
+                self.queue.task_done()
+
+    def cancel(self) -> None:
+        self._task.cancel()
+
+
+class NoteExtractionService:
+    """Per-game background workers for auto-note extraction."""
+
+    def __init__(
+        self,
+        state_store: Optional[GameStateStore] = None,
+        queue_max: int = AUTO_NOTES_QUEUE_MAX,
+        enqueue_timeout_sec: float = AUTO_NOTES_ENQUEUE_TIMEOUT_SEC
+    ):
+        self.state_store = state_store or get_game_state_store()
+        self.queue_max = queue_max
+        self.enqueue_timeout_sec = enqueue_timeout_sec
+        self._workers: dict[str, NoteExtractionWorker] = {}
+
+        # Counters
+        self.submitted = 0
+        self.processed = 0
+        self.dropped = 0
+        self.failed = 0
+
+        logger.info(
+            f"NoteExtractionService initialized: mode={AUTO_NOTES_MODE}, "
+            f"queue_max={queue_max}, enqueue_timeout={enqueue_timeout_sec}s"
+        )
+
+    async def submit(self, job: NoteExtractionJob) -> bool:
+        """
+        Queue a job on its game's worker.
+
+        Waits up to enqueue_timeout_sec if the queue is full.
+        Returns False if the job had to be dropped.
+        """
+        worker = self._workers.get(job.game_id)
+        if worker is None:
+            worker = self._workers[job.game_id] = NoteExtractionWorker(job.game_id, self, self.queue_max)
+
+        try:
+            await asyncio.wait_for(worker.queue.put(job), timeout=self.enqueue_timeout_sec)
+        except asyncio.TimeoutError:
+            self.dropped += 1
+            logger.warning(f"Note extraction queue of game {job.game_id} is full - dropped job for {job.agent.name}")
+            return False
+
+        self.submitted += 1
+        return True
+
+    async def drain(self, game_id: str) -> None:
+        """Wait until all queued jobs of a game have been processed."""
+        worker = self._workers.get(game_id)
+        if worker is not None:
+            await worker.queue.join()
+
+    def cancel(self, game_id: str) -> None:
+        """Stop a game's worker, discarding pending jobs."""
+        worker = self._workers.pop(game_id, None)
+        if worker is not None:
+            worker.cancel()
+
+    async def _process(self, job: NoteExtractionJob) -> None:
+        notes = await job.agent.extract_auto_notes(job.user_question, job.response, job.context)
+        self.processed += 1
+        get_latency_metrics().record("auto_notes_delay", time.monotonic() - job.enqueued_at)
+
+        if not notes:
+            return
+
+        merged: list = []
+
+        def merge(state) -> None:
+            # May run several times - always start from fresh copies
+            merged[:] = append_auto_notes(state, job.agent.slug, [dict(note) for note in notes])
+
+        state = await asyncio.to_thread(self.state_store.update, job.game_id, merge)
+        logger.info(f"📝 Merged {len(merged)} auto-notes for {job.agent.name} (cursor {state['notes_seq']})")
+
+        await progress_service.notes_updated(job.game_id, job.agent.name, len(merged), state["notes_seq"])
+
+    def stats(self) -> dict:
+        """Counters for /metrics."""
+        return {
+            "mode": AUTO_NOTES_MODE,
+            "workers": len(self._workers),
+            "pending": sum(worker.queue.qsize() for worker in self._workers.values()),
+            "submitted": self.submitted,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+    def close(self) -> None:
+        """Cancel all workers (on shutdown)."""
+        for game_id in list(self._workers.keys()):
+            self.cancel(game_id)
+
+
+# Global singleton instance
+_note_extraction_service: Optional[NoteExtractionService] = None
+
+
+def get_note_extraction_service() -> NoteExtractionService:
+    """Get the global NoteExtractionService instance."""
+    global _note_extraction_service
+    if _note_extraction_service is None:
+        _note_extraction_service = NoteExtractionService()
+    return _note_extraction_service
@@ -3,16 +3,23 @@ Progress Service for broadcasting generation progress to Laravel.
 
 Uses fire-and-forget HTTP calls to Laravel, which then broadcasts
 via WebSocket (Reverb) to the frontend.
+
+Updates are queued and delivered by background senders over the
+pooled "laravel" client, so generation never waits for a Laravel
+round-trip. Per game, updates are delivered in order; while one is in
+flight, newer updates of a coalescable stage (e.g. several
+persona_complete events) replace older pending ones.
 """
 
 import asyncio
 import logging
 import os
+from collections import deque
 from dataclasses import dataclass
 from enum import Enum
 from typing import Optional
 
-import httpx
+from .client_registry import get_client_registry
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +29,11 @@ LARAVEL_PROGRESS_URL = os.getenv("LARAVEL_API_URL", "http://nginx:80") + "/api/i
 # Timeout for fire-and-forget requests
 PROGRESS_TIMEOUT = 1.0
 
+# Pending updates kept per game (oldest dropped beyond that)
+PROGRESS_QUEUE_MAX = int(os.getenv("PROGRESS_QUEUE_MAX", "32"))
+# Games whose updates are sent at the same time
+PROGRESS_MAX_CONCURRENCY = int(os.getenv("PROGRESS_MAX_CONCURRENCY", "4"))
+
 
 class ProgressStage(str, Enum):
     """Progress stages for scenario generation."""
@@ -34,6 +46,11 @@ class ProgressStage(str, Enum):
     INITIALIZING_GAME = "initializing_game"
     COMPLETE = "complete"
     ERROR = "error"
+    NOTES_UPDATED = "notes_updated"  # Background auto-notes merged during a game
+
+
+# Stages where only the latest pending update matters
+COALESCED_STAGES = {ProgressStage.PERSONA_COMPLETE, ProgressStage.NOTES_UPDATED}
 
 
 @dataclass
@@ -46,41 +63,116 @@ class ProgressUpdate:
     persona_name: Optional[str] = None
     persona_index: Optional[int] = None
     total_personas: Optional[int] = None
+    
+    def to_payload(self) -> dict:
+        payload = {
+            "game_id": self.game_id,
+            "stage": self.stage.value,
+            "progress": self.progress,
+            "message": self.message,
+        }
+        
+        if self.persona_name:
+            payload["persona_name"] = self.persona_name
+        if self.persona_index is not None:
+            payload["persona_index"] = self.persona_index
+        if self.total_personas is not None:
+            payload["total_personas"] = self.total_personas
+        return payload
 
 
 async def _send_progress_async(update: ProgressUpdate) -> None:
-    """Send a progress update to Laravel (async, fire-and-forget)."""
+    """Send a progress update to Laravel (fire-and-forget)."""
     try:
-        async with httpx.AsyncClient(timeout=PROGRESS_TIMEOUT) as client:
-            payload = {
-                "game_id": update.game_id,
-                "stage": update.stage.value,
-                "progress": update.progress,
-                "message": update.message,
-            }
-            
-            if update.persona_name:
-                payload["persona_name"] = update.persona_name
-            if update.persona_index is not None:
-                payload["persona_index"] = update.persona_index
-            if update.total_personas is not None:
-                payload["total_personas"] = update.total_personas
-            
-            await client.post(LARAVEL_PROGRESS_URL, json=payload)
-            logger.debug(f"Progress sent: {update.stage.value} - {update.progress}%")
+        client = get_client_registry().async_http_client("laravel")
+        await client.post(LARAVEL_PROGRESS_URL, json=update.to_payload(), timeout=PROGRESS_TIMEOUT)
+        logger.debug(f"Progress sent: {update.stage.value} - {update.progress}%")
     except Exception as e:
         # Fire-and-forget: log but don't fail
         logger.warning(f"Failed to send progress update: {e}")
 
 
+class ProgressDispatcher:
+    """Per-game queues of pending updates, drained by background senders."""
+    
+    def __init__(self, queue_max: int = PROGRESS_QUEUE_MAX, max_concurrency: int = PROGRESS_MAX_CONCURRENCY):
+        self.queue_max = queue_max
+        self._pending: dict[str, deque[ProgressUpdate]] = {}
+        self._senders: dict[str, asyncio.Task] = {}
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        
+        # Counters
+        self.submitted = 0
+        self.sent = 0
+        self.coalesced = 0
+        self.dropped = 0
+    
+    def submit(self, update: ProgressUpdate) -> None:
+        """Queue an update; returns immediately."""
+        self.submitted += 1
+        queue = self._pending.setdefault(update.game_id, deque())
+        
+        if queue and queue[-1].stage == update.stage and update.stage in COALESCED_STAGES:
+            queue[-1] = update
+            self.coalesced += 1
+        else:
+            if len(queue) >= self.queue_max:
+                queue.popleft()
+                self.dropped += 1
+            queue.append(update)
+        
+        if update.game_id not in self._senders:
+            self._senders[update.game_id] = asyncio.create_task(self._drain_game(update.game_id))
+    
+    async def _drain_game(self, game_id: str) -> None:
+        queue = self._pending[game_id]
+        try:
+            while queue:
+                update = queue.popleft()
+                async with self._semaphore:
+                    await _send_progress_async(update)
+                self.sent += 1
+        finally:
+            del self._pending[game_id]
+            del self._senders[game_id]
+    
+    async def flush(self, timeout: float = 5.0) -> None:
+        """Wait until all pending updates are delivered (on shutdown)."""
+        if self._senders:
+            await asyncio.wait(list(self._senders.values()), timeout=timeout)
+    
+    def stats(self) -> dict:
+        """Counters for /metrics."""
+        return {
+            "pending": sum(len(queue) for queue in self._pending.values()),
+            "games_sending": len(self._senders),
+            "submitted": self.submitted,
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+        }
+
+
+# Global singleton instance
+_dispatcher: Optional[ProgressDispatcher] = None
+
+
+def get_progress_dispatcher() -> ProgressDispatcher:
+    """Get the global ProgressDispatcher instance."""
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = ProgressDispatcher()
+    return _dispatcher
+
+
 async def send_progress(update: ProgressUpdate) -> None:
     """
-    Send a progress update to Laravel and wait for completion.
+    Queue a progress update for Laravel.
     
-    Progress updates must complete before continuing to ensure
-    the frontend receives them before the API response.
+    Returns without waiting for the delivery; updates of a game still
+    reach Laravel in the order they were sent.
     """
-    await _send_progress_async(update)
+    get_progress_dispatcher().submit(update)
 
 
 # Alias for backwards compatibility
@@ -186,3 +278,14 @@ async def error(game_id: str, error_message: str) -> None:
         progress=0,
         message=f"Error: {error_message}"
     ))
+
+
+async def notes_updated(game_id: str, persona_name: str, count: int, notes_cursor: int) -> None:
+    """Signal that background auto-notes were merged (fetch via /game/{id}/notes)."""
+    await send_progress(ProgressUpdate(
+        game_id=game_id,
+        stage=ProgressStage.NOTES_UPDATED,
+        progress=100,
+        message=f"{count} new note(s) about {persona_name} (cursor {notes_cursor})",
+        persona_name=persona_name
+    ))
@@ -3,19 +3,33 @@ Prompt Service - Fetches prompt templates from Laravel API.
 
 This service allows Content Managers to update prompts via the database
 without modifying Python code.
+
+Reads never wait for Laravel: they are served from an in-memory snapshot
+that is replaced as a whole when new prompts arrive. A background
+refresher revalidates the snapshot every PROMPT_CACHE_TTL_SEC with a
+conditional request (If-None-Match on the ETag of /api/prompts/all), so
+an unchanged prompt set costs a 304 without body. A read that finds the
+snapshot stale triggers the same revalidation and still returns the
+stale value (stale-while-revalidate). If Laravel is unreachable the
+last snapshot stays in use, and reads don't retry before a backoff of
+min(PROMPT_CACHE_TTL_SEC, 2^failures) seconds has passed.
 """
 
 import os
-import json
+import time
+import asyncio
 import logging
 from typing import Optional
-from functools import lru_cache
 
 import httpx
 import yaml
 
+from .client_registry import get_client_registry
+
 logger = logging.getLogger(__name__)
 
+PROMPT_CACHE_TTL_SEC = float(os.getenv("PROMPT_CACHE_TTL_SEC", "60"))
+PROMPT_FETCH_TIMEOUT_SEC = float(os.getenv("PROMPT_FETCH_TIMEOUT_SEC", "10"))
 
 class PromptService:
     """
@@ -24,38 +38,109 @@ class PromptService:
     Provides caching to avoid repeated API calls during a session.
     """
     
-    def __init__(self, base_url: Optional[str] = None):
+    def __init__(self, base_url: Optional[str] = None, ttl_sec: float = PROMPT_CACHE_TTL_SEC):
         self.base_url = base_url or os.getenv("LARAVEL_API_URL", "http://php:80")
+        self.ttl_sec = ttl_sec
+        # Replaced as a whole, never mutated - readers always see a complete set
         self._cache: dict[str, str] = {}
+        self._etag: Optional[str] = None
+        self._validated_at = 0.0  # monotonic time of the last successful fetch/revalidation
         self._prompts_loaded = False
+        self.version = 0  # Incremented whenever a new prompt set is swapped in
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._consecutive_failures = 0
+        self._failed_at = 0.0  # monotonic time of the last failed fetch
+
+        # Counters
+        self.fetches = 0
+        self.not_modified = 0
+        self.failures = 0
+
         logger.info(f"PromptService initialized with base URL: {self.base_url}")
-    
-    def _fetch_all_prompts(self) -> dict[str, str]:
-        """Fetch all prompts from the API in a single request."""
-        if self._prompts_loaded:
-            return self._cache
-        
+
+    @property
+    def is_stale(self) -> bool:
+        return not self._prompts_loaded or time.monotonic() - self._validated_at >= self.ttl_sec
+
+    @property
+    def is_backing_off(self) -> bool:
+        """True while reads should not retry a failed fetch yet."""
+        if not self._consecutive_failures:
+            return False
+        backoff = min(self.ttl_sec, 2 ** self._consecutive_failures)
+        return time.monotonic() - self._failed_at < backoff
+
+    def _record_failure(self) -> None:
+        self.failures += 1
+        self._consecutive_failures += 1
+        self._failed_at = time.monotonic()
+
+    async def _fetch_all_prompts(self, conditional: bool = True) -> bool:
+        """Fetch all prompts in a single request and swap them in. Returns success."""
+        url = f"{self.base_url}/api/prompts/all"
+        headers = {"If-None-Match": self._etag} if conditional and self._etag else {}
+
         try:
-            url = f"{self.base_url}/api/prompts/all"
-            logger.info(f"Fetching all prompts from: {url}")
-            
-            with httpx.Client(timeout=10.0) as client:
-                response = client.get(url)
-                response.raise_for_status()
-                
-                self._cache = response.json()
-                self._prompts_loaded = True
-                
-                logger.info(f"✅ Loaded {len(self._cache)} prompt templates from API")
-                return self._cache
-                
+            client = get_client_registry().async_http_client("laravel")
+            response = await client.get(url, headers=headers, timeout=PROMPT_FETCH_TIMEOUT_SEC)
+
+            if response.status_code == 304:
+                self.not_modified += 1
+                self._validated_at = time.monotonic()
+                self._consecutive_failures = 0
+                logger.debug("Prompts unchanged (304)")
+                return True
+
+            response.raise_for_status()
+            prompts = response.json()
+
+            # Atomic swap
+            self._cache = prompts
+            self._etag = response.headers.get("ETag")
+            self._validated_at = time.monotonic()
+            self._consecutive_failures = 0
+            self._prompts_loaded = True
+            self.version += 1
+            self.fetches += 1
+
+            logger.info(f"✅ Loaded {len(prompts)} prompt templates from API")
+            return True
+
         except httpx.HTTPError as e:
+            self._record_failure()
             logger.warning(f"Failed to fetch prompts from API: {e}")
-            return {}
+            return False
         except Exception as e:
+            self._record_failure()
             logger.error(f"Unexpected error fetching prompts: {e}")
-            return {}
-    
+            return False
+
+    async def refresh(self, conditional: bool = True) -> bool:
+        """Revalidate the prompts; concurrent callers share one request."""
+        task = self._refresh_task
+        if task is None or task.done():
+            task = asyncio.create_task(self._fetch_all_prompts(conditional))
+            self._refresh_task = task
+        return await asyncio.shield(task)
+
+    def _revalidate_in_background(self) -> None:
+        """Start a revalidation if the snapshot is stale (no-op without a running loop or while backing off)."""
+        if not self.is_stale or self.is_backing_off:
+            return
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._refresh_task = loop.create_task(self._fetch_all_prompts())
+
+    async def run_refresher(self) -> None:
+        """Revalidate the prompts every TTL (runs until cancelled)."""
+        while True:
+            await asyncio.sleep(self.ttl_sec)
+            await self.refresh()
+
     def get_prompt(self, key: str, fallback: Optional[str] = None) -> Optional[str]:
         """
         Get a prompt template by its key.
@@ -67,12 +152,9 @@ class PromptService:
         Returns:
             The prompt body or fallback value
         """
-        # Try cache first
-        if key in self._cache:
-            return self._cache[key]
-        
-        # Fetch all prompts (they're cached after first call)
-        prompts = self._fetch_all_prompts()
+        # Serve the current snapshot, revalidate in the background if it is stale
+        prompts = self._cache
+        self._revalidate_in_background()
         
         if key in prompts:
             return prompts[key]
@@ -108,13 +190,23 @@ class PromptService:
             logger.error(f"Failed to parse scenario YAML: {e}")
             return None
     
-    def reload(self) -> None:
-        """Force reload prompts from the API."""
-        self._cache.clear()
-        self._prompts_loaded = False
-        self._fetch_all_prompts()
+    async def reload(self) -> bool:
+        """Force reload prompts from the API (the current set stays in use until it succeeds)."""
+        return await self.refresh(conditional=False)
+
+    def stats(self) -> dict:
+        """Counters for /metrics."""
+        return {
+            "loaded": self._prompts_loaded,
+            "prompts": len(self._cache),
+            "age_sec": round(time.monotonic() - self._validated_at, 1) if self._prompts_loaded else None,
+            "fetches": self.fetches,
+            "not_modified": self.not_modified,
+            "failures": self.failures,
+            "consecutive_failures": self._consecutive_failures,
+        }
     
-    def format_persona_prompt(
+    def compile_persona_prompt(
         self,
         persona_name: str,
         persona_role: str,
@@ -123,13 +215,15 @@ class PromptService:
         private_knowledge: str,
         shared_facts: str,
         timeline: str,
-        knows_about_others: str,
-        stress_modifier: str = ""
+        knows_about_others: str
     ) -> str:
         """
-        Format the persona system prompt with the given values.
+        Format the static persona system prompt.
         
-        Uses the 'persona_system_prompt' template from the database.
+        Uses the 'persona_system_prompt' template from the database. The
+        stress modifier is sent as a separate message after the history
+        (see PersonaAgent), so a {stress_modifier} slot that older templates
+        still have is left empty.
         """
         template = self.get_prompt("persona_system_prompt")
         
@@ -138,7 +232,7 @@ class PromptService:
             # Use a minimal fallback
             template = "You are {persona_name}, {persona_role}. {personality}"
         
-        return template.format(
+        text = template.format(
             persona_name=persona_name,
             persona_role=persona_role,
             company_name=company_name,
@@ -147,8 +241,9 @@ class PromptService:
             shared_facts=shared_facts,
             timeline=timeline,
             knows_about_others=knows_about_others,
-            stress_modifier=stress_modifier
+            stress_modifier=""
         )
+        return text.rstrip()
 
 
 # Global singleton instance
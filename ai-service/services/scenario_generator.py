@@ -8,26 +8,50 @@ OPTIMIZATION: Two-phase generation with parallel persona creation:
 1. Generate base scenario with persona blueprints (fast)
 2. Generate all 4 personas in parallel (4x faster than sequential)
 
+With SCENARIO_SPECULATIVE_PHASE2, Phase 1 is streamed and parsed as
+partial JSON: Phase 2 (and the images) start as soon as the fields they
+need are complete instead of waiting for the whole base scenario.
+
 Prompts are loaded from the Laravel database via PromptService.
 """
 
 import os
+import json
 import asyncio
 import logging
 import time
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Callable, Optional
 
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage
+from langchain_core.utils.json import parse_partial_json
 from pydantic import BaseModel, Field, model_validator
 
 from .prompt_service import get_prompt_service
+from .client_registry import get_client_registry
+from .llm_scheduler import LLMPriority, get_llm_scheduler
 from . import laravel_logger
 from . import progress_service
 
 logger = logging.getLogger(__name__)
 
+# Phase 1 is retried only when its result is missing or invalid
+PHASE1_MAX_RETRIES = int(os.getenv("SCENARIO_PHASE1_MAX_RETRIES", "2"))
+# Each persona is retried on its own; completed personas are kept
+PERSONA_MAX_RETRIES = int(os.getenv("SCENARIO_PERSONA_MAX_RETRIES", "2"))
+PERSONA_RETRY_BACKOFF_SEC = float(os.getenv("SCENARIO_PERSONA_RETRY_BACKOFF_SEC", "1.0"))
+
+# Stream Phase 1 and start Phase 2 / images before it has finished
+SCENARIO_SPECULATIVE_PHASE2 = os.getenv("SCENARIO_SPECULATIVE_PHASE2", "true").lower() == "true"
+
+# Base scenario fields the persona prompts are built from
+PERSONA_CONTEXT_FIELDS = {"name", "setting", "victim", "solution", "timeline", "persona_blueprints"}
+# Base scenario fields the crime scene images are built from
+IMAGE_CONTEXT_FIELDS = {"name", "setting", "victim", "solution"}
+
+# Partial JSON is only re-parsed when a chunk may have completed a value
+JSON_STRUCTURE_CHARS = set('"{}[]')
+
 
 # === Performance Tracking ===
 
@@ -41,7 +65,9 @@ class GenerationMetrics:
     phase2_end: Optional[float] = None
     persona_times: dict = field(default_factory=dict)
     total_end: Optional[float] = None
-    retries: int = 0
+    retries: int = 0  # Phase 1 retries
+    phase2_retries: int = 0  # Persona retries (all personas)
+    persona_retries: dict = field(default_factory=dict)
     
     def start_phase1(self):
         self.phase1_current_start = time.time()
@@ -66,9 +92,24 @@ class GenerationMetrics:
     def record_persona(self, slug: str, duration: float):
         self.persona_times[slug] = duration
         
+    def record_persona_retry(self, slug: str):
+        self.phase2_retries += 1
+        self.persona_retries[slug] = self.persona_retries.get(slug, 0) + 1
+        
     def finish(self):
         self.total_end = time.time()
         
+    def to_dict(self) -> dict:
+        """Metrics attached to the scenario as `_metrics` (for the API response)."""
+        return {
+            "total_sec": round(self.total_duration, 2),
+            "phase1_sec": round(self.phase1_duration, 2),
+            "phase2_sec": round(self.phase2_duration, 2),
+            "retries": self.retries,
+            "phase2_retries": self.phase2_retries,
+            "persona_times": {k: round(v, 2) for k, v in self.persona_times.items()}
+        }
+        
     @property
     def phase1_duration(self) -> float:
         """Total time spent on Phase 1 (including retries)."""
@@ -110,6 +151,8 @@ class GenerationMetrics:
             logger.info(f"  Phase 1 (Base Scenario):  {self.phase1_duration:.2f}s")
             
         logger.info(f"  Phase 2 (Personas):       {self.phase2_duration:.2f}s")
+        if self.phase2_retries > 0:
+            logger.info(f"  ⚠️  Persona retries:       {self.phase2_retries} {self.persona_retries}")
         
         # Send summary to Laravel game log (fire-and-forget)
         laravel_logger.info(
@@ -118,7 +161,8 @@ class GenerationMetrics:
             total_sec=round(self.total_duration, 2),
             phase1_sec=round(self.phase1_duration, 2),
             phase2_sec=round(self.phase2_duration, 2),
-            retries=self.retries
+            retries=self.retries,
+            phase2_retries=self.phase2_retries
         )
         
         if self.persona_times:
@@ -350,20 +394,20 @@ class ScenarioGenerator:
         # Use better model for Phase 2 (persona details need quality)
         phase2_model = os.getenv("OPENAI_MODEL_PHASE2", model_name)
         
+        client_registry = get_client_registry()
+        
         # LLM for base scenario (with BaseScenarioModel) - FAST
-        base_llm = ChatOpenAI(
-            model=phase1_model,
-            temperature=0.9,
-            api_key=self.api_key
-        )
+        base_llm = client_registry.chat_model(phase1_model, temperature=0.9)
         self.base_llm = base_llm.with_structured_output(BaseScenarioModel)
+        # Same tool call, but streamed as raw chunks for speculative Phase 2
+        self.base_llm_streaming = base_llm.bind_tools(
+            [BaseScenarioModel],
+            tool_choice=BaseScenarioModel.__name__,
+            parallel_tool_calls=False
+        )
         
         # LLM for persona generation (with PersonaModel) - QUALITY
-        persona_llm = ChatOpenAI(
-            model=phase2_model,
-            temperature=0.8,  # Slightly lower for consistency
-            api_key=self.api_key
-        )
+        persona_llm = client_registry.chat_model(phase2_model, temperature=0.8)  # Slightly lower for consistency
         self.persona_llm = persona_llm.with_structured_output(PersonaModel)
         
         logger.info(f"ScenarioGenerator initialized: Phase1={phase1_model}, Phase2={phase2_model} (Parallel)")
@@ -391,19 +435,22 @@ class ScenarioGenerator:
         self,
         user_input: str = "",
         difficulty: str = "mittel",
-        game_id: str = ""
+        game_id: str = "",
+        metrics: Optional[GenerationMetrics] = None
     ) -> BaseScenarioModel:
         """
         Generate ONLY Phase 1 (base scenario with blueprints).
         
         Use this when you want to start image generation in parallel with Phase 2.
-        Call generate_personas_from_base() to complete the scenario.
+        Call generate_personas_from_base() (with the same metrics) to complete the scenario.
         """
         if game_id:
             await progress_service.started(game_id)
             await progress_service.generating_scenario(game_id)
         
-        base_scenario = await self._generate_base_scenario(user_input, difficulty)
+        base_scenario = await self._generate_valid_base_scenario(
+            user_input, difficulty, metrics or GenerationMetrics()
+        )
         
         if game_id:
             await progress_service.scenario_complete(game_id)
@@ -414,14 +461,15 @@ class ScenarioGenerator:
         self,
         base_scenario: BaseScenarioModel,
         difficulty: str = "mittel",
-        game_id: str = ""
+        game_id: str = "",
+        metrics: Optional[GenerationMetrics] = None
     ) -> dict:
         """
         Generate Phase 2 (personas) from an existing base scenario.
         
         Returns the complete scenario dict.
         """
-        metrics = GenerationMetrics()
+        metrics = metrics or GenerationMetrics()
         metrics.start_phase2()
         
         num_personas = len(base_scenario.persona_blueprints)
@@ -446,14 +494,148 @@ class ScenarioGenerator:
         self._validate_scenario(scenario_dict)
         metrics.finish()
         
-        scenario_dict["_metrics"] = {
-            "total_sec": round(metrics.total_duration, 2),
-            "phase1_sec": 0,  # Not tracked here
-            "phase2_sec": round(metrics.phase2_duration, 2),
-            "retries": 0,
-            "persona_times": {k: round(v, 2) for k, v in metrics.persona_times.items()}
+        scenario_dict["_metrics"] = metrics.to_dict()
+        
+        return scenario_dict
+
+    async def generate_speculative(
+        self,
+        user_input: str = "",
+        difficulty: str = "mittel",
+        game_id: str = "",
+        on_scene_ready: Optional[Callable[[dict], None]] = None
+    ) -> dict:
+        """
+        Generate Phase 1 and Phase 2 with Phase 2 overlapping Phase 1.
+        
+        Phase 1 is streamed; the personas are launched as soon as the
+        context fields and all blueprints are complete (the rest of Phase 1,
+        e.g. the intro message, is generated meanwhile). `on_scene_ready`
+        is called with name/setting/victim/solution as soon as those are
+        complete, so callers can start image generation early. If Phase 1
+        turns out invalid and is retried, it is called again for the new scene.
+        
+        Returns the complete scenario dict (like generate_personas_from_base).
+        """
+        metrics = GenerationMetrics()
+        persona_task: Optional[asyncio.Task] = None
+        draft: Optional[BaseScenarioModel] = None
+        scene_sent = False
+        speculation_failed = False
+        
+        if game_id:
+            await progress_service.started(game_id)
+            await progress_service.generating_scenario(game_id)
+        
+        def launch_personas(base_scenario: BaseScenarioModel) -> asyncio.Task:
+            metrics.start_phase2()
+            num_personas = len(base_scenario.persona_blueprints)
+            logger.info(f"👥 PHASE 2: Generating {num_personas} personas in PARALLEL (speculative)...")
+            
+            async def run() -> list[PersonaModel]:
+                if game_id:
+                    await progress_service.scenario_complete(game_id)
+                    await progress_service.generating_personas(game_id, num_personas)
+                personas = await self._generate_personas_parallel(base_scenario, difficulty, metrics, game_id)
+                metrics.end_phase2()
+                return personas
+            
+            return asyncio.create_task(run())
+        
+        def on_partial(partial: dict, complete: set[str]) -> bool:
+            """Start whatever the completed fields allow. Returns True when nothing is left to start."""
+            nonlocal persona_task, draft, scene_sent, speculation_failed
+            
+            if not scene_sent and IMAGE_CONTEXT_FIELDS <= complete:
+                scene_sent = True
+                if on_scene_ready:
+                    on_scene_ready({field_name: partial[field_name] for field_name in IMAGE_CONTEXT_FIELDS})
+            
+            if persona_task is None and not speculation_failed and PERSONA_CONTEXT_FIELDS <= complete:
+                try:
+                    draft = BaseScenarioModel.model_validate(
+                        {field_name: partial[field_name] for field_name in PERSONA_CONTEXT_FIELDS}
+                    )
+                    self._validate_base_scenario(draft)
+                except ValueError as e:
+                    # E.g. fewer than 4 blueprints - wait for the full result
+                    logger.warning(f"Speculative Phase 2 skipped, invalid blueprints: {e}")
+                    speculation_failed = True
+                else:
+                    persona_task = launch_personas(draft)
+            
+            return scene_sent and (persona_task is not None or speculation_failed)
+        
+        try:
+            last_error = None
+            for attempt in range(PHASE1_MAX_RETRIES + 1):
+                if attempt > 0:
+                    logger.warning(f"⚠️ Phase 1 retry {attempt}/{PHASE1_MAX_RETRIES} - previous error: {last_error}")
+                    # Nothing speculated from the invalid attempt is kept
+                    if persona_task is not None:
+                        persona_task.cancel()
+                    persona_task, draft, scene_sent, speculation_failed = None, None, False, False
+                
+                metrics.start_phase1()
+                logger.info("📋 PHASE 1: Streaming base scenario with blueprints...")
+                try:
+                    base_scenario = await self._stream_base_scenario(user_input, difficulty, on_partial)
+                    self._validate_base_scenario(base_scenario)
+                except Exception as e:
+                    metrics.end_phase1(success=False)
+                    last_error = str(e)
+                    logger.error(f"❌ Phase 1 attempt {attempt + 1} failed: {last_error}")
+                    continue
+                metrics.end_phase1(success=True)
+                break
+            else:
+                raise ValueError(f"Scenario generation failed: {last_error}")
+            
+            logger.info(f"✅ Phase 1 complete in {metrics.phase1_success_duration:.2f}s: {base_scenario.name}")
+            
+            if not scene_sent and on_scene_ready:
+                on_scene_ready({
+                    "name": base_scenario.name,
+                    "setting": base_scenario.setting,
+                    "victim": base_scenario.victim.model_dump(),
+                    "solution": base_scenario.solution.model_dump(),
+                })
+            
+            # The speculation must have used exactly the final context
+            if persona_task is not None and any(
+                getattr(draft, field_name) != getattr(base_scenario, field_name)
+                for field_name in PERSONA_CONTEXT_FIELDS
+            ):
+                logger.warning("Speculative Phase 2 context changed - regenerating personas")
+                persona_task.cancel()
+                persona_task = None
+            if persona_task is None:
+                persona_task = launch_personas(base_scenario)
+            
+            personas = await persona_task
+        except BaseException:
+            if persona_task is not None:
+                persona_task.cancel()
+            raise
+        
+        # Assemble final scenario
+        scenario_dict = {
+            "name": base_scenario.name,
+            "setting": base_scenario.setting,
+            "victim": base_scenario.victim.model_dump(),
+            "solution": base_scenario.solution.model_dump(),
+            "shared_knowledge": base_scenario.shared_knowledge,
+            "timeline": base_scenario.timeline,
+            "personas": [p.model_dump() for p in personas],
+            "intro_message": base_scenario.intro_message
         }
         
+        self._validate_scenario(scenario_dict)
+        metrics.finish()
+        metrics.log_summary(scenario_name=scenario_dict["name"])
+        
+        scenario_dict["_metrics"] = metrics.to_dict()
+        
         return scenario_dict
 
     async def generate_async(
@@ -474,7 +656,7 @@ class ScenarioGenerator:
         Args:
             user_input: Optional user input for scenario theme
             difficulty: einfach, mittel, or schwer
-            max_retries: Number of retries on failure
+            max_retries: Number of Phase 1 retries (only if its result is invalid)
             game_id: Game ID for progress broadcasting
         """
         metrics = GenerationMetrics()
@@ -492,91 +674,101 @@ class ScenarioGenerator:
         if game_id:
             await progress_service.started(game_id)
         
+        try:
+            # === PHASE 1: Generate base scenario (retried only if invalid) ===
+            logger.info("📋 PHASE 1: Generating base scenario with blueprints...")
+            
+            # Broadcast: Generating scenario
+            if game_id:
+                await progress_service.generating_scenario(game_id)
+            
+            base_scenario = await self._generate_valid_base_scenario(user_input, difficulty, metrics, max_retries)
+            
+            logger.info(f"✅ Phase 1 complete in {metrics.phase1_success_duration:.2f}s")
+            
+            # Broadcast: Scenario complete
+            if game_id:
+                await progress_service.scenario_complete(game_id)
+            logger.info(f"   Case: {base_scenario.name}")
+            logger.info(f"   Victim: {base_scenario.victim.name} ({base_scenario.victim.role})")
+            logger.info(f"   Murderer: {base_scenario.solution.murderer}")
+            logger.info(f"   Blueprints: {len(base_scenario.persona_blueprints)}")
+            for bp in base_scenario.persona_blueprints:
+                marker = " 🔪" if bp.is_murderer else ""
+                logger.info(f"     - {bp.slug}: {bp.name} ({bp.role}){marker}")
+            
+            # === PHASE 2: Generate all personas in parallel (retried per persona) ===
+            metrics.start_phase2()
+            num_personas = len(base_scenario.persona_blueprints)
+            logger.info(f"👥 PHASE 2: Generating {num_personas} personas in PARALLEL...")
+            
+            # Broadcast: Generating personas
+            if game_id:
+                await progress_service.generating_personas(game_id, num_personas)
+            
+            personas = await self._generate_personas_parallel(base_scenario, difficulty, metrics, game_id)
+            metrics.end_phase2()
+            
+            logger.info(f"✅ Phase 2 complete in {metrics.phase2_duration:.2f}s")
+        except Exception as e:
+            logger.error(f"💥 Scenario generation failed after {metrics.total_duration:.2f}s: {e}")
+            laravel_logger.error(
+                "Scenario generation failed permanently",
+                phase1_retries=metrics.retries,
+                phase2_retries=metrics.phase2_retries,
+                error=str(e)[:200],
+                duration_sec=round(metrics.total_duration, 2)
+            )
+            if game_id:
+                await progress_service.error(game_id, str(e)[:100])
+            raise ValueError(f"Scenario generation failed: {e}") from e
+        
+        # === Assemble final scenario ===
+        scenario_dict = {
+            "name": base_scenario.name,
+            "setting": base_scenario.setting,
+            "victim": base_scenario.victim.model_dump(),
+            "solution": base_scenario.solution.model_dump(),
+            "shared_knowledge": base_scenario.shared_knowledge,
+            "timeline": base_scenario.timeline,
+            "personas": [p.model_dump() for p in personas],
+            "intro_message": base_scenario.intro_message
+        }
+        
+        # Validate
+        self._validate_scenario(scenario_dict)
+        
+        # Log final metrics
+        metrics.finish()
+        metrics.log_summary(scenario_name=scenario_dict.get("name", ""))
+        
+        # Attach metrics to scenario for API response
+        scenario_dict["_metrics"] = metrics.to_dict()
+        
+        return scenario_dict
+    
+    async def _generate_valid_base_scenario(
+        self,
+        user_input: str,
+        difficulty: str,
+        metrics: GenerationMetrics,
+        max_retries: int = PHASE1_MAX_RETRIES
+    ) -> BaseScenarioModel:
+        """Phase 1, retried only when the result is missing or invalid."""
         last_error = None
         
         for attempt in range(max_retries + 1):
+            if attempt > 0:
+                logger.warning(f"⚠️ Phase 1 retry {attempt}/{max_retries} - previous error: {last_error}")
+            
+            metrics.start_phase1()
             try:
-                if attempt > 0:
-                    logger.warning(f"⚠️ Retry attempt {attempt}/{max_retries} - previous error: {last_error}")
-                    # Don't reset metrics - we want to track total time including retries
-                
-                # === PHASE 1: Generate base scenario ===
-                metrics.start_phase1()
-                logger.info("📋 PHASE 1: Generating base scenario with blueprints...")
-                
-                # Broadcast: Generating scenario
-                if game_id:
-                    await progress_service.generating_scenario(game_id)
-                
-                try:
-                    base_scenario = await self._generate_base_scenario(user_input, difficulty)
-                    metrics.end_phase1(success=True)
-                except Exception as e:
-                    metrics.end_phase1(success=False)
-                    if game_id:
-                        await progress_service.error(game_id, str(e)[:100])
-                    raise e
-                
-                logger.info(f"✅ Phase 1 complete in {metrics.phase1_success_duration:.2f}s")
-                
-                # Broadcast: Scenario complete
-                if game_id:
-                    await progress_service.scenario_complete(game_id)
-                logger.info(f"   Case: {base_scenario.name}")
-                logger.info(f"   Victim: {base_scenario.victim.name} ({base_scenario.victim.role})")
-                logger.info(f"   Murderer: {base_scenario.solution.murderer}")
-                logger.info(f"   Blueprints: {len(base_scenario.persona_blueprints)}")
-                for bp in base_scenario.persona_blueprints:
-                    marker = " 🔪" if bp.is_murderer else ""
-                    logger.info(f"     - {bp.slug}: {bp.name} ({bp.role}){marker}")
-                
-                # === PHASE 2: Generate all personas in parallel ===
-                metrics.start_phase2()
-                num_personas = len(base_scenario.persona_blueprints)
-                logger.info(f"👥 PHASE 2: Generating {num_personas} personas in PARALLEL...")
-                
-                # Broadcast: Generating personas
-                if game_id:
-                    await progress_service.generating_personas(game_id, num_personas)
-                
-                personas = await self._generate_personas_parallel(base_scenario, difficulty, metrics, game_id)
-                metrics.end_phase2()
-                
-                logger.info(f"✅ Phase 2 complete in {metrics.phase2_duration:.2f}s")
-                
-                # === Assemble final scenario ===
-                scenario_dict = {
-                    "name": base_scenario.name,
-                    "setting": base_scenario.setting,
-                    "victim": base_scenario.victim.model_dump(),
-                    "solution": base_scenario.solution.model_dump(),
-                    "shared_knowledge": base_scenario.shared_knowledge,
-                    "timeline": base_scenario.timeline,
-                    "personas": [p.model_dump() for p in personas],
-                    "intro_message": base_scenario.intro_message
-                }
-                
-                # Validate
-                self._validate_scenario(scenario_dict)
-                
-                # Log final metrics
-                metrics.finish()
-                metrics.log_summary(scenario_name=scenario_dict.get("name", ""))
-                
-                # Attach metrics to scenario for API response
-                scenario_dict["_metrics"] = {
-                    "total_sec": round(metrics.total_duration, 2),
-                    "phase1_sec": round(metrics.phase1_duration, 2),
-                    "phase2_sec": round(metrics.phase2_duration, 2),
-                    "retries": metrics.retries,
-                    "persona_times": {k: round(v, 2) for k, v in metrics.persona_times.items()}
-                }
-                
-                return scenario_dict
-                
+                base_scenario = await self._generate_base_scenario(user_input, difficulty)
+                self._validate_base_scenario(base_scenario)
             except Exception as e:
+                metrics.end_phase1(success=False)
                 last_error = str(e)
-                logger.error(f"❌ Attempt {attempt + 1} failed: {last_error}")
+                logger.error(f"❌ Phase 1 attempt {attempt + 1} failed: {last_error}")
                 
                 # Log retry/error to Laravel
                 laravel_logger.warning(
@@ -585,22 +777,55 @@ class ScenarioGenerator:
                     error=last_error[:200],
                     duration_sec=round(metrics.total_duration, 2)
                 )
-                
-                if attempt >= max_retries:
-                    logger.error(f"💥 All {max_retries + 1} attempts failed after {metrics.total_duration:.2f}s")
-                    laravel_logger.error(
-                        "Scenario generation failed permanently",
-                        attempts=max_retries + 1,
-                        error=last_error[:200],
-                        duration_sec=round(metrics.total_duration, 2)
-                    )
-                    raise ValueError(f"Scenario generation failed: {last_error}")
+                continue
+            
+            metrics.end_phase1(success=True)
+            return base_scenario
         
-        raise ValueError(f"Scenario generation failed: {last_error}")
+        raise ValueError(f"Phase 1 failed after {max_retries + 1} attempts: {last_error}")
     
     async def _generate_base_scenario(self, user_input: str, difficulty: str) -> BaseScenarioModel:
         """Phase 1: Generate base scenario with persona blueprints."""
+        messages = self._base_scenario_messages(user_input, difficulty)
+        
+        # Use ainvoke for async
+        async with get_llm_scheduler().slot(LLMPriority.GENERATION, messages):
+            return await self.base_llm.ainvoke(messages)
+    
+    async def _stream_base_scenario(
+        self,
+        user_input: str,
+        difficulty: str,
+        on_partial: Callable[[dict, set[str]], bool]
+    ) -> BaseScenarioModel:
+        """
+        Phase 1 as a stream of tool-call argument chunks.
         
+        The arguments are parsed as partial JSON while they arrive and
+        passed to `on_partial` with the set of top-level fields that are
+        complete (every field but the last one seen - the model writes the
+        fields one after another). Parsing stops once `on_partial` returns True.
+        """
+        messages = self._base_scenario_messages(user_input, difficulty)
+        arguments = ""
+        watching = True
+        
+        async with get_llm_scheduler().slot(LLMPriority.GENERATION, messages):
+            async for chunk in self.base_llm_streaming.astream(messages):
+                for tool_call_chunk in chunk.tool_call_chunks:
+                    piece = tool_call_chunk.get("args") or ""
+                    arguments += piece
+                    if not watching or JSON_STRUCTURE_CHARS.isdisjoint(piece):
+                        continue
+                    partial = parse_partial_json(arguments)
+                    if isinstance(partial, dict) and partial:
+                        watching = not on_partial(partial, set(list(partial)[:-1]))
+        
+        if not arguments:
+            raise ValueError("Phase 1 stream returned no base scenario")
+        return BaseScenarioModel.model_validate(json.loads(arguments))
+    
+    def _base_scenario_messages(self, user_input: str, difficulty: str) -> list:
         if user_input.strip():
             user_prompt = f"""Create a Murder Mystery scenario based on:
 
@@ -616,13 +841,10 @@ Language: English
 
 Surprise me with an unusual setting!"""
         
-        messages = [
+        return [
             SystemMessage(content=BASE_SCENARIO_PROMPT),
             HumanMessage(content=user_prompt)
         ]
-        
-        # Use ainvoke for async
-        return await self.base_llm.ainvoke(messages)
     
     async def _generate_personas_parallel(
         self, 
@@ -652,7 +874,7 @@ Murderer's motive: {base_scenario.solution.motive}"""
         # Create tasks for parallel generation
         tasks = []
         for idx, blueprint in enumerate(base_scenario.persona_blueprints):
-            task = self._generate_single_persona(
+            task = asyncio.create_task(self._generate_persona_with_retry(
                 blueprint=blueprint,
                 scenario_context=scenario_context,
                 other_personas=other_personas_list,
@@ -661,15 +883,42 @@ Murderer's motive: {base_scenario.solution.motive}"""
                 game_id=game_id,
                 persona_index=idx,
                 total_personas=total_personas
-            )
+            ))
             tasks.append(task)
         
         # Run all persona generations in parallel!
         logger.info(f"   Launching {len(tasks)} parallel API calls...")
-        personas = await asyncio.gather(*tasks)
+        try:
+            personas = await asyncio.gather(*tasks)
+        except BaseException:
+            # A persona failed for good - don't leave the others running
+            for task in tasks:
+                task.cancel()
+            raise
         
         return list(personas)
     
+    async def _generate_persona_with_retry(
+        self,
+        blueprint: PersonaBlueprintModel,
+        metrics: GenerationMetrics,
+        **kwargs
+    ) -> PersonaModel:
+        """Generate one persona, retrying with exponential backoff on failure."""
+        for attempt in range(PERSONA_MAX_RETRIES + 1):
+            try:
+                return await self._generate_single_persona(blueprint=blueprint, metrics=metrics, **kwargs)
+            except Exception as e:
+                if attempt >= PERSONA_MAX_RETRIES:
+                    raise ValueError(f"Persona {blueprint.slug} failed after {attempt + 1} attempts: {e}") from e
+                delay = PERSONA_RETRY_BACKOFF_SEC * (2 ** attempt)
+                metrics.record_persona_retry(blueprint.slug)
+                logger.warning(
+                    f"     ⚠️ Persona {blueprint.slug} failed ({e}) - "
+                    f"retry {attempt + 1}/{PERSONA_MAX_RETRIES} in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+    
     async def _generate_single_persona(
         self,
         blueprint: PersonaBlueprintModel,
@@ -708,7 +957,8 @@ Murderer's motive: {base_scenario.solution.motive}"""
             HumanMessage(content=prompt)
         ]
         
-        persona = await self.persona_llm.ainvoke(messages)
+        async with get_llm_scheduler().slot(LLMPriority.GENERATION, messages):
+            persona = await self.persona_llm.ainvoke(messages)
         
         # Override slug/name/role from blueprint to ensure consistency
         persona.slug = blueprint.slug
@@ -728,6 +978,21 @@ Murderer's motive: {base_scenario.solution.motive}"""
         
         return persona
     
+    def _validate_base_scenario(self, base_scenario: BaseScenarioModel) -> None:
+        """
+        Validate the Phase 1 business rules on the blueprints.
+        
+        Persona slugs are taken from the blueprints, so a scenario that
+        would fail _validate_scenario() is already invalid here.
+        """
+        slugs = [bp.slug for bp in base_scenario.persona_blueprints]
+        if len(set(slugs)) != len(slugs):
+            raise ValueError(f"Duplicate blueprint slugs: {slugs}")
+        
+        murderer_slug = base_scenario.solution.murderer
+        if murderer_slug not in slugs:
+            raise ValueError(f"Murderer '{murderer_slug}' not found in blueprints: {slugs}")
+    
     def _validate_scenario(self, scenario: dict) -> None:
         """
         Validate business rules that Pydantic can't enforce.
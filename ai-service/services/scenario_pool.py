@@ -0,0 +1,189 @@
+"""
+Scenario Pool - Ready-made random scenarios for instant /scenario/generate.
+
+A random scenario (no user input) costs a Phase 1 call, four parallel
+Phase 2 calls and three image calls - 15-40s of waiting. The pool keeps
+SCENARIO_POOL_SIZE complete scenarios (with images) per difficulty:
+
+- requests without user input take a scenario from their difficulty's pool
+- every take triggers a refill in the background
+- at most SCENARIO_POOL_CONCURRENCY scenarios are generated at a time,
+  so filling the pool never competes too hard with live requests
+- failed fills are retried after SCENARIO_POOL_RETRY_DELAY_SEC
+
+The pool lives in memory; it is refilled after a restart.
+SCENARIO_POOL_SIZE=0 (default) disables it.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional, TYPE_CHECKING
+
+from .latency_metrics import get_latency_metrics
+from .llm_scheduler import LLMPriority, llm_priority_scope
+
+if TYPE_CHECKING:
+    from .image_generator import ImageGenerator
+    from .scenario_generator import ScenarioGenerator
+
+logger = logging.getLogger(__name__)
+
+SCENARIO_POOL_SIZE = int(os.getenv("SCENARIO_POOL_SIZE", "0"))
+SCENARIO_POOL_DIFFICULTIES = [
+    difficulty.strip()
+    for difficulty in os.getenv("SCENARIO_POOL_DIFFICULTIES", "einfach,mittel,schwer").split(",")
+    if difficulty.strip()
+]
+SCENARIO_POOL_CONCURRENCY = int(os.getenv("SCENARIO_POOL_CONCURRENCY", "1"))
+SCENARIO_POOL_RETRY_DELAY_SEC = float(os.getenv("SCENARIO_POOL_RETRY_DELAY_SEC", "60"))
+
+
+@dataclass
+class PooledScenario:
+    """A complete scenario waiting in the pool."""
+    scenario: dict
+    image_ids: list[str]
+    difficulty: str
+    created_at: float = field(default_factory=time.time)
+
+
+class ScenarioPool:
+    """Per-difficulty pools of pre-generated scenarios."""
+
+    def __init__(
+        self,
+        generator: "ScenarioGenerator",
+        image_generator: "ImageGenerator",
+        size: int = SCENARIO_POOL_SIZE,
+        difficulties: Optional[list[str]] = None,
+        concurrency: int = SCENARIO_POOL_CONCURRENCY
+    ):
+        self.generator = generator
+        self.image_generator = image_generator
+        self.size = size
+        self.difficulties = difficulties or SCENARIO_POOL_DIFFICULTIES
+        self._ready: dict[str, deque[PooledScenario]] = {d: deque() for d in self.difficulties}
+        self._filling: dict[str, int] = {d: 0 for d in self.difficulties}
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._tasks: set[asyncio.Task] = set()
+        self._fill_times: deque[float] = deque()  # Completion times of the last hour
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.generated = 0
+        self.failed = 0
+
+        if self.enabled:
+            logger.info(
+                f"ScenarioPool initialized: size={size} per difficulty "
+                f"({', '.join(self.difficulties)}), concurrency={concurrency}"
+            )
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0
+
+    def take(self, difficulty: str) -> Optional[PooledScenario]:
+        """Take a ready scenario (None if the pool is empty or disabled) and refill."""
+        if not self.enabled or difficulty not in self._ready:
+            return None
+
+        pool = self._ready[difficulty]
+        pooled = pool.popleft() if pool else None
+        if pooled:
+            self.hits += 1
+            logger.info(f"🎲 Scenario pool hit ({difficulty}): {pooled.scenario['name']} - {len(pool)} left")
+        else:
+            self.misses += 1
+            logger.info(f"Scenario pool empty ({difficulty}) - generating on demand")
+
+        self.refill(difficulty)
+        return pooled
+
+    def image_ids(self) -> set[str]:
+        """Images of all ready scenarios (spared by the image purger)."""
+        return {image_id for pool in self._ready.values() for pooled in pool for image_id in pooled.image_ids}
+
+    def refill(self, difficulty: Optional[str] = None) -> None:
+        """Start fill tasks until the pool(s) will be full again."""
+        if not self.enabled:
+            return
+        for d in ([difficulty] if difficulty else self.difficulties):
+            missing = self.size - len(self._ready[d]) - self._filling[d]
+            for _ in range(missing):
+                self._filling[d] += 1
+                task = asyncio.create_task(self._fill(d))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    async def _fill(self, difficulty: str) -> None:
+        failed = False
+        try:
+            async with self._semaphore:
+                start_time = time.monotonic()
+                # All LLM calls of the fill run in the lowest priority class
+                with llm_priority_scope(LLMPriority.POOL):
+                    pooled = await self._generate(difficulty)
+                duration = time.monotonic() - start_time
+            self._ready[difficulty].append(pooled)
+            self.generated += 1
+            self._fill_times.append(time.time())
+            get_latency_metrics().record("scenario_pool_fill", duration)
+            logger.info(f"🎲 Pooled scenario ({difficulty}): {pooled.scenario['name']} in {duration:.1f}s")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            failed = True
+            self.failed += 1
+            logger.error(f"Scenario pool fill failed ({difficulty}): {e}", exc_info=True)
+        finally:
+            self._filling[difficulty] -= 1
+
+        if failed:
+            await asyncio.sleep(SCENARIO_POOL_RETRY_DELAY_SEC)
+            self.refill(difficulty)
+
+    async def _generate(self, difficulty: str) -> PooledScenario:
+        """Generate one random scenario with images (same pipeline as /scenario/generate)."""
+        base_scenario = await self.generator.generate_base_only(difficulty=difficulty)
+        scenario_for_images = {
+            "name": base_scenario.name,
+            "setting": base_scenario.setting,
+            "victim": base_scenario.victim.model_dump(),
+            "solution": base_scenario.solution.model_dump(),
+        }
+        scenario, image_ids = await asyncio.gather(
+            self.generator.generate_personas_from_base(base_scenario, difficulty=difficulty),
+            self.image_generator.generate_crime_scene_images(scenario_for_images)
+        )
+        scenario.pop("_metrics", None)
+        return PooledScenario(scenario=scenario, image_ids=image_ids, difficulty=difficulty)
+
+    def stats(self) -> dict:
+        """Pool depth, refill rate and hit ratio for /metrics."""
+        cutoff = time.time() - 3600
+        while self._fill_times and self._fill_times[0] < cutoff:
+            self._fill_times.popleft()
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": self.size,
+            "depth": {d: len(pool) for d, pool in self._ready.items()},
+            "filling": dict(self._filling),
+            "generated": self.generated,
+            "generated_last_hour": len(self._fill_times),
+            "failed": self.failed,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        """Cancel all fill tasks (on shutdown)."""
+        for task in list(self._tasks):
+            task.cancel()
@@ -0,0 +1,301 @@
+"""
+Game Session Registry - Bounded storage for per-game agents and graphs.
+
+Replaces the unbounded module-level `gamemasters` / `murder_graphs` dicts.
+Every session holds a GameMasterAgent (with its persona agents, LLM client
+and voice service) plus the compiled LangGraph, so keeping them forever
+eventually gets the process OOM-killed.
+
+Sessions are evicted when:
+- they have been idle longer than the TTL (aligned with Laravel's
+  `games.expires_at`, which is set to now + 60 minutes)
+- their absolute `expires_at` has passed
+- the max session count is exceeded (least recently used first)
+- the estimated memory budget is exceeded (least recently used first)
+"""
+
+import os
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from agents.gamemaster_agent import GameMasterAgent
+
+logger = logging.getLogger(__name__)
+
+# Limits (configurable via environment)
+GAME_SESSION_MAX = int(os.getenv("GAME_SESSION_MAX", "500"))
+GAME_SESSION_MEMORY_MB = float(os.getenv("GAME_SESSION_MEMORY_MB", "1024"))
+# Laravel sets games.expires_at = now + 60 minutes
+GAME_SESSION_IDLE_TTL_SEC = float(os.getenv("GAME_SESSION_IDLE_TTL_SEC", "3600"))
+GAME_SESSION_SWEEP_INTERVAL_SEC = float(os.getenv("GAME_SESSION_SWEEP_INTERVAL_SEC", "60"))
+
+# Rough fixed cost of one session: 4 PersonaAgents, LLM client, voice service, graph
+SESSION_BASE_BYTES = 512 * 1024
+
+
+class EvictionReason:
+    """Why a session left the registry."""
+    IDLE = "idle"
+    EXPIRED = "expired"
+    CAPACITY = "capacity"
+    MEMORY = "memory"
+    REPLACED = "replaced"
+    REMOVED = "removed"
+
+
+@dataclass
+class GameSession:
+    """Everything the AI service keeps in memory for one game."""
+    game_id: str
+    gamemaster: "GameMasterAgent"
+    graph: Any
+    created_at: float = field(default_factory=time.time)
+    last_access: float = field(default_factory=time.time)
+    expires_at: Optional[float] = None  # Absolute unix timestamp (from Laravel)
+    estimated_bytes: int = SESSION_BASE_BYTES
+
+    def is_expired(self, now: float, idle_ttl: float) -> Optional[str]:
+        """Return the eviction reason if this session should be dropped."""
+        if self.expires_at is not None and now >= self.expires_at:
+            return EvictionReason.EXPIRED
+        if idle_ttl > 0 and now - self.last_access >= idle_ttl:
+            return EvictionReason.IDLE
+        return None
+
+
+def estimate_session_bytes(
+    gamemaster: "GameMasterAgent",
+    state: Optional[dict] = None,
+    transcript_chars: int = 0
+) -> int:
+    """
+    Estimate the memory footprint of a session.
+
+    Not exact - counts the text that dominates a session (scenario, the
+    latest game state and, if it is kept in this process, the transcript)
+    on top of a fixed per-session overhead.
+    """
+    def text_size(value: Any) -> int:
+        if isinstance(value, str):
+            return len(value)
+        if isinstance(value, dict):
+            return sum(text_size(v) for v in value.values())
+        if isinstance(value, (list, tuple)):
+            return sum(text_size(v) for v in value)
+        return 0
+
+    size = SESSION_BASE_BYTES + text_size(gamemaster.scenario)
+    if state:
+        size += text_size(state.get("messages", []))
+        size += text_size(state.get("auto_notes", {}))
+    size += transcript_chars
+    # Python str/dict overhead roughly doubles the raw text size
+    return size * 2
+
+
+EvictionHook = Callable[[GameSession, str], None]
+
+
+class GameSessionRegistry:
+    """
+    LRU + TTL bounded registry of game sessions.
+
+    The registry is only touched from the event loop, so no locking is needed.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = GAME_SESSION_MAX,
+        memory_budget_mb: float = GAME_SESSION_MEMORY_MB,
+        idle_ttl_sec: float = GAME_SESSION_IDLE_TTL_SEC
+    ):
+        self.max_sessions = max_sessions
+        self.memory_budget_bytes = int(memory_budget_mb * 1024 * 1024)
+        self.idle_ttl_sec = idle_ttl_sec
+
+        self._sessions: "OrderedDict[str, GameSession]" = OrderedDict()
+        self._total_bytes = 0
+        self._eviction_hooks: list[EvictionHook] = []
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions: dict[str, int] = {}
+
+        logger.info(
+            f"GameSessionRegistry initialized: max={max_sessions}, "
+            f"memory={memory_budget_mb:.0f}MB, idle_ttl={idle_ttl_sec:.0f}s"
+        )
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, game_id: str) -> bool:
+        return game_id in self._sessions
+
+    def add_eviction_hook(self, hook: EvictionHook) -> None:
+        """Register a callback that runs whenever a session leaves the registry."""
+        self._eviction_hooks.append(hook)
+
+    def get(self, game_id: str) -> Optional[GameSession]:
+        """Get a session and mark it as recently used."""
+        session = self._sessions.get(game_id)
+
+        if session is None:
+            self.misses += 1
+            return None
+
+        now = time.time()
+        reason = session.is_expired(now, self.idle_ttl_sec)
+        if reason:
+            self._evict(game_id, reason)
+            self.misses += 1
+            return None
+
+        session.last_access = now
+        self._sessions.move_to_end(game_id)
+        self.hits += 1
+        return session
+
+    def peek(self, game_id: str) -> Optional[GameSession]:
+        """Get a session without touching LRU order or counters."""
+        return self._sessions.get(game_id)
+
+    def put(
+        self,
+        game_id: str,
+        gamemaster: "GameMasterAgent",
+        graph: Any,
+        expires_at: Optional[datetime] = None
+    ) -> GameSession:
+        """Store a session, evicting others if limits are exceeded."""
+        if game_id in self._sessions:
+            self._evict(game_id, EvictionReason.REPLACED)
+
+        session = GameSession(
+            game_id=game_id,
+            gamemaster=gamemaster,
+            graph=graph,
+            expires_at=expires_at.timestamp() if expires_at else None,
+            estimated_bytes=estimate_session_bytes(gamemaster)
+        )
+        self._sessions[game_id] = session
+        self._total_bytes += session.estimated_bytes
+
+        self._enforce_limits(protect=game_id)
+        return session
+
+    def refresh_size(self, game_id: str, state: Optional[dict] = None, transcript_chars: int = 0) -> None:
+        """Re-estimate a session's memory after its state or transcript has grown."""
+        session = self._sessions.get(game_id)
+        if session is None:
+            return
+
+        new_size = estimate_session_bytes(session.gamemaster, state, transcript_chars)
+        self._total_bytes += new_size - session.estimated_bytes
+        session.estimated_bytes = new_size
+
+        self._enforce_limits(protect=game_id)
+
+    def remove(self, game_id: str) -> bool:
+        """Explicitly drop a session."""
+        if game_id not in self._sessions:
+            return False
+        self._evict(game_id, EvictionReason.REMOVED)
+        return True
+
+    def sweep(self) -> int:
+        """Evict all idle or expired sessions. Returns the number evicted."""
+        now = time.time()
+        expired = []
+        for game_id, session in self._sessions.items():
+            reason = session.is_expired(now, self.idle_ttl_sec)
+            if reason:
+                expired.append((game_id, reason))
+
+        for game_id, reason in expired:
+            self._evict(game_id, reason)
+
+        if expired:
+            logger.info(f"Session sweep evicted {len(expired)} games ({len(self._sessions)} active)")
+        return len(expired)
+
+    async def run_sweeper(self, interval_sec: float = GAME_SESSION_SWEEP_INTERVAL_SEC) -> None:
+        """Periodically sweep expired sessions (run as a background task)."""
+        while True:
+            await asyncio.sleep(interval_sec)
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error(f"Session sweep failed: {e}", exc_info=True)
+
+    def clear(self) -> None:
+        """Drop all sessions (on shutdown)."""
+        for game_id in list(self._sessions.keys()):
+            self._evict(game_id, EvictionReason.REMOVED)
+
+    def stats(self) -> dict:
+        """Counters for the /health endpoint."""
+        lookups = self.hits + self.misses
+        return {
+            "active": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "estimated_mb": round(self._total_bytes / (1024 * 1024), 2),
+            "memory_budget_mb": round(self.memory_budget_bytes / (1024 * 1024), 2),
+            "idle_ttl_sec": self.idle_ttl_sec,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": dict(self.evictions),
+        }
+
+    def _enforce_limits(self, protect: Optional[str] = None) -> None:
+        """Evict least recently used sessions until within limits."""
+        while len(self._sessions) > self.max_sessions:
+            if not self._evict_lru(EvictionReason.CAPACITY, protect):
+                break
+
+        while self._total_bytes > self.memory_budget_bytes and len(self._sessions) > 1:
+            if not self._evict_lru(EvictionReason.MEMORY, protect):
+                break
+
+    def _evict_lru(self, reason: str, protect: Optional[str]) -> bool:
+        for game_id in self._sessions:
+            if game_id != protect:
+                self._evict(game_id, reason)
+                return True
+        return False
+
+    def _evict(self, game_id: str, reason: str) -> None:
+        session = self._sessions.pop(game_id, None)
+        if session is None:
+            return
+
+        self._total_bytes -= session.estimated_bytes
+        if reason not in (EvictionReason.REPLACED, EvictionReason.REMOVED):
+            self.evictions[reason] = self.evictions.get(reason, 0) + 1
+            logger.info(f"Evicted game {game_id[:8]}... ({reason})")
+
+        for hook in self._eviction_hooks:
+            try:
+                hook(session, reason)
+            except Exception as e:
+                logger.error(f"Eviction hook failed for game {game_id}: {e}", exc_info=True)
+
+
+# Global singleton instance
+_session_registry: Optional[GameSessionRegistry] = None
+
+
+def get_session_registry() -> GameSessionRegistry:
+    """Get the global GameSessionRegistry instance."""
+    global _session_registry
+    if _session_registry is None:
+        _session_registry = GameSessionRegistry()
+    return _session_registry
@@ -0,0 +1,138 @@
+"""
+Speech Pipeline - Sentence-pipelined TTS for streamed persona replies.
+
+Instead of waiting for the full reply and synthesising it in one call,
+the streamed text is split at sentence boundaries and every finished
+sentence is sent to ElevenLabs right away (in parallel, bounded by the
+VoiceService semaphore). Audio of the first sentence is therefore ready
+while the LLM is still generating the rest.
+
+Segments are emitted strictly in sentence order through an optional
+callback as soon as they (and all segments before them) are ready.
+The segments are MP3 streams, so the full reply's audio is simply their
+concatenation.
+"""
+
+import re
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from services.voice_service import VoiceService
+
+logger = logging.getLogger(__name__)
+
+# Sentence end: . ! ? … (optionally followed by closing quotes) + whitespace
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?…])["\'»“”]?\s+')
+
+# Very short sentences ("Yes.", "Well...") are merged with the next one -
+# one request per two words costs more than it saves
+MIN_SENTENCE_CHARS = 20
+
+# Receives (index, audio_bytes, sentence) in sentence order
+SegmentCallback = Callable[[int, bytes, str], Awaitable[None]]
+
+
+class SentenceSplitter:
+    """Incrementally splits streamed text into complete sentences."""
+
+    def __init__(self, min_chars: int = MIN_SENTENCE_CHARS):
+        self.min_chars = min_chars
+        self._buffer = ""
+
+    def feed(self, text: str) -> list[str]:
+        """Add streamed text, returning the sentences completed by it."""
+        self._buffer += text
+        sentences = []
+        start = 0
+        for match in SENTENCE_BOUNDARY.finditer(self._buffer):
+            sentence = self._buffer[start:match.end()].strip()
+            if len(sentence) >= self.min_chars:
+                sentences.append(sentence)
+                start = match.end()
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self) -> Optional[str]:
+        """Return the remaining text (the last, possibly unterminated sentence)."""
+        rest = self._buffer.strip()
+        self._buffer = ""
+        return rest or None
+
+
+class SpeechPipeline:
+    """Synthesises a streamed reply sentence by sentence."""
+
+    def __init__(
+        self,
+        voice_service: "VoiceService",
+        voice_id: str,
+        on_segment: Optional[SegmentCallback] = None
+    ):
+        self.voice_service = voice_service
+        self.voice_id = voice_id
+        self.on_segment = on_segment
+        self._splitter = SentenceSplitter()
+        self._sentences: list[str] = []
+        self._tasks: list[asyncio.Task] = []
+        # Segment indexes in order for the emitter, None when finished
+        self._pending: asyncio.Queue[Optional[int]] = asyncio.Queue()
+        self._emitter: Optional[asyncio.Task] = None
+
+        if on_segment:
+            self._emitter = asyncio.create_task(self._emit_in_order())
+
+    def feed(self, text: str) -> None:
+        """Add streamed reply text; finished sentences start synthesising immediately."""
+        for sentence in self._splitter.feed(text):
+            self._start(sentence)
+
+    async def finish(self) -> Optional[bytes]:
+        """
+        Synthesise the remaining text and wait for all segments.
+
+        Returns the full audio (all segments in order), or None if no
+        segment could be synthesised.
+        """
+        rest = self._splitter.flush()
+        if rest:
+            self._start(rest)
+        self._pending.put_nowait(None)
+
+        try:
+            segments = await asyncio.gather(*self._tasks)
+            if self._emitter:
+                await self._emitter
+        except asyncio.CancelledError:
+            self.cancel()
+            raise
+
+        audio = [segment for segment in segments if segment]
+        logger.info(f"Speech pipeline: {len(audio)}/{len(segments)} segments synthesised")
+        return b"".join(audio) if audio else None
+
+    def cancel(self) -> None:
+        """Abort all pending synthesis."""
+        for task in self._tasks:
+            task.cancel()
+        if self._emitter:
+            self._emitter.cancel()
+
+    def _start(self, sentence: str) -> None:
+        self._sentences.append(sentence)
+        self._tasks.append(asyncio.create_task(
+            self.voice_service.text_to_speech(sentence, self.voice_id)
+        ))
+        self._pending.put_nowait(len(self._tasks) - 1)
+
+    async def _emit_in_order(self) -> None:
+        while (index := await self._pending.get()) is not None:
+            try:
+                audio = await self._tasks[index]
+                if audio:
+                    await self.on_segment(index, audio, self._sentences[index])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Audio segment {index} could not be emitted: {e}")
@@ -0,0 +1,77 @@
+"""
+Token Usage - Prompt token accounting per LLM call type.
+
+OpenAI caches long prompt prefixes automatically; a cached prefix is
+billed cheaper and processed faster. Prompts are laid out so that the
+static, scenario-level part comes first, and this module records how
+many prompt tokens of each call were served from the cache (from the
+usage metadata of the response), so the hit rate shows up in /metrics.
+"""
+
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TokenUsageStats:
+    """Token counters for one call type."""
+
+    def __init__(self):
+        self.calls = 0
+        self.input_tokens = 0
+        self.cached_tokens = 0
+        self.output_tokens = 0
+
+    def record(self, input_tokens: int, cached_tokens: int, output_tokens: int) -> None:
+        self.calls += 1
+        self.input_tokens += input_tokens
+        self.cached_tokens += cached_tokens
+        self.output_tokens += output_tokens
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "input_tokens": self.input_tokens,
+            "cached_tokens": self.cached_tokens,
+            "uncached_tokens": self.input_tokens - self.cached_tokens,
+            "output_tokens": self.output_tokens,
+            "cache_hit_ratio": round(self.cached_tokens / self.input_tokens, 3) if self.input_tokens else 0.0,
+        }
+
+
+class TokenUsage:
+    """Named collection of TokenUsageStats."""
+
+    def __init__(self):
+        self._calls: dict[str, TokenUsageStats] = {}
+
+    def record(self, name: str, usage_metadata: Optional[dict]) -> None:
+        """Record the usage metadata of one response (no-op if the provider sent none)."""
+        if not usage_metadata:
+            return
+        input_tokens = usage_metadata.get("input_tokens", 0)
+        cached_tokens = (usage_metadata.get("input_token_details") or {}).get("cache_read", 0)
+        output_tokens = usage_metadata.get("output_tokens", 0)
+
+        stats = self._calls.get(name)
+        if stats is None:
+            stats = self._calls[name] = TokenUsageStats()
+        stats.record(input_tokens, cached_tokens, output_tokens)
+        logger.debug(f"{name}: {input_tokens} prompt tokens ({cached_tokens} cached), {output_tokens} output tokens")
+
+    def stats(self) -> dict:
+        """Counters of all call types (for /metrics)."""
+        return {name: stats.to_dict() for name, stats in sorted(self._calls.items())}
+
+
+# Global singleton instance
+_token_usage: Optional[TokenUsage] = None
+
+
+def get_token_usage() -> TokenUsage:
+    """Get the global TokenUsage instance."""
+    global _token_usage
+    if _token_usage is None:
+        _token_usage = TokenUsage()
+    return _token_usage
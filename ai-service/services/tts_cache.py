@@ -0,0 +1,243 @@
+"""
+TTS Cache - Content-addressed cache for synthesised audio.
+
+Default-scenario games use a fixed voice mapping, so the same short
+lines get synthesised over and over. Audio is cached by a hash of
+everything that determines the output (voice id, model id, language,
+voice settings and the normalised text) in two tiers:
+
+- memory: LRU bounded by TTS_CACHE_MEMORY_MB
+- disk: one file per entry in TTS_CACHE_DIR, bounded by TTS_CACHE_DISK_MB
+  (least recently used files are deleted first)
+
+Concurrent requests for the same key share a single upstream call.
+"""
+
+import os
+import re
+import json
+import asyncio
+import hashlib
+import logging
+import tempfile
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+TTS_CACHE_ENABLED = os.getenv("TTS_CACHE_ENABLED", "true").lower() == "true"
+TTS_CACHE_MEMORY_MB = float(os.getenv("TTS_CACHE_MEMORY_MB", "64"))
+TTS_CACHE_DISK_MB = float(os.getenv("TTS_CACHE_DISK_MB", "512"))
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", "data/tts_cache")
+
+
+def normalize_text(text: str) -> str:
+    """Normalise text so that irrelevant differences map to the same audio."""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+
+
+def make_cache_key(voice_id: str, model_id: str, language_code: str, settings: dict, text: str) -> str:
+    """Hash of everything that determines the synthesised audio."""
+    payload = json.dumps(
+        {
+            "voice_id": voice_id,
+            "model_id": model_id,
+            "language_code": language_code,
+            "settings": settings,
+            "text": normalize_text(text),
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """Two-tier (memory + disk) LRU cache for audio bytes."""
+
+    def __init__(
+        self,
+        memory_mb: float = TTS_CACHE_MEMORY_MB,
+        disk_mb: float = TTS_CACHE_DISK_MB,
+        cache_dir: str = TTS_CACHE_DIR
+    ):
+        self.memory_budget = int(memory_mb * 1024 * 1024)
+        self.disk_budget = int(disk_mb * 1024 * 1024)
+        self.cache_dir = Path(cache_dir)
+
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = 0
+        self._inflight: dict[str, asyncio.Future] = {}
+
+        # Counters
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.shared_hits = 0  # Waited for an identical in-flight request
+        self.misses = 0
+        self.bytes_saved = 0
+
+        if self.disk_budget > 0:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._disk_bytes = sum(path.stat().st_size for path in self.cache_dir.glob("*.mp3"))
+
+        logger.info(
+            f"TTSCache initialized: memory={memory_mb:.0f}MB, disk={disk_mb:.0f}MB "
+            f"({self._disk_bytes / (1024 * 1024):.1f}MB used) at {self.cache_dir}"
+        )
+
+    async def get_or_create(self, key: str, create: Callable[[], Awaitable[Optional[bytes]]]) -> Optional[bytes]:
+        """Return cached audio for `key`, or call `create` and cache its result."""
+        audio = self._memory_get(key)
+        if audio is not None:
+            self.memory_hits += 1
+            self.bytes_saved += len(audio)
+            return audio
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            audio = await asyncio.shield(inflight)
+            if audio is not None:
+                self.shared_hits += 1
+                self.bytes_saved += len(audio)
+            return audio
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            audio = await self._disk_get(key)
+            if audio is not None:
+                self.disk_hits += 1
+                self.bytes_saved += len(audio)
+                self._memory_put(key, audio)
+            else:
+                self.misses += 1
+                audio = await create()
+                if audio:
+                    self._memory_put(key, audio)
+                    await self._disk_put(key, audio)
+            future.set_result(audio)
+            return audio
+        except asyncio.CancelledError:
+            # The owner hit its deadline - waiters get no audio instead
+            future.set_result(None)
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters get the exception; don't warn if nobody was waiting
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    # === Memory tier ===
+
+    def _memory_get(self, key: str) -> Optional[bytes]:
+        audio = self._memory.get(key)
+        if audio is not None:
+            self._memory.move_to_end(key)
+        return audio
+
+    def _memory_put(self, key: str, audio: bytes) -> None:
+        if len(audio) > self.memory_budget:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old)
+        self._memory[key] = audio
+        self._memory_bytes += len(audio)
+        while self._memory_bytes > self.memory_budget:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    # === Disk tier ===
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.mp3"
+
+    async def _disk_get(self, key: str) -> Optional[bytes]:
+        if self.disk_budget <= 0:
+            return None
+        return await asyncio.to_thread(self._read_file, self._path(key))
+
+    async def _disk_put(self, key: str, audio: bytes) -> None:
+        if self.disk_budget <= 0 or len(audio) > self.disk_budget:
+            return
+        try:
+            written = await asyncio.to_thread(self._write_file, self._path(key), audio)
+            self._disk_bytes += written
+            if self._disk_bytes > self.disk_budget:
+                self._disk_bytes -= await asyncio.to_thread(self._evict_disk, self._disk_bytes - self.disk_budget)
+        except OSError as e:
+            logger.warning(f"Could not write TTS cache entry: {e}")
+
+    @staticmethod
+    def _read_file(path: Path) -> Optional[bytes]:
+        try:
+            audio = path.read_bytes()
+            os.utime(path)  # Mark as recently used
+            return audio
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _write_file(path: Path, audio: bytes) -> int:
+        if path.exists():
+            return 0
+        # Unique tmp file per writer (worker threads and processes share the directory)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f"{path.stem}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(audio)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        return len(audio)
+
+    def _evict_disk(self, bytes_to_free: int) -> int:
+        """Delete least recently used files until `bytes_to_free` is freed."""
+        files = sorted(self.cache_dir.glob("*.mp3"), key=lambda path: path.stat().st_mtime)
+        freed = 0
+        for path in files:
+            if freed >= bytes_to_free:
+                break
+            try:
+                size = path.stat().st_size
+                path.unlink()
+                freed += size
+            except FileNotFoundError:
+                continue
+        return freed
+
+    # === Metrics ===
+
+    def stats(self) -> dict:
+        """Counters for /metrics."""
+        hits = self.memory_hits + self.disk_hits + self.shared_hits
+        lookups = hits + self.misses
+        return {
+            "memory_entries": len(self._memory),
+            "memory_mb": round(self._memory_bytes / (1024 * 1024), 2),
+            "disk_mb": round(self._disk_bytes / (1024 * 1024), 2),
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+            "bytes_saved": self.bytes_saved,
+        }
+
+
+# Global singleton instance
+_tts_cache: Optional[TTSCache] = None
+
+
+def get_tts_cache() -> Optional[TTSCache]:
+    """Get the global TTSCache instance, or None if caching is disabled."""
+    global _tts_cache
+    if _tts_cache is None and TTS_CACHE_ENABLED:
+        _tts_cache = TTSCache()
+    return _tts_cache
@@ -2,16 +2,39 @@
 VoiceService - ElevenLabs Text-to-Speech Integration
 
 Manages voice assignment and audio generation for personas.
+
+Synthesis uses the async ElevenLabs client, so a TTS request never blocks
+the event loop (and with it every other game's chat). Concurrent calls
+are bounded by a semaphore and each call has a deadline.
 """
 
 import os
+import asyncio
 import logging
 import base64
 from typing import Optional
-from elevenlabs import ElevenLabs, VoiceSettings
+from elevenlabs import VoiceSettings
+
+from .client_registry import get_client_registry, ELEVENLABS_PLACEHOLDER_KEY
+from .tts_cache import get_tts_cache, make_cache_key
 
 logger = logging.getLogger(__name__)
 
+# Max parallel ElevenLabs requests (per process) and deadline per call,
+# including the time spent waiting for a free slot
+ELEVENLABS_MAX_CONCURRENCY = int(os.getenv("ELEVENLABS_MAX_CONCURRENCY", "4"))
+ELEVENLABS_TTS_DEADLINE_SEC = float(os.getenv("ELEVENLABS_TTS_DEADLINE_SEC", "25"))
+
+# Synthesis parameters (all part of the TTS cache key)
+TTS_MODEL_ID = "eleven_multilingual_v2"  # Multilingual model for better language support
+TTS_LANGUAGE_CODE = "en"  # English language for correct pronunciation
+TTS_VOICE_SETTINGS = VoiceSettings(
+    stability=0.5,
+    similarity_boost=0.75,
+    style=0.0,
+    use_speaker_boost=True
+)
+
 
 class VoiceService:
     """
@@ -25,20 +48,24 @@ class VoiceService:
     
     def __init__(self):
         self.api_key = os.getenv("ELEVENLABS_API_KEY")
-        self.enabled = bool(self.api_key and self.api_key != "sk_your_elevenlabs_api_key_here")
+        self.enabled = bool(self.api_key and self.api_key != ELEVENLABS_PLACEHOLDER_KEY)
         
         if not self.enabled:
             logger.warning("ElevenLabs API key not configured - voice generation disabled")
             self.client = None
         else:
             try:
-                self.client = ElevenLabs(api_key=self.api_key)
+                # Shared client with pooled keep-alive connections
+                self.client = get_client_registry().elevenlabs()
                 logger.info("ElevenLabs client initialized successfully")
             except Exception as e:
                 logger.error(f"Failed to initialize ElevenLabs client: {e}")
                 self.enabled = False
                 self.client = None
         
+        self._semaphore = asyncio.Semaphore(ELEVENLABS_MAX_CONCURRENCY)
+        self.cache = get_tts_cache() if self.enabled else None
+        
         # Load voice IDs from environment
         self.female_voices = [
             os.getenv("ELEVENLABS_VOICE_FEMALE_1", ""),
@@ -152,33 +179,51 @@ class VoiceService:
             return None
         
         try:
+            return await asyncio.wait_for(
+                self._cached_synthesize(text, voice_id),
+                timeout=ELEVENLABS_TTS_DEADLINE_SEC
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"Audio generation exceeded the {ELEVENLABS_TTS_DEADLINE_SEC:.1f}s deadline")
+            return None
+        except Exception as e:
+            logger.error(f"Failed to generate audio: {e}", exc_info=True)
+            return None
+    
+    async def _cached_synthesize(self, text: str, voice_id: str) -> Optional[bytes]:
+        """Look up the TTS cache before calling ElevenLabs."""
+        if self.cache is None:
+            return await self._synthesize(text, voice_id)
+        
+        key = make_cache_key(
+            voice_id=voice_id,
+            model_id=TTS_MODEL_ID,
+            language_code=TTS_LANGUAGE_CODE,
+            settings=TTS_VOICE_SETTINGS.dict(),
+            text=text
+        )
+        return await self.cache.get_or_create(key, lambda: self._synthesize(text, voice_id))
+    
+    async def _synthesize(self, text: str, voice_id: str) -> bytes:
+        """Stream the audio from ElevenLabs (bounded by the concurrency semaphore)."""
+        async with self._semaphore:
             logger.info(f"Generating audio for text (length: {len(text)}) with voice {voice_id[:20]}...")
             
             # Call ElevenLabs API
-            audio_generator = self.client.text_to_speech.convert(
+            audio_stream = self.client.text_to_speech.convert(
                 voice_id=voice_id,
                 text=text,
-                model_id="eleven_multilingual_v2",  # Multilingual model for better language support
-                language_code="en",  # English language for correct pronunciation
-                voice_settings=VoiceSettings(
-                    stability=0.5,
-                    similarity_boost=0.75,
-                    style=0.0,
-                    use_speaker_boost=True
-                )
+                model_id=TTS_MODEL_ID,
+                language_code=TTS_LANGUAGE_CODE,
+                voice_settings=TTS_VOICE_SETTINGS
             )
             
-            # Collect audio bytes
-            audio_bytes = b""
-            for chunk in audio_generator:
-                audio_bytes += chunk
+            # Collect chunks and assemble once (no quadratic bytes concatenation)
+            chunks = [chunk async for chunk in audio_stream]
+            audio_bytes = b"".join(chunks)
             
-            logger.info(f"Generated audio: {len(audio_bytes)} bytes")
+            logger.info(f"Generated audio: {len(audio_bytes)} bytes ({len(chunks)} chunks)")
             return audio_bytes
-            
-        except Exception as e:
-            logger.error(f"Failed to generate audio: {e}", exc_info=True)
-            return None
     
     def audio_to_base64(self, audio_bytes: bytes) -> str:
         """Convert audio bytes to base64 string for JSON transport"""
@@ -187,3 +232,15 @@ class VoiceService:
     def get_voice_for_persona(self, persona_slug: str, voice_assignments: dict[str, str]) -> Optional[str]:
         """Get the voice ID assigned to a persona"""
         return voice_assignments.get(persona_slug)
+
+
+# Singleton instance
+_voice_service: Optional[VoiceService] = None
+
+
+def get_voice_service() -> VoiceService:
+    """Get or create the singleton VoiceService instance."""
+    global _voice_service
+    if _voice_service is None:
+        _voice_service = VoiceService()
+    return _voice_service
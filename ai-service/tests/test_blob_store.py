@@ -0,0 +1,48 @@
+"""
+BlobStore writes run in worker threads (asyncio.to_thread): concurrent
+writes of the same content must all succeed and leave no tmp files behind.
+"""
+
+import asyncio
+import threading
+
+from services.blob_store import BlobStore
+
+WRITERS = 8
+ROUNDS = 50
+
+
+def test_concurrent_writes_of_same_content(tmp_path):
+    data = b"x" * 200_000
+    errors = []
+
+    for number in range(ROUNDS):
+        path = tmp_path / f"{number}.mp3"
+        start = threading.Barrier(WRITERS)
+
+        def write() -> None:
+            start.wait()
+            try:
+                BlobStore._write(path, data)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=write) for _ in range(WRITERS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert errors == []
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(f"{number}.mp3" for number in range(ROUNDS))
+    assert all(path.read_bytes() == data for path in tmp_path.iterdir())
+
+
+def test_put_after_purge_rewrites_blob(tmp_path):
+    store = BlobStore(str(tmp_path), ".png", ttl_sec=1)
+    blob_id = asyncio.run(store.put(b"bild"))
+    store._path(blob_id).unlink()  # Purged between puts
+
+    assert asyncio.run(store.put(b"bild")) == blob_id
+    assert asyncio.run(store.read(blob_id)) == b"bild"
+    assert (store.writes, store.deduplicated) == (2, 0)
@@ -0,0 +1,94 @@
+"""
+ClueMatcher: Unicode case folding, offsets into the original text,
+word boundaries and first().
+"""
+
+import pytest
+
+from agents.clue_matcher import ClueMatch, ClueMatcher
+
+
+def keywords_found(matcher: ClueMatcher, text: str) -> list[str]:
+    return [match.keyword for match in matcher.find_all(text)]
+
+
+def test_case_folding():
+    matcher = ClueMatcher(["Gästehaus", "strasse", "ÄRGER"])
+
+    assert keywords_found(matcher, "Wir trafen uns im GÄSTEHAUS.") == ["Gästehaus"]
+    assert keywords_found(matcher, "Er wohnt in der Bahnhofstraße.") == []
+    assert keywords_found(matcher, "In der Straße stand ein Wagen.") == ["strasse"]
+    assert keywords_found(matcher, "Das gab Ärger.") == ["ÄRGER"]
+
+
+def test_offsets_map_back_through_sharp_s():
+    matcher = ClueMatcher(["strasse", "gutachten"])
+    text = "Die Straße, dann das Gutachten."
+
+    matches = matcher.find_all(text)
+
+    assert matches == [ClueMatch("strasse", 4, 10), ClueMatch("gutachten", 21, 30)]
+    assert [text[match.start:match.end] for match in matches] == ["Straße", "Gutachten"]
+
+
+def test_offsets_are_exact_without_folding_expansion():
+    text = "Um 22:45 im Gästehaus"
+    match = ClueMatcher(["gästehaus"]).first(text)
+
+    assert text[match.start:match.end] == "Gästehaus"
+
+
+def test_whole_words_by_default():
+    matcher = ClueMatcher(["hand", "tat", "21:15"])
+
+    assert keywords_found(matcher, "Mein Handy lag auf dem Tisch.") == []
+    assert keywords_found(matcher, "Ein Zitat aus dem Brief.") == []
+    assert keywords_found(matcher, "Er hatte Blut an der Hand.") == ["hand"]
+    assert keywords_found(matcher, "Die Tat geschah um 21:15.") == ["tat", "21:15"]
+
+
+def test_any_ending_suffix_allows_inflected_forms():
+    matcher = ClueMatcher(["gästehaus*", "e-mail*", "hand"])
+
+    assert keywords_found(matcher, "Die Tür des Gästehauses war offen.") == ["gästehaus"]
+    assert keywords_found(matcher, "Ich habe zwei E-Mails bekommen.") == ["e-mail"]
+    assert keywords_found(matcher, "Das Handy klingelte.") == []
+    # Still needs a word start
+    assert keywords_found(matcher, "Das Hauptgästehaus brannte.") == []
+
+
+@pytest.mark.parametrize("mode, expected", [
+    ("both", []),
+    ("start", ["hand"]),
+    ("off", ["hand", "hand"]),
+])
+def test_boundary_modes(mode, expected):
+    matcher = ClueMatcher(["hand"], word_boundaries=mode)
+
+    assert keywords_found(matcher, "Sein Handy, seine Vorhand.") == expected
+
+
+def test_invalid_boundary_mode():
+    with pytest.raises(ValueError):
+        ClueMatcher(["hand"], word_boundaries="sometimes")
+
+
+def test_first_returns_earliest_ending_match():
+    matcher = ClueMatcher(["gutachten", "fälschung", "fälschungen"])
+    text = "Die Fälschungen und das Gutachten."
+
+    assert matcher.first(text) == ClueMatch("fälschungen", 4, 15)
+    assert matcher.first("Nichts Verdächtiges.") is None
+
+
+def test_overlapping_keywords_ordered_by_position():
+    matcher = ClueMatcher(["streit am freitag", "freitag", "streit"], word_boundaries="off")
+
+    assert keywords_found(matcher, "Der Streit am Freitag.") == ["streit am freitag", "streit", "freitag"]
+
+
+def test_duplicate_and_empty_keywords_are_ignored():
+    matcher = ClueMatcher(["Gutachten", "gutachten", "GUTACHTEN*", "", "   "])
+
+    assert len(matcher) == 1
+    assert matcher.keywords == ["Gutachten"]
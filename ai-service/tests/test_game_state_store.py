@@ -0,0 +1,92 @@
+"""
+Game state stores are called from worker threads (asyncio.to_thread):
+concurrent update() calls must never lose a merge, and the in-memory
+store must stay consistent while other threads write.
+"""
+
+import threading
+import time
+
+import pytest
+
+from services.game_state_store import InMemoryGameStateStore, SQLiteGameStateStore
+
+THREADS = 8
+UPDATES_PER_THREAD = 50
+GAME_ID = "game-1"
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return InMemoryGameStateStore()
+    return SQLiteGameStateStore(str(tmp_path / "game_states.db"))
+
+
+def run_threads(target, count: int = THREADS) -> None:
+    start = threading.Barrier(count)
+
+    def run(index: int) -> None:
+        start.wait()
+        target(index)
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_concurrent_updates_lose_no_merge(store):
+    # Large state, so a copy takes long enough for threads to interleave
+    store.save(GAME_ID, {"revealed_clues": [], "padding": ["x" * 100] * 500})
+
+    def update(index: int) -> None:
+        for number in range(UPDATES_PER_THREAD):
+            clue = f"{index}-{number}"
+            store.update(
+                GAME_ID,
+                lambda state: state.__setitem__("revealed_clues", state["revealed_clues"] + [clue]),
+                max_attempts=10_000
+            )
+
+    run_threads(update)
+
+    state = store.load(GAME_ID)
+    assert len(state["revealed_clues"]) == THREADS * UPDATES_PER_THREAD
+    assert len(set(state["revealed_clues"])) == THREADS * UPDATES_PER_THREAD
+    assert state["state_version"] == 1 + THREADS * UPDATES_PER_THREAD
+
+
+def test_concurrent_appends_and_purges(store):
+    errors = []
+
+    def work(index: int) -> None:
+        try:
+            if index % 2:
+                for number in range(UPDATES_PER_THREAD):
+                    game_id = f"game-{index}-{number}"
+                    store.save_scenario(game_id, {"name": game_id})
+                    store.append_messages(game_id, [{"role": "user", "content": "Hallo"}])
+            else:
+                deadline = time.monotonic() + 0.2
+                while time.monotonic() < deadline:
+                    store.purge_older_than(3600)
+        except Exception as e:
+            errors.append(e)
+
+    run_threads(work)
+
+    assert errors == []
+    assert all(store.message_count(f"game-{index}-0") == 1 for index in range(1, THREADS, 2))
+
+
+def test_scenario_keeps_its_expiry(store):
+    store.save_scenario(GAME_ID, {"name": "Villa Sonnenhof"}, expires_at=1_900_000_000.0)
+    store.save_scenario("game-2", {"name": "Ohne Ablauf"})
+
+    stored = store.load_scenario(GAME_ID)
+    assert stored.scenario == {"name": "Villa Sonnenhof"}
+    assert stored.expires_at == 1_900_000_000.0
+    assert store.load_scenario("game-2").expires_at is None
+    assert store.load_scenario("unknown") is None
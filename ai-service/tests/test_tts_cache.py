@@ -0,0 +1,37 @@
+"""
+TTSCache writes its disk tier from worker threads: concurrent writes of the
+same key must all succeed and leave no tmp files behind.
+"""
+
+import threading
+
+from services.tts_cache import TTSCache
+
+WRITERS = 8
+ROUNDS = 50
+
+
+def test_concurrent_writes_of_same_key(tmp_path):
+    audio = b"x" * 200_000
+    errors = []
+
+    for number in range(ROUNDS):
+        path = tmp_path / f"{number}.mp3"
+        start = threading.Barrier(WRITERS)
+
+        def write() -> None:
+            start.wait()
+            try:
+                TTSCache._write_file(path, audio)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=write) for _ in range(WRITERS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert errors == []
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(f"{number}.mp3" for number in range(ROUNDS))
+    assert all(path.read_bytes() == audio for path in tmp_path.iterdir())
@@ -0,0 +1,101 @@
+"""
+VoiceService synthesis must not block the event loop, and parallel
+ElevenLabs calls must stay within ELEVENLABS_MAX_CONCURRENCY.
+"""
+
+import asyncio
+import time
+
+from services import voice_service as voice_module
+from services.voice_service import VoiceService
+
+CHUNKS_PER_CALL = 5
+CHUNK_DELAY_SEC = 0.02
+TICK_SEC = 0.01
+MAX_LOOP_STALL_SEC = 0.05
+
+
+class FakeTextToSpeech:
+    """Async ElevenLabs text_to_speech API that yields chunks slowly."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.calls = 0
+
+    def convert(self, voice_id, text, **kwargs):
+        async def stream():
+            self.calls += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            try:
+                for index in range(CHUNKS_PER_CALL):
+                    await asyncio.sleep(CHUNK_DELAY_SEC)
+                    yield f"{text}:{index};".encode()
+            finally:
+                self.in_flight -= 1
+
+        return stream()
+
+
+class FakeElevenLabs:
+    def __init__(self):
+        self.text_to_speech = FakeTextToSpeech()
+
+
+def make_service() -> VoiceService:
+    """A VoiceService on the fake client (no TTS cache, no API key needed)."""
+    service = VoiceService()
+    service.enabled = True
+    service.cache = None
+    service.client = FakeElevenLabs()
+    return service
+
+
+async def run_with_ticker(coro) -> tuple[object, float]:
+    """Run `coro` next to a 10ms ticker; returns its result and the longest loop stall."""
+    stalls = []
+    done = asyncio.Event()
+
+    async def ticker():
+        last = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(TICK_SEC)
+            now = time.perf_counter()
+            stalls.append(now - last - TICK_SEC)
+            last = now
+
+    ticker_task = asyncio.create_task(ticker())
+    try:
+        result = await coro
+    finally:
+        done.set()
+        await ticker_task
+    return result, max(stalls)
+
+
+def test_synthesis_keeps_event_loop_responsive():
+    async def scenario():
+        service = make_service()
+        calls = [service.text_to_speech(f"sentence {i}", "voice") for i in range(3 * voice_module.ELEVENLABS_MAX_CONCURRENCY)]
+        return service, await run_with_ticker(asyncio.gather(*calls))
+
+    service, (results, max_stall) = asyncio.run(scenario())
+
+    assert all(audio and audio.startswith(b"sentence") for audio in results)
+    assert max_stall < MAX_LOOP_STALL_SEC, f"event loop stalled for {max_stall * 1000:.0f}ms"
+
+
+def test_parallel_upstream_calls_stay_within_semaphore_limit():
+    async def scenario():
+        service = make_service()
+        calls = [service.text_to_speech(f"sentence {i}", "voice") for i in range(3 * voice_module.ELEVENLABS_MAX_CONCURRENCY)]
+        await asyncio.gather(*calls)
+        return service.client.text_to_speech
+
+    tts = asyncio.run(scenario())
+
+    assert tts.calls == 3 * voice_module.ELEVENLABS_MAX_CONCURRENCY
+    assert tts.peak_in_flight <= voice_module.ELEVENLABS_MAX_CONCURRENCY
+    # Calls do run in parallel up to the limit
+    assert tts.peak_in_flight == min(tts.calls, voice_module.ELEVENLABS_MAX_CONCURRENCY)
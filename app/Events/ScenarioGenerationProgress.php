@@ -33,6 +33,8 @@ class ScenarioGenerationProgress implements ShouldBroadcastNow
 
     public const STAGE_ERROR = 'error';
 
+    public const STAGE_NOTES_UPDATED = 'notes_updated';
+
     public function __construct(
         public string $gameId,
         public string $stage,
@@ -8,6 +8,7 @@
 use Illuminate\Http\JsonResponse;
 use Illuminate\Http\Request;
 use Illuminate\Support\Facades\Log;
+use Illuminate\Support\Facades\Validator;
 
 /**
  * Internal endpoint for receiving logs from AI service
@@ -36,4 +37,52 @@ public function store(Request $request): JsonResponse
 
         return response()->json(["ok" => true]);
     }
+
+    /**
+     * Receive a batch of log entries from AI service
+     */
+    public function storeBatch(Request $request): JsonResponse
+    {
+        $validated = $request->validate([
+            "entries" => "required|array|max:500",
+            "dropped" => "nullable|integer|min:0",
+        ]);
+
+        // Validate entries one by one, so a single bad entry doesn't cost the whole batch
+        $logged = 0;
+        $rejected = 0;
+        foreach ($validated["entries"] as $entry) {
+            $entryValidator = Validator::make(is_array($entry) ? $entry : [], [
+                "level" => "required|in:debug,info,warning,error",
+                "message" => "required|string|max:1000",
+                "context" => "nullable|array",
+            ]);
+            if ($entryValidator->fails()) {
+                $rejected++;
+                continue;
+            }
+
+            $context = $entry["context"] ?? [];
+            $context["source"] = "ai-service";
+
+            Log::channel("game")->log($entry["level"], $entry["message"], $context);
+            $logged++;
+        }
+
+        if ($rejected > 0) {
+            Log::channel("game")->warning("AI service sent invalid log entries", [
+                "source" => "ai-service",
+                "rejected" => $rejected,
+            ]);
+        }
+
+        if (($validated["dropped"] ?? 0) > 0) {
+            Log::channel("game")->warning("AI service dropped log entries", [
+                "source" => "ai-service",
+                "dropped" => $validated["dropped"],
+            ]);
+        }
+
+        return response()->json(["ok" => true, "count" => $logged, "rejected" => $rejected]);
+    }
 }
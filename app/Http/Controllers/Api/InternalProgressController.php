@@ -22,7 +22,7 @@ public function broadcast(Request $request): JsonResponse
     {
         $validated = $request->validate([
             'game_id' => 'required|string|uuid',
-            'stage' => 'required|string|in:started,generating_scenario,scenario_complete,generating_personas,persona_complete,generating_images,initializing_game,complete,error',
+            'stage' => 'required|string|in:started,generating_scenario,scenario_complete,generating_personas,persona_complete,generating_images,initializing_game,complete,error,notes_updated',
             'progress' => 'required|integer|min:0|max:100',
             'message' => 'required|string|max:500',
             'persona_name' => 'nullable|string|max:100',
@@ -8,6 +8,7 @@
 use App\Models\PromptTemplate;
 use Dedoc\Scramble\Attributes\Group;
 use Illuminate\Http\JsonResponse;
+use Illuminate\Http\Request;
 
 /**
  * API-Endpunkte für Prompt-Templates (AI-Service intern)
@@ -61,12 +62,17 @@ public function show(string $key): JsonResponse
      * Alle Prompts als Key-Body-Map
      *
      * Optimierter Endpunkt für den AI-Service. Gibt alle Prompts
-     * als einfaches Key→Body Dictionary zurück.
+     * als einfaches Key→Body Dictionary zurück. Mit ETag: Bei passendem
+     * If-None-Match antwortet der Endpunkt mit 304 ohne Body.
      *
      * @operationId getAllPromptsMap
      */
-    public function all(): JsonResponse
+    public function all(Request $request): JsonResponse
     {
-        return response()->json(PromptTemplate::getAllAsArray());
+        $response = response()->json(PromptTemplate::getAllAsArray());
+        $response->setEtag(md5((string) $response->getContent()));
+        $response->isNotModified($request);
+
+        return $response;
     }
 }
@@ -11,6 +11,7 @@
 use Dedoc\Scramble\Attributes\Group;
 use Illuminate\Http\JsonResponse;
 use Illuminate\Http\Request;
+use Illuminate\Support\Facades\DB;
 use Illuminate\Support\Facades\Log;
 use Illuminate\Support\Str;
 use Inertia\Inertia;
@@ -124,7 +125,8 @@ public function generateAndStart(Request $request): JsonResponse
             $scenarioResult = $this->aiService->generateScenario(
                 $game->id,
                 $validated['user_input'] ?? '',
-                $validated['difficulty']
+                $validated['difficulty'],
+                $game->expires_at
             );
 
             // Initialize game with generated scenario
@@ -171,7 +173,7 @@ public function generateAndStart(Request $request): JsonResponse
                 'timeline' => $gameInfo['timeline'] ?? '',
                 'personas' => $gameInfo['personas'],
                 'intro_message' => $gameInfo['intro_message'],
-                'crime_scene_images' => $scenarioResult['crime_scene_images'] ?? [],
+                'crime_scene_image_ids' => $scenarioResult['crime_scene_image_ids'] ?? [],
             ]);
         } catch (\Exception $e) {
             $duration = round(microtime(true) - $startTime, 2);
@@ -210,7 +212,7 @@ public function quickStart(Request $request): JsonResponse
 
         try {
             // Load default scenario instantly (no AI generation)
-            $gameInfo = $this->aiService->quickStartScenario($game->id);
+            $gameInfo = $this->aiService->quickStartScenario($game->id, $game->expires_at);
 
             $this->log('info', 'Game started', [
                 'game_id' => $game->id,
@@ -227,7 +229,7 @@ public function quickStart(Request $request): JsonResponse
                 'timeline' => $gameInfo['timeline'] ?? '',
                 'personas' => $gameInfo['personas'],
                 'intro_message' => $gameInfo['intro_message'],
-                'crime_scene_images' => $gameInfo['crime_scene_images'] ?? [],
+                'crime_scene_image_ids' => $gameInfo['crime_scene_image_ids'] ?? [],
             ]);
         } catch (\Exception $e) {
             $this->log('error', 'Quick start failed', [
@@ -314,33 +316,27 @@ public function chat(Request $request): JsonResponse
         }
 
         // Save user message
-        ChatMessage::create([
+        $userMessage = ChatMessage::create([
             'game_id' => $game->id,
             'persona_slug' => null,
             'content' => $validated['message'],
         ]);
 
-        // Get chat history for this persona
-        $chatHistory = $game->messages()
-            ->where(function ($query) use ($validated) {
-                $query->whereNull('persona_slug')
-                    ->orWhere('persona_slug', $validated['persona_slug']);
-            })
-            ->get()
-            ->map(fn (ChatMessage $msg) => [
-                'role' => $msg->isUserMessage() ? 'user' : 'assistant',
-                'content' => $msg->content,
-            ])
-            ->toArray();
-
         try {
             $response = $this->aiService->chat(
                 $game->id,
                 $validated['persona_slug'],
                 $validated['message'],
-                $chatHistory
+                $game->turn_seq,
+                $game->notes_cursor,
+                fn () => $this->transcript($game, $userMessage)
             );
 
+            // Only move forward, a slower concurrent turn may answer last
+            Game::whereKey($game->id)
+                ->where('turn_seq', '<', $response['turn_seq'])
+                ->update(['turn_seq' => $response['turn_seq']]);
+
             // Save persona response
             $chatMessage = ChatMessage::create([
                 'game_id' => $game->id,
@@ -362,21 +358,21 @@ public function chat(Request $request): JsonResponse
                 ]);
             }
 
-            // Update auto_notes (grouped by persona)
+            // Update auto_notes (grouped by persona); the AI service only returns notes after notes_cursor
             $newAutoNotes = $response['new_auto_notes'] ?? [];
-            $allAutoNotes = $response['all_auto_notes'] ?? [];
+            $notesDelta = $response['all_auto_notes'] ?? [];
 
             // DEBUG: Log the auto notes from AI service response
             $this->log('debug', 'Auto notes from AI service', [
                 'game_id' => $game->id,
                 'new_auto_notes_count' => count($newAutoNotes),
-                'all_auto_notes_keys' => array_keys($allAutoNotes),
-                'all_auto_notes_sample' => json_encode(array_slice($allAutoNotes, 0, 1)),
+                'notes_delta_keys' => array_keys($notesDelta),
+                'notes_cursor' => $response['notes_cursor'] ?? 0,
             ]);
 
-            if (! empty($allAutoNotes)) {
-                $game->update(['auto_notes' => $allAutoNotes]);
+            $allAutoNotes = $this->mergeAutoNotes($game, $notesDelta, $response['notes_cursor'] ?? 0);
 
+            if (! empty($notesDelta)) {
                 $this->log('info', 'Auto notes updated', [
                     'game_id' => $game->id,
                     'persona' => $validated['persona_slug'],
@@ -391,7 +387,9 @@ public function chat(Request $request): JsonResponse
                 'revealed_clue' => $response['revealed_clue'] ?? null,
                 'new_auto_notes' => $newAutoNotes,
                 'all_auto_notes' => $allAutoNotes,
-                'audio_base64' => $response['audio_base64'] ?? null,
+                'audio_url' => ! empty($response['audio_id'])
+                    ? route('game.audio', ['audioId' => $response['audio_id']], false)
+                    : null,
                 'voice_id' => $response['voice_id'] ?? null,
             ]);
         } catch (\Exception $e) {
@@ -408,6 +406,58 @@ public function chat(Request $request): JsonResponse
         }
     }
 
+    /**
+     * Append auto-notes after the stored cursor and move the cursor forward
+     *
+     * Runs under a row lock: concurrent turns may return the same notes.
+     *
+     * @param  array<string, array<int, array>>  $notesDelta  Notes after games.notes_cursor, grouped by persona
+     * @return array<string, array<int, array>> All notes of the game
+     */
+    private function mergeAutoNotes(Game $game, array $notesDelta, int $notesCursor): array
+    {
+        return DB::transaction(function () use ($game, $notesDelta, $notesCursor) {
+            $locked = Game::whereKey($game->id)->lockForUpdate()->firstOrFail();
+
+            if ($notesCursor <= $locked->notes_cursor) {
+                return $locked->auto_notes ?? [];
+            }
+
+            // Games from before the cursor still hold a full snapshot, which the first delta (since 0) replaces
+            $notes = $locked->notes_cursor > 0 ? ($locked->auto_notes ?? []) : [];
+
+            foreach ($notesDelta as $personaSlug => $personaNotes) {
+                foreach ($personaNotes as $note) {
+                    if (($note['seq'] ?? 0) > $locked->notes_cursor) {
+                        $notes[$personaSlug][] = $note;
+                    }
+                }
+            }
+
+            $locked->update(['auto_notes' => $notes, 'notes_cursor' => $notesCursor]);
+
+            return $notes;
+        });
+    }
+
+    /**
+     * Full chat transcript of a game before the given message (to resync the AI service)
+     *
+     * @return array<int, array{role: string, persona_slug: ?string, content: string}>
+     */
+    private function transcript(Game $game, ChatMessage $before): array
+    {
+        return $game->messages()
+            ->whereKeyNot($before->getKey())
+            ->get()
+            ->map(fn (ChatMessage $msg) => [
+                'role' => $msg->isUserMessage() ? 'user' : 'assistant',
+                'persona_slug' => $msg->persona_slug,
+                'content' => $msg->content,
+            ])
+            ->toArray();
+    }
+
     /**
      * Get chat history for a game
      */
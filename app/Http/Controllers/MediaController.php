@@ -0,0 +1,89 @@
+<?php
+
+declare(strict_types=1);
+
+namespace App\Http\Controllers;
+
+use App\Services\AiService;
+use Dedoc\Scramble\Attributes\Group;
+use Illuminate\Http\Client\ConnectionException;
+use Illuminate\Http\Client\Response as ClientResponse;
+use Illuminate\Http\Request;
+use Illuminate\Support\Facades\Log;
+use Symfony\Component\HttpFoundation\StreamedResponse;
+
+/**
+ * Medien-Endpunkte (Audio und Bilder, vom AI-Service durchgereicht)
+ */
+#[Group('Game')]
+class MediaController extends Controller
+{
+    /**
+     * Headers passed from the AI service to the browser
+     */
+    private const FORWARDED_HEADERS = [
+        'Content-Type',
+        'Content-Length',
+        'Content-Range',
+        'Accept-Ranges',
+        'Cache-Control',
+        'ETag',
+        'Last-Modified',
+    ];
+
+    public function __construct(
+        private readonly AiService $aiService
+    ) {}
+
+    /**
+     * Audio einer Persona-Antwort abrufen (MP3, unterstützt Range-Requests)
+     */
+    public function audio(Request $request, string $audioId): StreamedResponse
+    {
+        try {
+            return $this->stream($this->aiService->getAudio($audioId, $request->header('Range')));
+        } catch (ConnectionException $e) {
+            abort(503, 'AI Service unavailable');
+        }
+    }
+
+    /**
+     * Tatort-Foto abrufen (PNG, unveränderlich)
+     */
+    public function image(string $imageId): StreamedResponse
+    {
+        try {
+            return $this->stream($this->aiService->getImage($imageId));
+        } catch (ConnectionException $e) {
+            abort(503, 'AI Service unavailable');
+        }
+    }
+
+    /**
+     * Stream an AI service media response to the browser without buffering it
+     */
+    private function stream(ClientResponse $upstream): StreamedResponse
+    {
+        if (! in_array($upstream->status(), [200, 206, 304, 404, 416], true)) {
+            Log::channel('game')->warning('Media request to AI service failed', [
+                'status_code' => $upstream->status(),
+            ]);
+        }
+
+        $headers = [];
+        foreach (self::FORWARDED_HEADERS as $name) {
+            if ($upstream->header($name) !== '') {
+                $headers[$name] = $upstream->header($name);
+            }
+        }
+
+        $body = $upstream->toPsrResponse()->getBody();
+
+        return response()->stream(function () use ($body) {
+            while (! $body->eof()) {
+                echo $body->read(64 * 1024);
+                flush();
+            }
+        }, $upstream->status(), $headers);
+    }
+}
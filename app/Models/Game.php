@@ -20,6 +20,8 @@ class Game extends Model
         'status',
         'revealed_clues',
         'auto_notes',
+        'turn_seq',
+        'notes_cursor',
         'game_state',
         'accused_persona',
         'expires_at',
@@ -30,6 +32,8 @@ protected function casts(): array
         return [
             'revealed_clues' => 'array',
             'auto_notes' => 'array',
+            'turn_seq' => 'integer',
+            'notes_cursor' => 'integer',
             'game_state' => 'array',
             'expires_at' => 'datetime',
         ];
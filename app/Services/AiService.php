@@ -4,7 +4,9 @@
 
 namespace App\Services;
 
+use Carbon\CarbonInterface;
 use Illuminate\Http\Client\ConnectionException;
+use Illuminate\Http\Client\Response;
 use Illuminate\Support\Facades\Http;
 use Illuminate\Support\Facades\Log;
 use RuntimeException;
@@ -51,7 +53,12 @@ public function isHealthy(): bool
     /**
      * Generate a new scenario
      */
-    public function generateScenario(string $gameId, string $userInput = '', string $difficulty = 'mittel'): array
+    public function generateScenario(
+        string $gameId,
+        string $userInput = '',
+        string $difficulty = 'mittel',
+        ?CarbonInterface $expiresAt = null
+    ): array
     {
         $this->log('info', 'Generating scenario', [
             'game_id' => $gameId,
@@ -66,6 +73,8 @@ public function generateScenario(string $gameId, string $userInput = '', string
                 'game_id' => $gameId,
                 'user_input' => $userInput,
                 'difficulty' => $difficulty,
+                'expires_at' => $expiresAt?->toIso8601String(), // AI service drops the game then
+                'image_delivery' => 'url', // Images are fetched separately (getImage)
             ]);
 
         $duration = round((microtime(true) - $startTime) * 1000);
@@ -90,13 +99,15 @@ public function generateScenario(string $gameId, string $userInput = '', string
     /**
      * Quick start with default pre-made scenario (no AI generation, but images are generated)
      */
-    public function quickStartScenario(string $gameId): array
+    public function quickStartScenario(string $gameId, ?CarbonInterface $expiresAt = null): array
     {
         $this->log('info', 'Quick start scenario', ['game_id' => $gameId]);
 
         $response = Http::timeout(60) // Longer timeout for image generation
             ->post("{$this->baseUrl}/scenario/quick-start", [
                 'game_id' => $gameId,
+                'expires_at' => $expiresAt?->toIso8601String(), // AI service drops the game then
+                'image_delivery' => 'url', // Images are fetched separately (getImage)
             ]);
 
         if (! $response->ok()) {
@@ -138,29 +149,56 @@ public function startGame(string $gameId): array
     /**
      * Send a chat message to a persona
      *
-     * @param  array<int, array{role: string, content: string}>  $chatHistory
+     * `$turnSeq` is the transcript seq from the last response. `$transcript` is
+     * only called when the AI service lost track of the transcript (409) and
+     * returns the full game history before this message. `$notesSince` is the
+     * notes cursor from the last response; only newer auto-notes are returned.
+     *
+     * @param  callable(): array<int, array{role: string, persona_slug: ?string, content: string}>  $transcript
      */
     public function chat(
         string $gameId,
         string $personaSlug,
         string $message,
-        array $chatHistory = []
+        int $turnSeq,
+        int $notesSince,
+        callable $transcript
     ): array {
         $this->log('debug', 'Chat request', [
             'game_id' => $gameId,
             'persona' => $personaSlug,
-            'history_count' => count($chatHistory),
+            'turn_seq' => $turnSeq,
         ]);
 
         $startTime = microtime(true);
 
-        $response = Http::timeout(60)
-            ->post("{$this->baseUrl}/chat", [
+        // The AI service keeps the transcript; only the new message is sent
+        $payload = [
+            'game_id' => $gameId,
+            'persona_slug' => $personaSlug,
+            'message' => $message,
+            'turn_seq' => $turnSeq,
+            'notes_since' => $notesSince,
+            'audio_delivery' => 'url', // Audio is fetched separately (getAudio)
+        ];
+
+        $response = Http::timeout(60)->post("{$this->baseUrl}/chat", $payload);
+
+        if ($response->status() === 409 && $response->json('detail.error') === 'transcript_out_of_sync') {
+            $chatHistory = $transcript();
+
+            $this->log('warning', 'Chat transcript out of sync, resending history', [
                 'game_id' => $gameId,
-                'persona_slug' => $personaSlug,
-                'message' => $message,
+                'turn_seq' => $turnSeq,
+                'server_seq' => $response->json('detail.server_seq'),
+                'history_count' => count($chatHistory),
+            ]);
+
+            $response = Http::timeout(60)->post("{$this->baseUrl}/chat", [
+                ...$payload,
                 'chat_history' => $chatHistory,
             ]);
+        }
 
         $duration = round((microtime(true) - $startTime) * 1000);
 
@@ -281,4 +319,25 @@ public function getHint(string $gameId): array
 
         return $result;
     }
+
+    /**
+     * Open the synthesised audio of a chat reply as a stream (MP3, Range requests are passed on)
+     */
+    public function getAudio(string $audioId, ?string $range = null): Response
+    {
+        return Http::timeout(30)
+            ->withOptions(['stream' => true])
+            ->withHeaders(array_filter(['Range' => $range]))
+            ->get("{$this->baseUrl}/audio/{$audioId}");
+    }
+
+    /**
+     * Open a generated crime scene image as a stream (PNG)
+     */
+    public function getImage(string $imageId): Response
+    {
+        return Http::timeout(30)
+            ->withOptions(['stream' => true])
+            ->get("{$this->baseUrl}/images/{$imageId}");
+    }
 }
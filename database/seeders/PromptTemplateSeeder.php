@@ -83,8 +83,6 @@ private function getPersonaSystemPrompt(): string
 5. When asked about other people, use your knowledge about them
 6. You do NOT know who the murderer is (unless you are the murderer yourself)
 7. Only answer what is asked, don't proactively tell everything
-
-{stress_modifier}
 PROMPT;
     }
 
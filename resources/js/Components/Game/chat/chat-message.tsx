@@ -28,7 +28,7 @@ export function ChatMessage({
     onPlayAudio,
 }: ChatMessageProps) {
     const isUser = message.is_user;
-    const hasAudio = !!message.audio_base64;
+    const hasAudio = !!message.audio_url;
 
     return (
         <div
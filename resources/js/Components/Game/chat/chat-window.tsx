@@ -103,8 +103,8 @@ export function ChatWindow({
                                     onPin={() => onPinMessage(messageId)}
                                     onSave={() => onSaveToNotes(messageId, message.content, persona.name)}
                                     onPlayAudio={
-                                        message.audio_base64
-                                            ? () => audioActions.toggle(messageId, message.audio_base64!)
+                                        message.audio_url
+                                            ? () => audioActions.toggle(messageId, message.audio_url!)
                                             : undefined
                                     }
                                 />
@@ -240,9 +240,9 @@ export function GameLayoutV1({
                                                             >
                                                                 <Save className="w-3 h-3" />
                                                             </button>
-                                                            {message.audio_base64 && (
+                                                            {message.audio_url && (
                                                                 <button
-                                                                    onClick={() => audioActions.toggle(messageId, message.audio_base64!)}
+                                                                    onClick={() => audioActions.toggle(messageId, message.audio_url!)}
                                                                     className={cn(
                                                                         "p-1 rounded hover:bg-zinc-800",
                                                                         isPlaying ? "text-red-500" : "text-zinc-600"
@@ -331,9 +331,9 @@ export function GameLayoutV2({
                                                             >
                                                                 <Save className="w-3 h-3" />
                                                             </button>
-                                                            {message.audio_base64 && (
+                                                            {message.audio_url && (
                                                                 <button
-                                                                    onClick={() => audioActions.toggle(messageId, message.audio_base64!)}
+                                                                    onClick={() => audioActions.toggle(messageId, message.audio_url!)}
                                                                     className={cn(
                                                                         "p-1 rounded hover:bg-amber-200/50",
                                                                         isPlaying ? "text-red-600" : "text-zinc-500"
@@ -253,9 +253,9 @@ export function GameLayoutV3({
                                                             >
                                                                 <Save className="w-3.5 h-3.5" />
                                                             </button>
-                                                            {message.audio_base64 && (
+                                                            {message.audio_url && (
                                                                 <button
-                                                                    onClick={() => audioActions.toggle(messageId, message.audio_base64!)}
+                                                                    onClick={() => audioActions.toggle(messageId, message.audio_url!)}
                                                                     className={cn(
                                                                         "p-1.5 rounded-lg hover:bg-zinc-800 transition-colors",
                                                                         isPlaying ? "text-red-500" : "text-zinc-600 hover:text-zinc-400"
@@ -6,18 +6,17 @@ interface AudioPlayerState {
 }
 
 interface AudioPlayerActions {
-    play: (messageId: string, audioBase64: string) => void;
+    play: (messageId: string, audioUrl: string) => void;
     stop: () => void;
-    toggle: (messageId: string, audioBase64: string) => void;
+    toggle: (messageId: string, audioUrl: string) => void;
 }
 
 /**
- * Hook for managing audio playback from base64 encoded audio
+ * Hook for managing audio playback from audio URLs (streamed by the browser)
  */
 export function useAudioPlayer(): [AudioPlayerState, AudioPlayerActions] {
     const [playingMessageId, setPlayingMessageId] = useState<string | null>(null);
     const audioRef = useRef<HTMLAudioElement | null>(null);
-    const urlRef = useRef<string | null>(null);
 
     // Cleanup function
     const cleanup = useCallback(() => {
@@ -25,10 +24,6 @@ export function useAudioPlayer(): [AudioPlayerState, AudioPlayerActions] {
             audioRef.current.pause();
             audioRef.current = null;
         }
-        if (urlRef.current) {
-            URL.revokeObjectURL(urlRef.current);
-            urlRef.current = null;
-        }
         setPlayingMessageId(null);
     }, []);
 
@@ -37,23 +32,13 @@ export function useAudioPlayer(): [AudioPlayerState, AudioPlayerActions] {
         cleanup();
     }, [cleanup]);
 
-    // Play audio from base64
-    const play = useCallback((messageId: string, audioBase64: string) => {
+    // Play audio from URL
+    const play = useCallback((messageId: string, audioUrl: string) => {
         // Stop any current playback
         cleanup();
 
         try {
-            // Convert base64 to blob
-            const binaryString = atob(audioBase64);
-            const bytes = new Uint8Array(binaryString.length);
-            for (let i = 0; i < binaryString.length; i++) {
-                bytes[i] = binaryString.charCodeAt(i);
-            }
-            const blob = new Blob([bytes], { type: 'audio/mpeg' });
-            const audioUrl = URL.createObjectURL(blob);
-            urlRef.current = audioUrl;
-
-            // Create and play audio
+            // Create and play audio (the browser streams it, with Range requests)
             const audio = new Audio(audioUrl);
             audioRef.current = audio;
             setPlayingMessageId(messageId);
@@ -72,17 +57,17 @@ export function useAudioPlayer(): [AudioPlayerState, AudioPlayerActions] {
                 cleanup();
             });
         } catch (error) {
-            console.error('Failed to decode audio:', error);
+            console.error('Failed to load audio:', error);
             cleanup();
         }
     }, [cleanup]);
 
     // Toggle playback
-    const toggle = useCallback((messageId: string, audioBase64: string) => {
+    const toggle = useCallback((messageId: string, audioUrl: string) => {
         if (playingMessageId === messageId) {
             stop();
         } else {
-            play(messageId, audioBase64);
+            play(messageId, audioUrl);
         }
     }, [playingMessageId, play, stop]);
 
@@ -47,7 +47,7 @@ function createInitialState(data: InitialGameData | null | undefined): GameState
         introMessage: data.intro_message,
         revealedClues: data.revealed_clues || [],
         messages: data.messages || {},
-        crimeSceneImages: data.crime_scene_images || [],
+        crimeSceneImages: (data.crime_scene_image_ids || []).map(api.crimeSceneImageUrl),
     };
 }
 
@@ -111,7 +111,7 @@ export function useGameState(initialData?: InitialGameData | null) {
                 introMessage: data.intro_message,
                 revealedClues: [],
                 messages: {},
-                crimeSceneImages: data.crime_scene_images || [],
+                crimeSceneImages: (data.crime_scene_image_ids || []).map(api.crimeSceneImageUrl),
             });
             setReadCounts({});
             setSelectedPersona(null);
@@ -143,7 +143,7 @@ export function useGameState(initialData?: InitialGameData | null) {
                 introMessage: data.intro_message,
                 revealedClues: [],
                 messages: {},
-                crimeSceneImages: data.crime_scene_images || [],
+                crimeSceneImages: (data.crime_scene_image_ids || []).map(api.crimeSceneImageUrl),
             });
             setReadCounts({});
             setSelectedPersona(null);
@@ -175,7 +175,7 @@ export function useGameState(initialData?: InitialGameData | null) {
                 introMessage: data.intro_message,
                 revealedClues: [],
                 messages: {},
-                crimeSceneImages: data.crime_scene_images || [],
+                crimeSceneImages: (data.crime_scene_image_ids || []).map(api.crimeSceneImageUrl),
             });
             setReadCounts({});
             setSelectedPersona(null);
@@ -234,7 +234,7 @@ export function useGameState(initialData?: InitialGameData | null) {
                 content: data.response,
                 is_user: false,
                 messageId: personaMessageId,
-                audio_base64: data.audio_base64 || undefined,
+                audio_url: data.audio_url || undefined,
                 voice_id: data.voice_id || undefined,
             };
             
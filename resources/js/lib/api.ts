@@ -108,6 +108,13 @@ export async function getHint(gameId: string): Promise<HintResponse> {
 // Debug API
 // ============================================================================
 
+/**
+ * URL of a crime scene photo (proxied from the AI service by Laravel)
+ */
+export function crimeSceneImageUrl(imageId: string): string {
+    return `/game/images/${imageId}`;
+}
+
 export async function getDebugPersonas() {
     const response = await axios.get('/api/debug/personas');
     return response.data;
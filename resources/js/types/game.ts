@@ -37,7 +37,7 @@ export interface Message {
     is_user: boolean;
     created_at?: string;
     messageId?: string;
-    audio_base64?: string;
+    audio_url?: string;  // Proxied audio (GET /game/audio/{id})
     voice_id?: string;
 }
 
@@ -63,7 +63,7 @@ export interface CaseInfo {
     timeOfIncident: string;
     timeline: string;
     introMessage: string;
-    crimeSceneImages?: string[];  // Base64 encoded crime scene photos
+    crimeSceneImages?: string[];  // Crime scene photo URLs (GET /game/images/{id})
 }
 
 // ============================================================================
@@ -87,7 +87,7 @@ export interface GameState {
     introMessage: string;
     revealedClues: string[];
     messages: ChatHistory;
-    crimeSceneImages: string[];  // Base64 encoded crime scene photos
+    crimeSceneImages: string[];  // Crime scene photo URLs (GET /game/images/{id})
 }
 
 export interface SolutionDetails {
@@ -121,7 +121,7 @@ export interface GameStartResponse {
     timeline: string;
     personas: Persona[];
     intro_message: string;
-    crime_scene_images?: string[];  // Base64 encoded crime scene photos
+    crime_scene_image_ids?: string[];  // Crime scene photo ids (see crimeSceneImageUrl)
 }
 
 export interface ChatResponse {
@@ -129,7 +129,7 @@ export interface ChatResponse {
     persona_name: string;
     response: string;
     revealed_clue: string | null;
-    audio_base64: string | null;
+    audio_url: string | null;
     voice_id: string | null;
 }
 
@@ -204,5 +204,5 @@ export interface InitialGameData {
     intro_message: string;
     revealed_clues: string[];
     messages: ChatHistory;
-    crime_scene_images?: string[];  // Base64 encoded crime scene photos
+    crime_scene_image_ids?: string[];  // Crime scene photo ids (see crimeSceneImageUrl)
 }
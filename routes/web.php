@@ -5,6 +5,7 @@
 use App\Http\Controllers\Api\PromptTemplateController;
 use App\Http\Controllers\DebugController;
 use App\Http\Controllers\GameController;
+use App\Http\Controllers\MediaController;
 use Illuminate\Support\Facades\Route;
 use Inertia\Inertia;
 
@@ -23,6 +24,12 @@
     Route::get('/{gameId}/history', [GameController::class, 'history'])->name('history');
     Route::post('/accuse', [GameController::class, 'accuse'])->name('accuse');
     Route::post('/hint', [GameController::class, 'getHint'])->name('hint');
+    Route::get('/audio/{audioId}', [MediaController::class, 'audio'])
+        ->where('audioId', '[0-9a-f]{64}')
+        ->name('audio');
+    Route::get('/images/{imageId}', [MediaController::class, 'image'])
+        ->where('imageId', '[0-9a-f]{64}')
+        ->name('image');
 });
 
 // Debug Dashboard Routes
@@ -43,4 +50,5 @@
 
 // Internal API for AI service (fire-and-forget, no auth)
 Route::post('/api/internal/log', [InternalLogController::class, 'store'])->name('api.internal.log');
+Route::post('/api/internal/log/batch', [InternalLogController::class, 'storeBatch'])->name('api.internal.log.batch');
 Route::post('/api/internal/progress', [InternalProgressController::class, 'broadcast'])->name('api.internal.progress');